@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 
-from app.api.routes import base, auth, jobs
+from app.api.routes import applications, base, auth, jobs
 
 api_router = APIRouter()
 api_router.include_router(base.router, prefix="/base", tags=["base"])
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"]) 
\ No newline at end of file
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(applications.router, prefix="/applications", tags=["applications"]) 
\ No newline at end of file
@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from bson import ObjectId
+from app.core.security import get_current_user
+from app.services.application_history import InvalidCursorError, application_history
+
+router = APIRouter()
+
+ENCODERS = {ObjectId: str}
+
+def _validate_range(min_score: Optional[int], max_score: Optional[int], since: Optional[datetime], until: Optional[datetime]):
+    if min_score is not None and max_score is not None and min_score > max_score:
+        raise HTTPException(status_code=400, detail="min_score must not be greater than max_score")
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+
+@router.get("")
+async def list_applications(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    max_score: Optional[int] = Query(None, ge=0, le=100),
+    since: Optional[datetime] = Query(None, description="Only applications made at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only applications made before this time"),
+    current_user = Depends(get_current_user)
+):
+    """
+    The user's applications, newest first. Pass `next_cursor` back as
+    `cursor` for the next page; it is null on the last page.
+    """
+    _validate_range(min_score, max_score, since, until)
+    try:
+        page = await application_history.page(
+            user_id=current_user.get('id'),
+            limit=limit,
+            cursor=cursor,
+            min_score=min_score,
+            max_score=max_score,
+            since=since,
+            until=until
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "data": jsonable_encoder(page["items"], custom_encoder=ENCODERS),
+        "next_cursor": page["next_cursor"]
+    }
+
+@router.get("/stats")
+async def application_stats(
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    top: int = Query(5, ge=1, le=20, description="How many themes and skills to return"),
+    current_user = Depends(get_current_user)
+):
+    """
+    Number of applications, average/min/max fit score, score distribution,
+    and the insight themes and skills that come up most often.
+    """
+    _validate_range(None, None, since, until)
+    stats = await application_history.stats(current_user.get('id'), since=since, until=until, top=top)
+    return {"data": jsonable_encoder(stats)}
+
+@router.get("/{application_id}")
+async def get_application(application_id: str, current_user = Depends(get_current_user)):
+    """
+    One saved application with its full job details and insights.
+    """
+    application = await application_history.get(current_user.get('id'), application_id)
+    if application is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return {"data": jsonable_encoder(application, custom_encoder=ENCODERS)}
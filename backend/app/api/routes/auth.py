@@ -2,19 +2,32 @@ from datetime import timedelta, datetime
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from pymongo.errors import DuplicateKeyError
 
 from app.core.config import settings
 from app.core.security import (
+    HasherBusyError,
+    HasherTimeoutError,
     create_access_token,
     create_refresh_token,
-    get_password_hash,
-    verify_password,
+    password_hasher,
 )
 from app.db.database import get_database
 from app.schemas.user import Token, UserCreate, UserLogin, UserResponse
 
 router = APIRouter()
 
+HASH_RETRY_AFTER_SECONDS = 2
+
+# Fields login needs: the hash to check and the profile it returns
+LOGIN_PROJECTION = {"name": 1, "email": 1, "hashed_password": 1, "is_active": 1, "created_at": 1, "updated_at": 1}
+
+
+def _hasher_unavailable(e: Exception) -> HTTPException:
+    """429 when the hashing queue is full, 503 when a hash waited too long."""
+    code = status.HTTP_429_TOO_MANY_REQUESTS if isinstance(e, HasherBusyError) else status.HTTP_503_SERVICE_UNAVAILABLE
+    return HTTPException(status_code=code, detail=str(e), headers={"Retry-After": str(HASH_RETRY_AFTER_SECONDS)})
+
 
 @router.post("/signup", response_model=UserResponse)
 async def create_user(user_in: UserCreate) -> Any:
@@ -23,8 +36,9 @@ async def create_user(user_in: UserCreate) -> Any:
     """
     db = get_database()
     
-    # Check if user with this email already exists
-    existing_user = await db.users.find_one({"email": user_in.email})
+    # Check if user with this email already exists, before spending a hash on it;
+    # answered from the unique email index alone
+    existing_user = await db.users.find_one({"email": user_in.email}, {"_id": 1})
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -33,16 +47,27 @@ async def create_user(user_in: UserCreate) -> Any:
     
     # Create new user
     user_data = user_in.dict()
-    hashed_password = get_password_hash(user_data.pop("password"))
+    try:
+        hashed_password = await password_hasher.hash(user_data.pop("password"))
+    except (HasherBusyError, HasherTimeoutError) as e:
+        raise _hasher_unavailable(e)
     user_data["hashed_password"] = hashed_password
     user_data["is_active"] = True
     user_data["created_at"] = datetime.now()
     user_data["updated_at"] = datetime.now()
     
-    result = await db.users.insert_one(user_data)
-    created_user = await db.users.find_one({"_id": result.inserted_id})
-    
-    return created_user
+    try:
+        result = await db.users.insert_one(user_data)
+    except DuplicateKeyError:
+        # Another signup with this email got in first
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A user with this email already exists",
+        )
+
+    # The stored document is what was sent plus its id; no need to read it back
+    user_data["_id"] = result.inserted_id
+    return user_data
 
 
 @router.post("/login", response_model=dict)
@@ -52,18 +77,26 @@ async def login(user_in: UserLogin) -> Any:
     """
     db = get_database()
     
-    user = await db.users.find_one({"email": user_in.email})
+    user = await db.users.find_one({"email": user_in.email}, LOGIN_PROJECTION)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
     
-    if not verify_password(user_in.password, user["hashed_password"]):
+    try:
+        valid, new_hash = await password_hasher.verify_and_update(user_in.password, user["hashed_password"])
+    except (HasherBusyError, HasherTimeoutError) as e:
+        raise _hasher_unavailable(e)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
+
+    # The hash was made with an older cost; store one with the current cost
+    if new_hash:
+        await db.users.update_one({"_id": user["_id"]}, {"$set": {"hashed_password": new_hash}})
     
     # Create access and refresh tokens
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -1,29 +1,31 @@
-from fastapi import APIRouter, File, UploadFile, Form, Depends, HTTPException
-from typing import Optional
-from werkzeug.utils import secure_filename
+from fastapi import APIRouter, File, UploadFile, Form, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import json
+import logging
 import os
+from app.clients.llm_gateway import LLMUnavailableError
+from app.core.config import settings
 from app.core.security import get_current_user
-import uuid
-from app.services.resume_parser import ResumeParserService
-from app.services.ai_resume_analyzer import AIResumeAnalyzer
+from app.core.telemetry import span
+from app.services.ai_resume_analyzer import JobDetailsError
+from app.services.analysis_pipeline import AnalysisPipeline, ResumeParseError
+from app.services.analysis_jobs import QueueFullError, analysis_queue, serialize_job
+from app.services.batch_matcher import BatchMatcher, JobSpec, ResumeSpec
+from app.services.resume_ingest import InvalidUploadError, UploadTooLargeError, spool_upload
+from app.services.resume_parser import PdfLimitExceeded
+from app.services.pdf_parse_pool import ParserBusyError
 from app.helpers.utils import allowed_file, validate_url
-from app.db.database import get_database
-from datetime import datetime
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 UPLOAD_FOLDER = 'uploads/resumes'
 ALLOWED_EXTENSIONS = {'pdf'}
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-@router.post("/submit-application")
-async def submit_application(
-    resume: UploadFile = File(...),
-    job_title: Optional[str] = Form(None),
-    job_description: Optional[str] = Form(None),
-    job_url: Optional[str] = Form(None),
-    current_user = Depends(get_current_user)
-):
+def _validate_submission(resume: UploadFile, job_description: Optional[str], job_url: Optional[str]):
     if not resume.filename or not allowed_file(resume.filename, ALLOWED_EXTENSIONS):
         raise HTTPException(status_code=400, detail="Invalid file format. Only PDF files are allowed") 
     
@@ -32,44 +34,69 @@ async def submit_application(
     
     if job_url and not validate_url(job_url):
         raise HTTPException(status_code=400, detail="Invalid job URL")
-    
-    user_upload_dir = os.path.join(UPLOAD_FOLDER, str(current_user.get('id')))
-    os.makedirs(user_upload_dir, exist_ok=True)
 
-    filename = secure_filename(resume.filename)
-    file_path = os.path.join(user_upload_dir, f"{uuid.uuid4()}_{filename}")
-    
-    content = await resume.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
-    
-    parsed_text = ResumeParserService.parse_pdf(file_path)
-    if parsed_text is None:
-        raise HTTPException(status_code=500, detail="Failed to parse resume")
-    
-    analyzer = AIResumeAnalyzer()
-    fit_score, insights = analyzer.analyze_resume(
-        resume_text=parsed_text,
-        job_url=job_url,
-        job_title=job_title,
-        job_description=job_description
+async def _store_resume(resume: UploadFile, user_id: str) -> Tuple[str, str]:
+    """Store the upload under its SHA-256 and return (file_path, digest)."""
+    user_upload_dir = os.path.join(UPLOAD_FOLDER, str(user_id))
+    try:
+        with span("upload"):
+            return await spool_upload(resume, user_upload_dir)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _validate_shortlist(top_k: Optional[int], min_prescore: Optional[float]):
+    if top_k is not None and top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be at least 1")
+    if min_prescore is not None and not 0 <= min_prescore <= 100:
+        raise HTTPException(status_code=400, detail="min_prescore must be between 0 and 100")
+
+def _ndjson_response(items: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    async def lines():
+        async for item in items:
+            yield json.dumps(jsonable_encoder(item)) + "\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
+
+@router.post("/submit-application")
+async def submit_application(
+    resume: UploadFile = File(...),
+    job_title: Optional[str] = Form(None),
+    job_description: Optional[str] = Form(None),
+    job_url: Optional[str] = Form(None),
+    current_user = Depends(get_current_user)
+):
+    _validate_submission(resume, job_description, job_url)
+    file_path, digest = await _store_resume(resume, current_user.get('id'))
     
-    # Save application data to MongoDB
-    db = get_database()
-    application_data = {
-        "user_id": current_user.get('id'),
-        "job_title": job_title,
-        "job_url": job_url,
-        "job_description": job_description,
-        "resume_file_path": file_path,
-        "fit_score": fit_score,
-        "insights": insights,
-        "created_at": datetime.now()
-    }
-    
-    # Insert into applications collection
-    result = db.applications.insert_one(application_data)
+    try:
+        fit_score, insights = await AnalysisPipeline().run(
+            user_id=current_user.get('id'),
+            file_path=file_path,
+            resume_digest=digest,
+            job_url=job_url,
+            job_title=job_title,
+            job_description=job_description
+        )
+    except PdfLimitExceeded as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except ParserBusyError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except ResumeParseError:
+        raise HTTPException(status_code=500, detail="Failed to parse resume")
+    except JobDetailsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LLMUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after or 30) + 1)}
+        )
     
     return {
         "message": "Application submitted successfully",
@@ -77,4 +104,189 @@ async def submit_application(
             "fit_score": fit_score,
             "insights": insights,
         }
-    } 
\ No newline at end of file
+    }
+
+@router.post("/submit-application/stream")
+async def submit_application_stream(
+    resume: UploadFile = File(...),
+    job_title: Optional[str] = Form(None),
+    job_description: Optional[str] = Form(None),
+    job_url: Optional[str] = Form(None),
+    current_user = Depends(get_current_user)
+):
+    """
+    Same as /submit-application, but answers with server-sent events: progress
+    stages, the fit score and each insight as soon as the model writes them,
+    then the final result. Failures after the stream has started arrive as an
+    `error` event.
+    """
+    _validate_submission(resume, job_description, job_url)
+    file_path, digest = await _store_resume(resume, current_user.get('id'))
+
+    events = AnalysisPipeline().stream(
+        user_id=current_user.get('id'),
+        file_path=file_path,
+        resume_digest=digest,
+        job_url=job_url,
+        job_title=job_title,
+        job_description=job_description
+    )
+
+    async def event_stream():
+        try:
+            async for event in events:
+                payload = json.dumps(jsonable_encoder(event["data"]))
+                yield f"event: {event['event']}\ndata: {payload}\n\n"
+        except (PdfLimitExceeded, ParserBusyError, ResumeParseError, LLMUnavailableError, ValueError) as e:
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        except Exception as e:
+            logger.exception("Error streaming application analysis: %s", e)
+            yield f"event: error\ndata: {json.dumps({'detail': 'Failed to analyze resume'})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/analysis", status_code=status.HTTP_202_ACCEPTED)
+async def create_analysis_job(
+    resume: UploadFile = File(...),
+    job_title: Optional[str] = Form(None),
+    job_description: Optional[str] = Form(None),
+    job_url: Optional[str] = Form(None),
+    current_user = Depends(get_current_user)
+):
+    """
+    Queue a resume analysis and return its job id immediately.
+    """
+    _validate_submission(resume, job_description, job_url)
+    file_path, digest = await _store_resume(resume, current_user.get('id'))
+
+    try:
+        job = await analysis_queue.submit(
+            user_id=current_user.get('id'),
+            file_path=file_path,
+            resume_digest=digest,
+            job_url=job_url,
+            job_title=job_title,
+            job_description=job_description
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    return {
+        "message": "Analysis queued",
+        "data": serialize_job(job)
+    }
+
+@router.get("/analysis/{job_id}")
+async def get_analysis_job(job_id: str, current_user = Depends(get_current_user)):
+    """
+    Current state of an analysis job, including the result once completed.
+    """
+    job = await analysis_queue.get(job_id, current_user.get('id'))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    return {"data": serialize_job(job)}
+
+@router.get("/analysis/{job_id}/stream")
+async def stream_analysis_job(job_id: str, current_user = Depends(get_current_user)):
+    """
+    Server-sent events with the job's progress, closing after the final result.
+    """
+    job = await analysis_queue.get(job_id, current_user.get('id'))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+
+    async def event_stream():
+        async for state in analysis_queue.events(job_id, current_user.get('id')):
+            payload = json.dumps(jsonable_encoder(state))
+            yield f"event: {state['status']}\ndata: {payload}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/batch/resume-vs-jobs")
+async def batch_resume_vs_jobs(
+    resume: UploadFile = File(...),
+    jobs: str = Form(..., description="JSON list of {job_url, job_title, job_description}"),
+    top_k: Optional[int] = Form(None, description="Only send the K best pre-scored jobs to the LLM"),
+    min_prescore: Optional[float] = Form(None, description="Skip jobs with a lower pre-score (0-100)"),
+    current_user = Depends(get_current_user)
+):
+    """
+    Score one resume against many jobs. Streams one NDJSON line per job as
+    it finishes, then a summary line. Results are not saved as applications.
+    """
+    _validate_shortlist(top_k, min_prescore)
+    try:
+        job_specs = [
+            JobSpec(job.get('job_url'), job.get('job_title'), job.get('job_description'))
+            for job in json.loads(jobs)
+        ]
+    except (json.JSONDecodeError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="jobs must be a JSON list of job objects")
+    if not job_specs:
+        raise HTTPException(status_code=400, detail="At least one job is required")
+    if len(job_specs) > settings.BATCH_MAX_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BATCH_MAX_JOBS} jobs can be matched at once")
+    if not resume.filename or not allowed_file(resume.filename, ALLOWED_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Invalid file format. Only PDF files are allowed")
+
+    file_path, digest = await _store_resume(resume, current_user.get('id'))
+    matcher = BatchMatcher(settings.BATCH_CONCURRENCY, top_k, min_prescore)
+    resume_spec = ResumeSpec(resume.filename, file_path, digest)
+    try:
+        await matcher.load_resume(resume_spec)
+    except PdfLimitExceeded as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except ParserBusyError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except ValueError:
+        raise HTTPException(status_code=500, detail="Failed to parse resume")
+
+    return _ndjson_response(matcher.resume_vs_jobs(resume_spec, job_specs))
+
+@router.post("/batch/job-vs-resumes")
+async def batch_job_vs_resumes(
+    resumes: List[UploadFile] = File(...),
+    job_title: Optional[str] = Form(None),
+    job_description: Optional[str] = Form(None),
+    job_url: Optional[str] = Form(None),
+    top_k: Optional[int] = Form(None, description="Only send the K best pre-scored resumes to the LLM"),
+    min_prescore: Optional[float] = Form(None, description="Skip resumes with a lower pre-score (0-100)"),
+    current_user = Depends(get_current_user)
+):
+    """
+    Score many resumes against one job. Streams one NDJSON line per resume
+    as it finishes, then a summary line. Results are not saved as applications.
+    """
+    _validate_shortlist(top_k, min_prescore)
+    if len(resumes) > settings.BATCH_MAX_RESUMES:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BATCH_MAX_RESUMES} resumes can be matched at once")
+
+    matcher = BatchMatcher(settings.BATCH_CONCURRENCY, top_k, min_prescore)
+    try:
+        job_details = await matcher.load_job(JobSpec(job_url, job_title, job_description))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Uploads are only readable during the request, so every file is stored before streaming starts
+    user_upload_dir = os.path.join(UPLOAD_FOLDER, str(current_user.get('id')))
+    resume_specs = []
+    for resume in resumes:
+        if not resume.filename or not allowed_file(resume.filename, ALLOWED_EXTENSIONS):
+            resume_specs.append(ResumeSpec(resume.filename or "", error="Invalid file format. Only PDF files are allowed"))
+            continue
+        try:
+            file_path, digest = await spool_upload(resume, user_upload_dir)
+        except (UploadTooLargeError, InvalidUploadError) as e:
+            resume_specs.append(ResumeSpec(resume.filename, error=str(e)))
+            continue
+        resume_specs.append(ResumeSpec(resume.filename, file_path, digest))
+
+    return _ndjson_response(matcher.job_vs_resumes(job_details, resume_specs))
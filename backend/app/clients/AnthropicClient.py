@@ -1,25 +1,46 @@
-from langchain_anthropic import ChatAnthropic
-from langchain.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from app.core.config import settings
+from typing import AsyncIterator, Optional
+from app.clients.llm_gateway import Prompt, llm_gateway
+from app.clients.model_router import model_router
 
 class AnthropicClient:
-    def __init__(self):
-        print("Initializing Anthropic client")
-        self.client = ChatAnthropic(api_key=settings.ANTHROPIC_API_KEY, model="claude-3-7-sonnet-20250219")
-        
-    def chat(self, prompt: str, variables: dict = None) -> str:
-        print("Chatting with Anthropic")
-        prompt_template = PromptTemplate(template=prompt, input_variables=list(variables.keys()))
-        chain = prompt_template | self.client | StrOutputParser()
-        response = chain.invoke(variables)
-        if hasattr(response, 'content'):
-            print("Response has content")
-            response_text = response.content
+    """
+    Thin handle on the process-wide LLM gateway for one task ("scoring",
+    "extraction", "repair"). The model router picks the task's model and
+    falls back to the next one; passing `model` pins a single model instead.
+    Cheap to create: the underlying ChatAnthropic and its connection pool
+    are shared.
+    """
+
+    def __init__(self, task: str = "scoring", model: Optional[str] = None):
+        self.task = task
+        self.pinned = model is not None
+        self.model = model or model_router.primary_model(task)
+
+    @staticmethod
+    def _response_text(response) -> str:
+        return response.content if hasattr(response, 'content') else str(response)
+
+    def chat(self, prompt: Prompt, variables: dict = None) -> str:
+        """Blocking call for scripts; goes straight to the shared client without the gateway's limits."""
+        variables = variables or {}
+        response = llm_gateway.chain(prompt, variables, self.model).invoke(variables)
+        return self._response_text(response)
+
+    async def achat(self, prompt: Prompt, variables: dict = None) -> str:
+        """Async variant of `chat`, rate limited and retried by the gateway."""
+        variables = variables or {}
+        if self.pinned:
+            response = await llm_gateway.invoke(prompt, variables, self.model)
         else:
-            print("Response does not have content")
-            response_text = str(response)
-        print("Response text: ", response_text)
-        return response_text
-    
+            response = await model_router.invoke(self.task, prompt, variables)
+        return self._response_text(response)
 
+    async def astream(self, prompt: Prompt, variables: dict = None) -> AsyncIterator[str]:
+        """Yield the response text in chunks as the model generates it."""
+        variables = variables or {}
+        if self.pinned:
+            chunks = llm_gateway.stream(prompt, variables, self.model)
+        else:
+            chunks = model_router.stream(self.task, prompt, variables)
+        async for chunk in chunks:
+            yield chunk
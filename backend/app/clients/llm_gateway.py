@@ -0,0 +1,343 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+import anthropic
+from langchain.prompts import PromptTemplate
+from langchain_anthropic import ChatAnthropic
+
+from app.core.config import settings
+from app.core.telemetry import metrics, record_llm_usage
+from app.prompts.registry import USAGE_FIELDS, PromptSpec, prompt_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "claude-3-7-sonnet-20250219"
+
+# A registered prompt, or a plain template string for one-off calls
+Prompt = Union[PromptSpec, str]
+
+# 529 is Anthropic's "overloaded"
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+class LLMUnavailableError(Exception):
+    """Raised when the provider keeps throttling or failing after all retries."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens per second, bursting up to `capacity`.
+    `pause` stops handing out tokens for a while, e.g. after a 429.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class LLMGateway:
+    """
+    The one place LLM calls leave the process.
+
+    Keeps a single ChatAnthropic (and so a single HTTP connection pool) per
+    model, bounds concurrent calls globally and per model, spaces requests
+    with a token bucket, and retries throttled or failed calls with jittered
+    exponential backoff that honours `retry-after`. A 429 pauses the bucket
+    for every caller, so a burst slows down instead of failing. Optionally
+    a second copy of a slow call is sent after `hedge_after` seconds when
+    there is spare capacity, and the first answer wins.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_concurrency_per_model: int,
+        requests_per_minute: float,
+        max_retries: int,
+        retry_base_delay: float,
+        retry_max_delay: float,
+        request_timeout: float,
+        hedge_after: float,
+    ):
+        self.max_concurrency_per_model = max_concurrency_per_model
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.request_timeout = request_timeout
+        self.hedge_after = hedge_after
+        self._clients: Dict[str, ChatAnthropic] = {}
+        self._clients_lock = threading.Lock()
+        self._global_slots = asyncio.Semaphore(max_concurrency)
+        self._model_slots: Dict[str, asyncio.Semaphore] = {}
+        self._bucket = TokenBucket(rate=requests_per_minute / 60, capacity=max(1.0, requests_per_minute / 10))
+        self.in_flight = 0
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failures = 0
+
+    def client(self, model: Optional[str] = None) -> ChatAnthropic:
+        model = model or DEFAULT_MODEL
+        with self._clients_lock:
+            if model not in self._clients:
+                logger.info("Initializing Anthropic client for %s", model)
+                client_kwargs: Dict[str, Any] = {}
+                if settings.ANTHROPIC_BASE_URL:
+                    client_kwargs["base_url"] = settings.ANTHROPIC_BASE_URL
+                self._clients[model] = ChatAnthropic(
+                    api_key=settings.ANTHROPIC_API_KEY,
+                    model=model,
+                    # Retries are done here, with shared backoff and rate limiting
+                    max_retries=0,
+                    timeout=self.request_timeout,
+                    **client_kwargs,
+                )
+            return self._clients[model]
+
+    def chain(self, prompt: Prompt, variables: Dict[str, Any], model: Optional[str] = None):
+        """Runnable that sends the prompt and returns the model's message."""
+        if isinstance(prompt, PromptSpec):
+            template = prompt.template
+        else:
+            template = PromptTemplate(template=prompt, input_variables=list(variables.keys()))
+        return template | self.client(model)
+
+    async def invoke(
+        self,
+        prompt: Prompt,
+        variables: Dict[str, Any],
+        model: Optional[str] = None,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> str:
+        """
+        Run the prompt and return the response text, retrying throttled and
+        transient failures. Token counts are added to `usage` when given.
+        """
+        model = model or DEFAULT_MODEL
+        chain = self.chain(prompt, variables, model)
+        attempt = 0
+        while True:
+            try:
+                message = await self._hedged_call(chain, variables, model)
+                break
+            except Exception as e:
+                await self._backoff(e, attempt)
+                attempt += 1
+
+        call_usage = message.response_metadata.get("usage") or message.usage_metadata or {}
+        if usage is not None:
+            for field in USAGE_FIELDS:
+                usage[field] = usage.get(field, 0) + int(call_usage.get(field) or 0)
+        if isinstance(prompt, PromptSpec):
+            prompt_registry.record_usage(prompt, call_usage)
+        record_llm_usage(model, _prompt_name(prompt), call_usage)
+        return _message_text(message)
+
+    async def stream(
+        self,
+        prompt: Prompt,
+        variables: Dict[str, Any],
+        model: Optional[str] = None,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Run the prompt and yield the response text as it is generated. A call
+        is only retried if it fails before its first chunk; streams are not hedged.
+        """
+        model = model or DEFAULT_MODEL
+        chain = self.chain(prompt, variables, model)
+        # Streamed chunks only report input and output tokens, not cache reads
+        if usage is None:
+            usage = {}
+        usage.setdefault("input_tokens", 0)
+        usage.setdefault("output_tokens", 0)
+        attempt = 0
+        while True:
+            started = False
+            try:
+                async with self._global_slots, self._model_semaphore(model):
+                    await self._bucket.acquire()
+                    self.in_flight += 1
+                    self.calls += 1
+                    try:
+                        async for chunk in chain.astream(variables):
+                            for field in ("input_tokens", "output_tokens"):
+                                usage[field] += (chunk.usage_metadata or {}).get(field, 0)
+                            text = _message_text(chunk)
+                            if text:
+                                started = True
+                                yield text
+                    finally:
+                        self.in_flight -= 1
+                if isinstance(prompt, PromptSpec):
+                    prompt_registry.record_usage(prompt, usage)
+                record_llm_usage(model, _prompt_name(prompt), usage)
+                return
+            except Exception as e:
+                if started:
+                    self.failures += 1
+                    raise
+                await self._backoff(e, attempt)
+                attempt += 1
+
+    async def _backoff(self, error: Exception, attempt: int):
+        """Sleep before retrying `error`, or raise when it should not or can no longer be retried."""
+        delay = self._retry_delay(error, attempt)
+        if delay is None:
+            self.failures += 1
+            raise error
+        if attempt >= self.max_retries or delay > self.retry_max_delay * 4:
+            self.failures += 1
+            raise LLMUnavailableError(
+                "The AI service is busy, please retry shortly", retry_after=delay
+            ) from error
+        if status_code(error) == 429:
+            self.throttled += 1
+            self._bucket.pause(delay)
+        self.retries += 1
+        logger.warning("LLM call failed (%s), retry %d in %.1fs", type(error).__name__, attempt + 1, delay)
+        await asyncio.sleep(delay)
+
+    async def _hedged_call(self, chain, variables: Dict[str, Any], model: str):
+        first = asyncio.ensure_future(self._call(chain, variables, model))
+        if not self.hedge_after:
+            return await first
+
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after)
+            if done or self._global_slots.locked():
+                # Finished in time, or no spare capacity to hedge with
+                return await first
+
+            self.hedged += 1
+            tasks.add(asyncio.ensure_future(self._call(chain, variables, model)))
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _model_semaphore(self, model: str) -> asyncio.Semaphore:
+        return self._model_slots.setdefault(model, asyncio.Semaphore(self.max_concurrency_per_model))
+
+    async def _call(self, chain, variables: Dict[str, Any], model: str):
+        async with self._global_slots, self._model_semaphore(model):
+            await self._bucket.acquire()
+            self.in_flight += 1
+            self.calls += 1
+            try:
+                return await asyncio.wait_for(chain.ainvoke(variables), timeout=self.request_timeout)
+            finally:
+                self.in_flight -= 1
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying `error`, or None if it should not be retried."""
+        status = status_code(error)
+        retryable = (
+            isinstance(error, (asyncio.TimeoutError, anthropic.APIConnectionError))
+            or status in RETRYABLE_STATUS_CODES
+            or (status is not None and status >= 500)
+        )
+        if not retryable:
+            return None
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return retry_after
+        # Full jitter keeps retries from many requests from arriving together
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "models": list(self._clients),
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "failures": self.failures,
+        }
+
+
+def _message_text(message) -> str:
+    content = getattr(message, "content", message)
+    if isinstance(content, list):
+        return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return content if isinstance(content, str) else str(content)
+
+
+def _prompt_name(prompt: Prompt) -> str:
+    return prompt.key if isinstance(prompt, PromptSpec) else "adhoc"
+
+
+def status_code(error: Exception) -> Optional[int]:
+    return getattr(error, "status_code", None)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        # HTTP-date values are rare for this API; fall back to backoff
+        return None
+    return None
+
+
+llm_gateway = LLMGateway(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_concurrency_per_model=settings.LLM_MAX_CONCURRENCY_PER_MODEL,
+    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+    max_retries=settings.LLM_MAX_RETRIES,
+    retry_base_delay=settings.LLM_RETRY_BASE_DELAY,
+    retry_max_delay=settings.LLM_RETRY_MAX_DELAY,
+    request_timeout=settings.LLM_REQUEST_TIMEOUT,
+    hedge_after=settings.LLM_HEDGE_AFTER,
+)
+
+metrics.gauge("llm_calls_in_flight", "LLM calls currently waiting on the provider", lambda: llm_gateway.in_flight)
+metrics.stats("llm_gateway_stats", "LLM gateway calls, retries, throttling and hedging", llm_gateway.stats)
@@ -0,0 +1,157 @@
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.clients.llm_gateway import DEFAULT_MODEL, LLMUnavailableError, Prompt, llm_gateway, status_code
+from app.core.config import settings
+from app.core.telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+# USD per million tokens: input, output, cache read, cache write
+MODEL_PRICES: Dict[str, Dict[str, float]] = {
+    "claude-3-7-sonnet-20250219": {"input": 3.0, "output": 15.0, "cache_read": 0.30, "cache_write": 3.75},
+    "claude-3-5-sonnet-20241022": {"input": 3.0, "output": 15.0, "cache_read": 0.30, "cache_write": 3.75},
+    "claude-3-5-haiku-20241022": {"input": 0.80, "output": 4.0, "cache_read": 0.08, "cache_write": 1.0},
+    "claude-3-haiku-20240307": {"input": 0.25, "output": 1.25, "cache_read": 0.03, "cache_write": 0.30},
+}
+
+# Errors that mean "try the next model" rather than "the request is wrong":
+# the model is unknown to this account, or it stays overloaded after retries
+FALLBACK_STATUS_CODES = {404, 529}
+
+
+def _models(primary: str, fallbacks: str) -> List[str]:
+    models = [primary] + [model.strip() for model in fallbacks.split(",") if model.strip()]
+    return list(dict.fromkeys(models))
+
+
+def estimate_cost(model: str, usage: Dict[str, int]) -> Optional[float]:
+    """Cost in USD of one call's token usage, or None for a model without a known price."""
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        return None
+    return (
+        usage.get("input_tokens", 0) * prices["input"]
+        + usage.get("output_tokens", 0) * prices["output"]
+        + usage.get("cache_read_input_tokens", 0) * prices["cache_read"]
+        + usage.get("cache_creation_input_tokens", 0) * prices["cache_write"]
+    ) / 1_000_000
+
+
+class ModelRouter:
+    """
+    Picks the model for each LLM task and falls back to the next model of
+    the task when one is unavailable.
+
+    Tasks map to an ordered list of models (`routes`). Every call is
+    accounted per task and model: calls, fallbacks, failures, latency and
+    an estimated cost from the token usage.
+    """
+
+    def __init__(self, routes: Dict[str, List[str]]):
+        self.routes = routes
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    def models(self, task: str) -> List[str]:
+        return self.routes.get(task) or [DEFAULT_MODEL]
+
+    def primary_model(self, task: str) -> str:
+        return self.models(task)[0]
+
+    async def invoke(self, task: str, prompt: Prompt, variables: Dict[str, Any]) -> str:
+        models = self.models(task)
+        for position, model in enumerate(models):
+            usage: Dict[str, int] = {}
+            start = time.monotonic()
+            try:
+                text = await llm_gateway.invoke(prompt, variables, model, usage=usage)
+            except Exception as e:
+                self._record(task, model, start, usage, failed=True)
+                if position + 1 < len(models) and _should_fall_back(e):
+                    logger.warning("Model %s unavailable for %s, falling back to %s", model, task, models[position + 1])
+                    self._count(task, models[position + 1], "fallbacks")
+                    continue
+                raise
+            self._record(task, model, start, usage)
+            return text
+        raise LLMUnavailableError(f"No model available for {task}")
+
+    async def stream(self, task: str, prompt: Prompt, variables: Dict[str, Any]) -> AsyncIterator[str]:
+        """Like `invoke`, yielding text as it is generated; falls back only before the first chunk."""
+        models = self.models(task)
+        for position, model in enumerate(models):
+            usage: Dict[str, int] = {}
+            start = time.monotonic()
+            started = False
+            try:
+                async for chunk in llm_gateway.stream(prompt, variables, model, usage=usage):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                self._record(task, model, start, usage, failed=True)
+                if not started and position + 1 < len(models) and _should_fall_back(e):
+                    logger.warning("Model %s unavailable for %s, falling back to %s", model, task, models[position + 1])
+                    self._count(task, models[position + 1], "fallbacks")
+                    continue
+                raise
+            self._record(task, model, start, usage)
+            return
+
+    def _entry(self, task: str, model: str) -> Dict[str, float]:
+        return self._stats.setdefault(task, {}).setdefault(model, {
+            "calls": 0, "failures": 0, "fallbacks": 0,
+            "total_seconds": 0.0, "max_seconds": 0.0,
+            "input_tokens": 0, "output_tokens": 0,
+            "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0,
+            "cost_usd": 0.0,
+        })
+
+    def _count(self, task: str, model: str, field: str):
+        with self._lock:
+            self._entry(task, model)[field] += 1
+
+    def _record(self, task: str, model: str, start: float, usage: Dict[str, int], failed: bool = False):
+        elapsed = time.monotonic() - start
+        with self._lock:
+            entry = self._entry(task, model)
+            entry["calls"] += 1
+            entry["failures"] += int(failed)
+            entry["total_seconds"] += elapsed
+            entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+            for field in ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"):
+                entry[field] += usage.get(field, 0)
+            entry["cost_usd"] += estimate_cost(model, usage) or 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "routes": dict(self.routes),
+                "usage": {
+                    task: {
+                        model: {
+                            **{field: value for field, value in entry.items()
+                               if field != "total_seconds"},
+                            "avg_seconds": round(entry["total_seconds"] / entry["calls"], 3) if entry["calls"] else None,
+                            "max_seconds": round(entry["max_seconds"], 3),
+                            "cost_usd": round(entry["cost_usd"], 6),
+                        }
+                        for model, entry in models.items()
+                    }
+                    for task, models in self._stats.items()
+                },
+            }
+
+
+def _should_fall_back(error: Exception) -> bool:
+    return isinstance(error, LLMUnavailableError) or status_code(error) in FALLBACK_STATUS_CODES
+
+
+model_router = ModelRouter({
+    "scoring": _models(settings.LLM_SCORING_MODEL, settings.LLM_SCORING_FALLBACKS),
+    "extraction": _models(settings.LLM_EXTRACTION_MODEL, settings.LLM_EXTRACTION_FALLBACKS),
+    "repair": _models(settings.LLM_REPAIR_MODEL, settings.LLM_REPAIR_FALLBACKS),
+})
+metrics.stats("llm_routing_stats", "LLM latency, fallbacks and estimated cost per task and model", model_router.stats)
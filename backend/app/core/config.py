@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 import os
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,14 +11,131 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Resume Job Matcher API"
     MONGODB_URL: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
     MONGODB_DB_NAME: str = os.getenv("MONGODB_DB_NAME")
+    # Connection pool per worker process, and the default write concern of bulk writes
+    MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", 100))
+    MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", 0))
+    MONGODB_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", 300000))
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", 10000))
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", 10000))
+    MONGODB_BULK_WRITE_CONCERN: str = os.getenv("MONGODB_BULK_WRITE_CONCERN", "")
+    MONGODB_BULK_BATCH_SIZE: int = int(os.getenv("MONGODB_BULK_BATCH_SIZE", 1000))
     SECRET_KEY: str = os.getenv("SECRET_KEY")  
     ALGORITHM: str = os.getenv("ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
     REFRESH_TOKEN_EXPIRE_MINUTES: int = os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES")  
     JWT_PRIVATE_KEY: str = os.getenv("JWT_PRIVATE_KEY")  
     JWT_PUBLIC_KEY: str = os.getenv("JWT_PUBLIC_KEY")  
+    # Key id stamped on new tokens; extra public keys ("kid:base64-key", comma
+    # separated) keep verifying tokens signed before a key rotation
+    JWT_KEY_ID: str = os.getenv("JWT_KEY_ID", "")
+    JWT_PREVIOUS_PUBLIC_KEYS: str = os.getenv("JWT_PREVIOUS_PUBLIC_KEYS", "")
+    # Verified token claims are reused for repeat requests with the same token
+    TOKEN_CACHE_TTL_SECONDS: float = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", 60))
+    TOKEN_CACHE_MAX_ENTRIES: int = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", 10000))
+
+    # Password hashing: bcrypt cost and the thread pool that runs it off the event loop
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 64))
+    PASSWORD_HASH_MAX_WAIT: float = float(os.getenv("PASSWORD_HASH_MAX_WAIT", 5))
     CLIENT_ORIGIN: str = os.getenv("CLIENT_ORIGIN", "http://localhost:3000")
     ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY")
+    # Point at a local stand-in for the Anthropic API (tests, benchmarks)
+    ANTHROPIC_BASE_URL: Optional[str] = os.getenv("ANTHROPIC_BASE_URL")
+
+    # Worker pools for blocking work kept off the event loop
+    BLOCKING_IO_WORKERS: int = int(os.getenv("BLOCKING_IO_WORKERS", 8))
+    SCRAPER_WORKERS: int = int(os.getenv("SCRAPER_WORKERS", 4))
+
+    # Resume upload and PDF parsing limits
+    MAX_UPLOAD_BYTES: int = int(os.getenv("MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+    UPLOAD_CHUNK_BYTES: int = int(os.getenv("UPLOAD_CHUNK_BYTES", 256 * 1024))
+    PDF_MAX_PAGES: int = int(os.getenv("PDF_MAX_PAGES", 20))
+    PDF_PARSE_TIME_BUDGET: float = float(os.getenv("PDF_PARSE_TIME_BUDGET", 20))
+
+    # Process pool for PDF text extraction
+    PDF_PARSER_WORKERS: int = int(os.getenv("PDF_PARSER_WORKERS", os.cpu_count() or 2))
+    PDF_PARSE_QUEUE_SIZE: int = int(os.getenv("PDF_PARSE_QUEUE_SIZE", 200))
+    PDF_PARSE_TASK_TIMEOUT: float = float(os.getenv("PDF_PARSE_TASK_TIMEOUT", 30))
+    PDF_FANOUT_PAGES: int = int(os.getenv("PDF_FANOUT_PAGES", 8))
+    PDF_PAGES_PER_TASK: int = int(os.getenv("PDF_PAGES_PER_TASK", 4))
+
+    # Parsed resume text cache
+    RESUME_CACHE_DIR: str = os.getenv("RESUME_CACHE_DIR", "uploads/cache/resume_text")
+    RESUME_CACHE_MEMORY_BYTES: int = int(os.getenv("RESUME_CACHE_MEMORY_BYTES", 32 * 1024 * 1024))
+    RESUME_CACHE_DISK_BYTES: int = int(os.getenv("RESUME_CACHE_DISK_BYTES", 512 * 1024 * 1024))
+
+    # Plain HTTP fetches tried before falling back to a browser
+    HTTP_FETCH_TIMEOUT: float = float(os.getenv("HTTP_FETCH_TIMEOUT", 10))
+    HTTP_POOL_SIZE: int = int(os.getenv("HTTP_POOL_SIZE", 20))
+    HTTP_FETCH_MAX_BYTES: int = int(os.getenv("HTTP_FETCH_MAX_BYTES", 2_000_000))
+    HTTP_FETCH_MIN_TEXT_LENGTH: int = int(os.getenv("HTTP_FETCH_MIN_TEXT_LENGTH", 500))
+
+    # Headless browser pool used by the scraper
+    BROWSER_POOL_SIZE: int = int(os.getenv("BROWSER_POOL_SIZE", 2))
+    BROWSER_POOL_PREWARM: int = int(os.getenv("BROWSER_POOL_PREWARM", 0))
+    BROWSER_MAX_PAGES: int = int(os.getenv("BROWSER_MAX_PAGES", 50))
+    BROWSER_CHECKOUT_TIMEOUT: float = float(os.getenv("BROWSER_CHECKOUT_TIMEOUT", 30))
+    BROWSER_PAGE_LOAD_TIMEOUT: int = int(os.getenv("BROWSER_PAGE_LOAD_TIMEOUT", 30))
+    PAGE_READY_POLL_INTERVAL: float = float(os.getenv("PAGE_READY_POLL_INTERVAL", 0.2))
+    PAGE_READY_MAX_WAIT: float = float(os.getenv("PAGE_READY_MAX_WAIT", 15))
+
+    # Scraped job posting cache
+    JOB_CACHE_TTL_SECONDS: int = int(os.getenv("JOB_CACHE_TTL_SECONDS", 6 * 60 * 60))
+    JOB_CACHE_REVALIDATE: bool = os.getenv("JOB_CACHE_REVALIDATE", "false").lower() == "true"
+    JOB_CACHE_MEMORY_ENTRIES: int = int(os.getenv("JOB_CACHE_MEMORY_ENTRIES", 1000))
+
+    # Match result cache
+    MATCH_CACHE_TTL_SECONDS: int = int(os.getenv("MATCH_CACHE_TTL_SECONDS", 30 * 24 * 60 * 60))
+    MATCH_CACHE_MEMORY_ENTRIES: int = int(os.getenv("MATCH_CACHE_MEMORY_ENTRIES", 5000))
+
+    # Token budgets for text sent to the LLM
+    RESUME_TOKEN_BUDGET: int = int(os.getenv("RESUME_TOKEN_BUDGET", 3000))
+    JOB_TOKEN_BUDGET: int = int(os.getenv("JOB_TOKEN_BUDGET", 2000))
+    JOB_PAGE_TOKEN_BUDGET: int = int(os.getenv("JOB_PAGE_TOKEN_BUDGET", 4000))
+
+    # Background analysis jobs
+    ANALYSIS_WORKERS: int = int(os.getenv("ANALYSIS_WORKERS", 4))
+    ANALYSIS_PER_USER_LIMIT: int = int(os.getenv("ANALYSIS_PER_USER_LIMIT", 2))
+    ANALYSIS_QUEUE_MAX_SIZE: int = int(os.getenv("ANALYSIS_QUEUE_MAX_SIZE", 500))
+    ANALYSIS_LEASE_SECONDS: float = float(os.getenv("ANALYSIS_LEASE_SECONDS", 60))
+
+    # LLM gateway: concurrency, rate limiting and retries for Anthropic calls
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", 16))
+    LLM_MAX_CONCURRENCY_PER_MODEL: int = int(os.getenv("LLM_MAX_CONCURRENCY_PER_MODEL", 8))
+    LLM_REQUESTS_PER_MINUTE: float = float(os.getenv("LLM_REQUESTS_PER_MINUTE", 50))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", 4))
+    LLM_RETRY_BASE_DELAY: float = float(os.getenv("LLM_RETRY_BASE_DELAY", 1.0))
+    LLM_RETRY_MAX_DELAY: float = float(os.getenv("LLM_RETRY_MAX_DELAY", 30.0))
+    LLM_REQUEST_TIMEOUT: float = float(os.getenv("LLM_REQUEST_TIMEOUT", 120.0))
+    # Send a second copy of a call still running after this many seconds; 0 disables hedging
+    LLM_HEDGE_AFTER: float = float(os.getenv("LLM_HEDGE_AFTER", 0))
+
+    # Model per LLM task, with comma-separated fallbacks tried when it is unavailable
+    LLM_SCORING_MODEL: str = os.getenv("LLM_SCORING_MODEL", "claude-3-7-sonnet-20250219")
+    LLM_SCORING_FALLBACKS: str = os.getenv("LLM_SCORING_FALLBACKS", "claude-3-5-sonnet-20241022")
+    LLM_EXTRACTION_MODEL: str = os.getenv("LLM_EXTRACTION_MODEL", "claude-3-7-sonnet-20250219")
+    LLM_EXTRACTION_FALLBACKS: str = os.getenv("LLM_EXTRACTION_FALLBACKS", "claude-3-5-sonnet-20241022")
+    LLM_REPAIR_MODEL: str = os.getenv("LLM_REPAIR_MODEL", "claude-3-5-haiku-20241022")
+    LLM_REPAIR_FALLBACKS: str = os.getenv("LLM_REPAIR_FALLBACKS", "claude-3-7-sonnet-20250219")
+
+    # Logging and tracing; metrics are served on /metrics
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+    OTEL_EXPORTER_OTLP_ENDPOINT: Optional[str] = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+    OTEL_SERVICE_NAME: str = os.getenv("OTEL_SERVICE_NAME", "resume-job-matcher-api")
+
+    # Batch matching
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", 8))
+    BATCH_MAX_JOBS: int = int(os.getenv("BATCH_MAX_JOBS", 50))
+    BATCH_MAX_RESUMES: int = int(os.getenv("BATCH_MAX_RESUMES", 200))
+
+    # Local pre-scoring index
+    PRESCORE_INDEX_PATH: str = os.getenv("PRESCORE_INDEX_PATH", "uploads/cache/prescore_index.npz")
+    PRESCORE_HASH_DIM: int = int(os.getenv("PRESCORE_HASH_DIM", 4096))
+    PRESCORE_INDEX_MAX_DOCS: int = int(os.getenv("PRESCORE_INDEX_MAX_DOCS", 10000))
+    PRESCORE_SKILL_WEIGHT: float = float(os.getenv("PRESCORE_SKILL_WEIGHT", 0.5))
+    PRESCORE_SAVE_EVERY: int = int(os.getenv("PRESCORE_SAVE_EVERY", 100))
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,48 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# Bounded pools for the blocking parts of the request pipeline. Each kind of
+# work gets its own pool so a burst of slow scrapes or job sites cannot
+# starve file writes (and none can stall the event loop). CPU-bound PDF parsing runs in
+# worker processes, see app/services/pdf_parse_pool.py.
+io_executor = ThreadPoolExecutor(
+    max_workers=settings.BLOCKING_IO_WORKERS,
+    thread_name_prefix="blocking-io",
+)
+# Plain HTTP requests to job sites, one thread per pooled connection
+http_executor = ThreadPoolExecutor(
+    max_workers=settings.HTTP_POOL_SIZE,
+    thread_name_prefix="http-fetch",
+)
+scraper_executor = ThreadPoolExecutor(
+    max_workers=settings.SCRAPER_WORKERS,
+    thread_name_prefix="scraper",
+)
+# bcrypt releases the GIL, so these threads hash in parallel with the API
+hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+
+
+async def run_blocking(executor: Executor, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking callable on the given executor and await its result.
+    The caller's context (request id, current span) goes along with it.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(executor, functools.partial(context.run, func, *args, **kwargs))
+
+
+async def shutdown_executors():
+    """Shut down the worker pools."""
+    for executor in (io_executor, http_executor, scraper_executor, hash_executor):
+        executor.shutdown(wait=False, cancel_futures=True)
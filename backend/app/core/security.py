@@ -1,14 +1,220 @@
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Union
-from jose import jwt
+from typing import Any, Dict, Optional, Tuple, Union
+import asyncio
+import hashlib
+import threading
+import time
+from jose import jwk, jwt
+from jose.backends.base import Key
 from passlib.context import CryptContext
 import base64
 from app.core.config import settings
+from app.core.executors import hash_executor, run_blocking
+from app.core.telemetry import metrics
+from app.helpers.cache import LRUCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from jose import JWTError
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with another cost are flagged by verify_and_update and upgraded on login
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+
+class HasherBusyError(Exception):
+    """Raised when too many password hashes are already waiting."""
+
+
+class HasherTimeoutError(Exception):
+    """Raised when a password hash waited too long for a hashing thread."""
+
+
+class PasswordHasher:
+    """
+    bcrypt on a dedicated thread pool, so signups and logins never block the
+    event loop and a login storm cannot take the threads other work uses.
+
+    At most `max_queue` hashes wait for a thread; beyond that callers get
+    HasherBusyError straight away, and a hash that waits more than
+    `max_wait` seconds gives up with HasherTimeoutError.
+    """
+
+    def __init__(self, workers: int, max_queue: int, max_wait: float):
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._slots = asyncio.Semaphore(workers)
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.rehashed = 0
+        self.total_seconds = 0.0
+
+    async def _admit(self):
+        if not self._slots.locked():
+            # A thread is free; acquiring does not wait
+            await self._slots.acquire()
+            return
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise HasherBusyError("Too many sign-in attempts are being processed, please retry shortly")
+
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise HasherTimeoutError("Sign-in is temporarily overloaded, please retry shortly")
+        finally:
+            self.queued -= 1
+
+    async def _run(self, func, *args):
+        await self._admit()
+
+        self.in_flight += 1
+        start = time.monotonic()
+        try:
+            return await run_blocking(hash_executor, func, *args)
+        finally:
+            self.total_seconds += time.monotonic() - start
+            self.completed += 1
+            self.in_flight -= 1
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Whether the password matches, and a new hash to store when the
+        stored one was made with different settings (None otherwise).
+        """
+        valid, new_hash = await self._run(pwd_context.verify_and_update, password, hashed_password)
+        if valid and new_hash:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rounds": settings.BCRYPT_ROUNDS,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "rehashed": self.rehashed,
+            "avg_seconds": round(self.total_seconds / self.completed, 4) if self.completed else None,
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_SIZE,
+    max_wait=settings.PASSWORD_HASH_MAX_WAIT,
+)
+metrics.stats("password_hasher_stats", "Password hashing queue, rejections and cost upgrades", password_hasher.stats)
+
+
+def _decode_key(encoded: str) -> str:
+    return base64.b64decode(encoded).decode('utf-8')
+
+
+class KeyManager:
+    """
+    JWT signing and verification keys, parsed once instead of on every call.
+
+    New tokens are signed with the current private key and carry its `kid`.
+    Verification picks the public key by the token's `kid`, so tokens
+    signed before a rotation stay valid while their old public key is
+    listed in JWT_PREVIOUS_PUBLIC_KEYS. Tokens without a `kid` (issued
+    before kids existed) are checked against every known key.
+
+    Verified claims are cached for a short time, keyed by a hash of the
+    token, so repeat requests with the same bearer token skip the signature
+    check. Cached claims never outlive the token's own expiry.
+    """
+
+    def __init__(self, cache_ttl: float, cache_entries: int):
+        self.cache_ttl = cache_ttl
+        self.verified = LRUCache[Dict[str, Any]](max_entries=cache_entries)
+        self._lock = threading.Lock()
+        self._signing_key: Optional[Key] = None
+        self._kid: Optional[str] = None
+        self._public_keys: Dict[str, Key] = {}
+
+    def load(self):
+        """Parse the configured keys; safe to call more than once."""
+        with self._lock:
+            if self._signing_key is not None:
+                return
+            algorithm = settings.ALGORITHM
+            public_pem = _decode_key(settings.JWT_PUBLIC_KEY)
+            kid = settings.JWT_KEY_ID or hashlib.sha256(public_pem.encode("utf-8")).hexdigest()[:16]
+            public_keys = {kid: jwk.construct(public_pem, algorithm)}
+            for entry in settings.JWT_PREVIOUS_PUBLIC_KEYS.split(","):
+                if not entry.strip():
+                    continue
+                old_kid, _, encoded = entry.strip().partition(":")
+                public_keys[old_kid] = jwk.construct(_decode_key(encoded), algorithm)
+            self._public_keys = public_keys
+            self._kid = kid
+            self._signing_key = jwk.construct(_decode_key(settings.JWT_PRIVATE_KEY), algorithm)
+
+    def sign(self, claims: Dict[str, Any]) -> str:
+        self.load()
+        return jwt.encode(claims, self._signing_key, algorithm=settings.ALGORITHM, headers={"kid": self._kid})
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Claims of a valid token; raises JWTError otherwise."""
+        cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+        claims = self.verified.get(cache_key)
+        if claims is not None:
+            return claims
+
+        self.load()
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            keys = list(self._public_keys.values())
+        elif kid in self._public_keys:
+            keys = [self._public_keys[kid]]
+        else:
+            raise JWTError("Unknown signing key")
+
+        claims = None
+        for index, key in enumerate(keys):
+            try:
+                claims = jwt.decode(token, key, algorithms=[settings.ALGORITHM])
+                break
+            except JWTError:
+                if index == len(keys) - 1:
+                    raise
+
+        ttl = self.cache_ttl
+        if isinstance(claims.get("exp"), (int, float)):
+            ttl = min(ttl, claims["exp"] - time.time())
+        if ttl > 0:
+            self.verified.set(cache_key, claims, ttl=ttl)
+        return claims
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kid": self._kid,
+            "public_keys": list(self._public_keys),
+            "verified_cache": self.verified.stats(),
+        }
+
+
+key_manager = KeyManager(
+    cache_ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+    cache_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+)
+metrics.stats("verified_token_cache_stats", "Verified access token cache hits, misses and size", lambda: key_manager.stats()["verified_cache"])
+
+
+async def load_signing_keys():
+    """Parse the JWT keys at startup so a bad key fails fast, not on the first login."""
+    key_manager.load()
+
 
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -18,18 +224,9 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    
+
     to_encode = {"exp": expire, "sub": str(subject)}
-    
-    # Decode the base64 private key
-    private_key = base64.b64decode(settings.JWT_PRIVATE_KEY).decode('utf-8')
-    
-    encoded_jwt = jwt.encode(
-        to_encode, 
-        private_key, 
-        algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt
+    return key_manager.sign(to_encode)
 
 def create_refresh_token(subject: Union[str, Any]) -> str:
     """
@@ -37,16 +234,7 @@ def create_refresh_token(subject: Union[str, Any]) -> str:
     """
     expire = datetime.utcnow() + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
     to_encode = {"exp": expire, "sub": str(subject)}
-    
-    # Decode the base64 private key
-    private_key = base64.b64decode(settings.JWT_PRIVATE_KEY).decode('utf-8')
-    
-    encoded_jwt = jwt.encode(
-        to_encode, 
-        private_key, 
-        algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt
+    return key_manager.sign(to_encode)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -72,21 +260,14 @@ async def get_current_user(token: str = Depends(security)):
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
     try:
-        # Decode the base64 public key for verification
-        public_key = base64.b64decode(settings.JWT_PUBLIC_KEY).decode('utf-8')
-        
-        payload = jwt.decode(
-            token.credentials,
-            public_key,
-            algorithms=[ALGORITHM]
-        )
+        payload = key_manager.verify(token.credentials)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
-        
+
         return {"id": user_id}
-        
+
     except JWTError:
-        raise credentials_exception 
\ No newline at end of file
+        raise credentials_exception
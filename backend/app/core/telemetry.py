@@ -0,0 +1,379 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Set per HTTP request by TelemetryMiddleware and carried into worker threads by run_blocking
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+# OpenTelemetry tracer, only when OTEL_EXPORTER_OTLP_ENDPOINT is set and the SDK is installed
+_tracer = None
+_tracer_provider = None
+
+# Request stages take from milliseconds (cache hits) to minutes (scrape + two LLM calls)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DURATION_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            series = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, series):
+                    labels = _labels(self.label_names, key, f'le="{bound:g}"')
+                    lines.append(f"{self.name}_bucket{labels} {count:g}")
+                labels = _labels(self.label_names, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {series[-2]:g}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, key)} {series[-2]:g}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {series[-1]:g}")
+        return lines
+
+
+class Gauge:
+    """Value read from a callback at scrape time, e.g. calls in flight."""
+
+    def __init__(self, name: str, help: str, read: Callable[[], float]):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def render(self) -> List[str]:
+        try:
+            value = float(self.read())
+        except Exception:
+            return []
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {value:g}"]
+
+
+def _numeric_leaves(value: Any, path: str = "") -> Iterator[Tuple[str, float]]:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _numeric_leaves(item, f"{path}.{key}" if path else str(key))
+    elif isinstance(value, (int, float)) and path:
+        yield path, float(value)
+
+
+class StatsGauge:
+    """
+    A component's `stats()` dict read at scrape time and exported as one
+    gauge family, a sample per numeric value labelled with its dotted path.
+    Strings, lists and unset values are left out.
+    """
+
+    def __init__(self, name: str, help: str, read: Callable[[], Dict[str, Any]]):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def render(self) -> List[str]:
+        try:
+            leaves = list(_numeric_leaves(self.read()))
+        except Exception:
+            return []
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for path, value in leaves:
+            lines.append(f"{self.name}{_labels(('stat',), (path,))} {value:g}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-local metrics rendered in the Prometheus text format. Each
+    worker process exports its own; Prometheus aggregates across targets.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DURATION_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def gauge(self, name: str, help: str, read: Callable[[], float]) -> Gauge:
+        return self._register(Gauge(name, help, read))
+
+    def stats(self, name: str, help: str, read: Callable[[], Dict[str, Any]]) -> StatsGauge:
+        return self._register(StatsGauge(name, help, read))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+HTTP_REQUESTS = metrics.counter("http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+HTTP_SECONDS = metrics.histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+STAGE_SECONDS = metrics.histogram("stage_duration_seconds", "Time spent in each request stage", ("stage", "outcome"))
+LLM_TOKENS = metrics.counter("llm_tokens_total", "LLM tokens by model, prompt and kind", ("model", "prompt", "kind"))
+CACHE_LOOKUPS = metrics.counter("cache_lookups_total", "Cache lookups by cache and result", ("cache", "result"))
+
+
+class Span:
+    """Attributes collected while a stage runs; logged and exported when it ends."""
+
+    def __init__(self, stage: str, attributes: Dict[str, Any]):
+        self.stage = stage
+        self.attributes = attributes
+
+    def set(self, key: str, value: Any):
+        self.attributes[key] = value
+
+
+def _trace(name: str, attributes: Dict[str, Any]):
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(name, attributes=_otel_attributes(attributes))
+
+
+def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in attributes.items() if isinstance(value, (str, bool, int, float))}
+
+
+@contextmanager
+def span(stage: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Time one stage of a request. The duration goes to the
+    `stage_duration_seconds` histogram and the log, together with any
+    attributes set on the span while it runs (token counts, cache hits...),
+    and to OpenTelemetry as a child of the enclosing span when tracing is on.
+    """
+    current = Span(stage, dict(attributes))
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    outcome = "ok"
+    with _trace(stage, attributes) as otel_span:
+        try:
+            yield current
+        except BaseException as e:
+            outcome = "error"
+            current.set("error", type(e).__name__)
+            if otel_span is not None:
+                otel_span.record_exception(e)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                # Ended in another context, e.g. an async generator closed elsewhere
+                pass
+            STAGE_SECONDS.observe(elapsed, stage=stage, outcome=outcome)
+            if otel_span is not None:
+                otel_span.set_attributes(_otel_attributes(current.attributes))
+            fields = {key: value for key, value in current.attributes.items() if key not in _RECORD_FIELDS}
+            logger.info("stage %s took %.3fs", stage, elapsed, extra={
+                **fields, "stage": stage, "seconds": round(elapsed, 4), "outcome": outcome,
+            })
+
+
+def annotate(**attributes: Any):
+    """Set attributes on the innermost running span, if any."""
+    current = _current_span.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+    annotate(**{f"{cache}_cache_hit": hit})
+
+
+def record_llm_usage(model: str, prompt: str, usage: Dict[str, Any]):
+    input_tokens = int(usage.get("input_tokens") or 0)
+    output_tokens = int(usage.get("output_tokens") or 0)
+    cache_read = int(usage.get("cache_read_input_tokens") or 0)
+    LLM_TOKENS.inc(input_tokens, model=model, prompt=prompt, kind="input")
+    LLM_TOKENS.inc(output_tokens, model=model, prompt=prompt, kind="output")
+    if cache_read:
+        LLM_TOKENS.inc(cache_read, model=model, prompt=prompt, kind="cache_read")
+    annotate(model=model, input_tokens=input_tokens, output_tokens=output_tokens, cache_read_input_tokens=cache_read)
+
+
+class TelemetryMiddleware:
+    """
+    Gives every HTTP request an id (the incoming X-Request-ID or a new one,
+    echoed in the response), a root trace span, and records its latency and
+    status by route template so /metrics does not grow with every URL.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1")[:64] or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        status = 500
+
+        async def send_with_request_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        start = time.perf_counter()
+        method = scope["method"]
+        try:
+            with _trace(f"{method} {scope['path']}", {"http.method": method, "request_id": request_id}):
+                await self.app(scope, receive, send_with_request_id)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status))
+            HTTP_SECONDS.observe(elapsed, method=method, route=route)
+            logger.info("%s %s %s %.3fs", method, scope["path"], status, elapsed, extra={
+                "method": method, "route": route, "status": status, "seconds": round(elapsed, 4),
+            })
+            request_id_var.reset(token)
+
+
+# Attributes every LogRecord has; anything else was passed in `extra`
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+class _RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_FIELDS})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging():
+    """Send app logs to stderr as JSON lines (LOG_FORMAT=json) or plain text, tagged with the request id."""
+    handler = logging.StreamHandler()
+    handler.addFilter(_RequestIdFilter())
+    if settings.LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+    app_logger = logging.getLogger("app")
+    app_logger.handlers = [handler]
+    app_logger.setLevel(settings.LOG_LEVEL.upper())
+    app_logger.propagate = False
+
+
+async def setup_tracing():
+    """Export spans over OTLP/HTTP when OTEL_EXPORTER_OTLP_ENDPOINT is set."""
+    global _tracer, _tracer_provider
+    if not settings.OTEL_EXPORTER_OTLP_ENDPOINT:
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning(
+            "OTEL_EXPORTER_OTLP_ENDPOINT is set but opentelemetry-sdk and "
+            "opentelemetry-exporter-otlp-proto-http are not installed; tracing is off"
+        )
+        return
+
+    _tracer_provider = TracerProvider(resource=Resource.create({"service.name": settings.OTEL_SERVICE_NAME}))
+    endpoint = settings.OTEL_EXPORTER_OTLP_ENDPOINT.rstrip("/") + "/v1/traces"
+    _tracer_provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+    trace.set_tracer_provider(_tracer_provider)
+    _tracer = trace.get_tracer("app")
+    logger.info("Exporting traces to %s", endpoint)
+
+
+async def shutdown_tracing():
+    """Flush spans still buffered for export."""
+    if _tracer_provider is not None:
+        _tracer_provider.shutdown()
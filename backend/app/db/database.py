@@ -1,16 +1,37 @@
+from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.database import Database
+from pymongo.write_concern import WriteConcern
 from app.core.config import settings
 
-client = AsyncIOMotorClient(settings.MONGODB_URL)
+client = AsyncIOMotorClient(
+    settings.MONGODB_URL,
+    maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+    minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+    maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+    waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+    serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+)
 db = client[settings.MONGODB_DB_NAME]
 
 def get_database() -> Database:
     return db
 
-def get_collection(collection_name: str):
-    """Get collection from database."""
-    return get_database()[collection_name]
+def write_concern(w: Optional[str] = None, journal: Optional[bool] = None) -> WriteConcern:
+    """
+    Write concern from a setting value: a number of nodes ("0", "1", ...),
+    "majority", or empty for the server default.
+    """
+    if not w:
+        return WriteConcern(j=journal)
+    return WriteConcern(w=int(w) if w.isdigit() else w, j=journal)
+
+def get_collection(collection_name: str, concern: Optional[WriteConcern] = None):
+    """Get collection from database, optionally with its own write concern."""
+    collection = get_database()[collection_name]
+    if concern is not None:
+        collection = collection.with_options(write_concern=concern)
+    return collection
 
 async def connect_to_mongo():
     """Create database connection."""
@@ -20,4 +41,4 @@ async def connect_to_mongo():
 
 async def close_mongo_connection():
     """Close database connection."""
-    client.close() 
\ No newline at end of file
+    client.close()
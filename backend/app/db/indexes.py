@@ -0,0 +1,67 @@
+import logging
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+from app.db.database import get_collection
+
+logger = logging.getLogger(__name__)
+
+# Every index the app relies on, by collection. Queries elsewhere assume these exist.
+INDEXES: Dict[str, List[IndexModel]] = {
+    # Login and signup look users up by email; unique also closes the signup race
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+    ],
+    # A user's applications, newest first; _id breaks ties for keyset pagination
+    "applications": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="user_created_id"),
+    ],
+    # Unfinished jobs are picked up in submission order at startup
+    "analysis_jobs": [
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created"),
+        IndexModel([("owner", ASCENDING), ("status", ASCENDING)], name="owner_status"),
+    ],
+    # Cache collections expire their own entries. These keep the default names
+    # the caches used when they created the indexes themselves, so existing
+    # databases do not hit an index options conflict.
+    "match_results": [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_1"),
+    ],
+    "job_postings": [
+        IndexModel([("purge_at", ASCENDING)], expireAfterSeconds=0, name="purge_at_1"),
+    ],
+}
+
+# Indexes an earlier version declared and a current one replaces, by collection
+OBSOLETE_INDEXES: Dict[str, List[str]] = {
+    # Superseded by user_created_id, which adds the _id tie-break
+    "applications": ["user_created"],
+}
+
+# NamespaceNotFound and IndexNotFound: nothing left to drop
+ALREADY_DROPPED_CODES = (26, 27)
+
+
+async def ensure_indexes():
+    """
+    Create any missing index at startup, after dropping obsolete ones.
+    Existing indexes are left alone, so this is cheap on every boot. A
+    collection whose index cannot be built (e.g. duplicate emails blocking
+    the unique index) is logged and skipped rather than keeping the API down.
+    """
+    for collection_name, names in OBSOLETE_INDEXES.items():
+        for name in names:
+            try:
+                await get_collection(collection_name).drop_index(name)
+                logger.info("Dropped obsolete index %s on %s", name, collection_name)
+            except PyMongoError as e:
+                if getattr(e, "code", None) not in ALREADY_DROPPED_CODES:
+                    logger.error("Could not drop index %s on %s: %s", name, collection_name, e)
+
+    for collection_name, indexes in INDEXES.items():
+        try:
+            await get_collection(collection_name).create_indexes(indexes)
+        except PyMongoError as e:
+            logger.error("Could not create indexes on %s: %s", collection_name, e)
@@ -0,0 +1,90 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+
+def clean_text(soup: BeautifulSoup) -> str:
+    """Visible text of a parsed page, one phrase per line, without scripts or styles."""
+    for script in soup(["script", "style", "noscript", "template"]):
+        script.extract()
+
+    text = soup.get_text(separator='\n')
+
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
+
+def html_to_text(html: str) -> str:
+    return clean_text(BeautifulSoup(html, 'html.parser'))
+
+
+def main_content_text(html: str) -> str:
+    """
+    Text of the page's main content area, falling back to the whole body
+    when the page has no <main>, <article> or role="main" element.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    for element in soup(["nav", "footer", "aside"]):
+        element.extract()
+    main = soup.find("main") or soup.find(attrs={"role": "main"}) or soup.find("article")
+    return clean_text(main or soup)
+
+
+def _iter_json_ld_nodes(data: Any):
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_json_ld_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _iter_json_ld_nodes(data["@graph"])
+
+
+def extract_json_ld(html: str, schema_type: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    JSON-LD objects embedded in the page, optionally only those whose
+    @type is `schema_type` (e.g. "JobPosting"). Malformed blocks are skipped.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    nodes = []
+    for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
+        try:
+            data = json.loads(script.string or "")
+        except (json.JSONDecodeError, TypeError):
+            continue
+        for node in _iter_json_ld_nodes(data):
+            node_type = node.get("@type")
+            types = node_type if isinstance(node_type, list) else [node_type]
+            if schema_type is None or schema_type in types:
+                nodes.append(node)
+    return nodes
+
+
+def job_posting_text(posting: Dict[str, Any]) -> str:
+    """Readable text for a schema.org JobPosting object."""
+    organization = posting.get("hiringOrganization")
+    company = organization.get("name") if isinstance(organization, dict) else organization
+    parts = [
+        f"Job title: {posting.get('title', '')}",
+        f"Company: {company or ''}",
+    ]
+    for field, label in (
+        ("employmentType", "Employment type"),
+        ("experienceRequirements", "Experience"),
+        ("skills", "Skills"),
+        ("qualifications", "Qualifications"),
+        ("responsibilities", "Responsibilities"),
+    ):
+        value = posting.get(field)
+        if isinstance(value, dict):
+            value = value.get("description") or value.get("name")
+        if isinstance(value, list):
+            value = ", ".join(str(item) for item in value)
+        if value:
+            parts.append(f"{label}: {html_to_text(str(value))}")
+    description = posting.get("description")
+    if description:
+        parts.append(html_to_text(description))
+    return '\n'.join(parts)
@@ -0,0 +1,30 @@
+import re
+from typing import Iterable, List
+
+# What an insight is about, from the areas the match prompt scores. Checked
+# in order; an insight can touch several themes.
+THEME_KEYWORDS = {
+    "skills": ("skill", "proficien", "technolog", "tool", "stack", "framework", "language"),
+    "experience": ("experience", "role", "responsibilit", "years", "background", "industry"),
+    "achievements": ("quantif", "metric", "impact", "achievement", "result", "%", "number"),
+    "keywords": ("keyword", "terminology", "wording", "mirror", "job description", "ats"),
+    "projects": ("project", "portfolio", "github", "open source", "built"),
+    "education": ("education", "degree", "course", "coursework", "university", "training"),
+    "certifications": ("certif", "licen", "accredit"),
+    "leadership": ("leadership", "lead ", "led ", "mentor", "manag", "team"),
+    "summary": ("summary", "objective", "cover letter", "headline", "profile"),
+    "formatting": ("format", "layout", "length", "concise", "section", "bullet", "structure"),
+    "publications": ("publication", "paper", "research", "patent"),
+    "awards": ("award", "honor", "recognition"),
+}
+
+_THEME_PATTERNS = [
+    (theme, re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE))
+    for theme, keywords in THEME_KEYWORDS.items()
+]
+
+
+def insight_themes(insights: Iterable[str]) -> List[str]:
+    """Themes the insights touch, in THEME_KEYWORDS order, without duplicates."""
+    text = "\n".join(insights or [])
+    return [theme for theme, pattern in _THEME_PATTERNS if pattern.search(text)]
@@ -0,0 +1,161 @@
+import json
+import re
+from typing import Any, Optional
+
+FENCE_PATTERN = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+SMART_DOUBLE_QUOTES = "“”"
+SINGLE_QUOTES = str.maketrans({"'": '"', "‘": '"', "’": '"'})
+TRAILING_COMMA_PATTERN = re.compile(r",(\s*[}\]])")
+PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """
+    The first complete top-level JSON object in `text`, ignoring code fences
+    and any prose around it. An object cut off before its closing brace is
+    returned up to the end of the text, for `repair_json` to close.
+    """
+    if not text:
+        return None
+    fenced = FENCE_PATTERN.search(text)
+    if fenced and "{" in fenced.group(1):
+        text = fenced.group(1)
+
+    start = text.find("{")
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for position in range(start, len(text)):
+        char = text[position]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:position + 1]
+    return text[start:]
+
+
+def _close_truncated(text: str) -> str:
+    """Close an unterminated string and any brackets left open by a cut-off response."""
+    stack = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+    if in_string:
+        text += '"'
+    text = text.rstrip().rstrip(",")
+    return text + "".join(reversed(stack))
+
+
+def _closes_string(text: str, position: int) -> bool:
+    """Whether a quote ending at `position` is followed by JSON structure rather than more prose."""
+    rest = text[position:].lstrip()
+    return not rest or rest[0] in ",:}]"
+
+
+def _replace_python_literals(text: str) -> str:
+    return re.sub(r"(?<!\w)(True|False|None)(?!\w)", lambda m: PYTHON_LITERALS[m.group(1)], text)
+
+
+def _repair_outside_strings(text: str) -> str:
+    """
+    Drop // comments, turn Python literals into JSON ones and smart quotes
+    used as string delimiters into plain ones. String contents (URLs, a
+    “quoted” word, the word True in a sentence) are left alone.
+    """
+    kept = []
+    outside = []
+    in_string = False
+    smart_string = False
+    escaped = False
+    position = 0
+
+    def flush():
+        kept.append(_replace_python_literals("".join(outside)))
+        outside.clear()
+
+    while position < len(text):
+        char = text[position]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            elif smart_string and char in SMART_DOUBLE_QUOTES and _closes_string(text, position + 1):
+                # Only a string opened with a smart quote can be closed by one
+                char = '"'
+                in_string = False
+            kept.append(char)
+        elif char == '"' or char in SMART_DOUBLE_QUOTES:
+            flush()
+            kept.append('"')
+            in_string = True
+            smart_string = char != '"'
+        elif text.startswith("//", position):
+            end = text.find("\n", position)
+            position = len(text) if end == -1 else end
+            continue
+        else:
+            outside.append(char)
+        position += 1
+    flush()
+    return "".join(kept)
+
+
+def repair_json(text: str) -> str:
+    """
+    Fix the mistakes models commonly make in JSON: smart quotes, trailing
+    commas, // comments, Python literals, single-quoted strings and output
+    cut off mid-object.
+    """
+    repaired = text
+    if not any(quote in repaired for quote in '"' + SMART_DOUBLE_QUOTES):
+        repaired = repaired.translate(SINGLE_QUOTES)
+    repaired = _repair_outside_strings(repaired)
+    repaired = _close_truncated(repaired)
+    return TRAILING_COMMA_PATTERN.sub(r"\1", repaired)
+
+
+def loads_tolerant(text: str) -> Any:
+    """
+    Parse the JSON object in a model response, repairing it locally if
+    needed. Raises ValueError when no object can be recovered.
+    """
+    candidate = extract_json_object(text)
+    if candidate is None:
+        raise ValueError("No JSON object found in the response")
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(repair_json(candidate))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in the response: {e}") from e
@@ -0,0 +1,141 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+# ("value", key, value) for a top-level field, ("item", key, value) for each element of a top-level list
+JsonEvent = Tuple[str, str, Any]
+
+
+class JsonStreamParser:
+    """
+    Incremental parser for a streamed JSON object such as
+    {"score": 80, "insights": ["...", "..."]}.
+
+    `feed` takes text chunks as they arrive and returns the events that
+    became complete: each top-level field once its value is closed, and
+    each element of a top-level list as soon as that element is closed,
+    before the rest of the list arrives. Text before the opening brace
+    (e.g. a ```json fence) is ignored. Nested values are reported whole.
+    """
+
+    def __init__(self):
+        self._started = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key: Optional[str] = None
+        self._expect_key = False
+        self._in_list = False
+        # Raw text of the key, field value or list element being read
+        self._buffer: List[str] = []
+        self._reading: Optional[str] = None  # "key", "value" or "item"
+        self._value_depth = 0
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, chunk: str) -> List[JsonEvent]:
+        events: List[JsonEvent] = []
+        for char in chunk:
+            event = self._consume(char)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _consume(self, char: str) -> Optional[JsonEvent]:
+        if self._done:
+            return None
+        if not self._started:
+            if char == "{":
+                self._started = True
+                self._depth = 1
+                self._expect_key = True
+            return None
+
+        if self._reading is not None:
+            return self._consume_reading(char)
+
+        if char.isspace() or char in ",:":
+            if char == "," and self._depth == 1:
+                self._expect_key = True
+            return None
+        if char == "}" and self._depth == 1:
+            self._done = True
+            return None
+        if char == "]" and self._in_list:
+            self._in_list = False
+            self._depth = 1
+            return None
+
+        if self._depth == 1 and self._expect_key:
+            if char == '"':
+                self._start("key", char)
+            return None
+        if self._depth == 1 and char == "[":
+            self._in_list = True
+            self._depth = 2
+            return None
+        self._start("item" if self._in_list else "value", char)
+        return None
+
+    def _start(self, reading: str, char: str):
+        self._reading = reading
+        self._buffer = [char]
+        self._in_string = char == '"'
+        self._escaped = False
+        self._value_depth = 1 if char in "{[" else 0
+
+    def _consume_reading(self, char: str) -> Optional[JsonEvent]:
+        first = self._buffer[0]
+        if self._in_string:
+            self._buffer.append(char)
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                if first == '"':
+                    return self._finish()
+            return None
+
+        if first in "{[":
+            self._buffer.append(char)
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._value_depth += 1
+            elif char in "}]":
+                self._value_depth -= 1
+                if self._value_depth == 0:
+                    return self._finish()
+            return None
+
+        # Bare scalar (number, true, false, null): ends at a delimiter
+        if char in ",}]" or char.isspace():
+            event = self._finish()
+            # The delimiter still has to close the list or object
+            self._consume(char)
+            return event
+        self._buffer.append(char)
+        return None
+
+    def _finish(self) -> Optional[JsonEvent]:
+        raw = "".join(self._buffer)
+        reading = self._reading
+        self._reading = None
+        self._buffer = []
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+
+        if reading == "key":
+            self._key = value
+            self._expect_key = False
+            return None
+        if self._key is None:
+            return None
+        return (reading, self._key, value)
+
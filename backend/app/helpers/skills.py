@@ -0,0 +1,42 @@
+import re
+from typing import Iterable, List
+
+# Common skill terms looked up in job postings and resumes. Kept lowercase;
+# matching is case-insensitive on word boundaries.
+SKILL_TERMS = [
+    # Languages
+    "python", "java", "javascript", "typescript", "golang", "rust", "c++", "c#", "ruby", "php",
+    "kotlin", "swift", "scala", "sql", "bash", "html", "css",
+    # Frameworks and libraries
+    "react", "angular", "vue", "next.js", "node.js", "express.js", "django", "flask", "fastapi",
+    "spring", "spring boot", ".net", "ruby on rails", "laravel", "tailwind", "redux", "graphql", "rest api",
+    "pandas", "numpy", "scikit-learn", "pytorch", "tensorflow", "keras", "spark", "hadoop",
+    "langchain", "airflow", "dbt", "kafka", "rabbitmq", "celery",
+    # Data stores
+    "postgresql", "postgres", "mysql", "mongodb", "redis", "elasticsearch", "dynamodb", "cassandra",
+    "snowflake", "bigquery", "redshift", "sqlite",
+    # Cloud and infrastructure
+    "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "terraform", "ansible", "linux",
+    "ci/cd", "jenkins", "github actions", "gitlab", "git", "microservices", "serverless", "nginx",
+    # Practices and domains
+    "machine learning", "deep learning", "nlp", "computer vision", "data analysis", "data engineering",
+    "data science", "statistics", "llm", "generative ai", "devops", "mlops", "agile", "scrum",
+    "unit testing", "tdd", "system design", "distributed systems", "security", "api design",
+    # Tools
+    "jira", "figma", "tableau", "power bi", "microsoft excel", "salesforce", "sap",
+    # Business and soft skills
+    "project management", "product management", "stakeholder management", "communication",
+    "leadership", "mentoring", "problem solving", "negotiation", "customer service", "sales",
+    "marketing", "seo", "content writing", "accounting", "financial analysis", "recruiting",
+]
+
+_SKILL_PATTERNS = [
+    (term, re.compile(r"(?<![\w+#.])" + re.escape(term) + r"(?![\w+#])", re.IGNORECASE))
+    for term in SKILL_TERMS
+]
+
+
+def find_skills(texts: Iterable[str]) -> List[str]:
+    """Known skill terms mentioned in `texts`, in vocabulary order, without duplicates."""
+    text = "\n".join(texts)
+    return [term for term, pattern in _SKILL_PATTERNS if pattern.search(text)]
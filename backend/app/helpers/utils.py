@@ -1,5 +1,8 @@
 from typing import Set
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "trk", "trackingid", "refid", "ref", "src", "source"}
 
 def allowed_file(filename: str, allowed_extensions: Set[str]) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions
@@ -9,4 +12,22 @@ def validate_url(url: str) -> bool:
         result = urlparse(url)
         return all([result.scheme, result.netloc])
     except ValueError:
-        return False
\ No newline at end of file
+        return False
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for use as a cache key: lowercase scheme and host,
+    no default port, fragment or tracking parameters, sorted query string.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if parsed.port and (scheme, parsed.port) not in {("http", 80), ("https", 443)}:
+        host = f"{host}:{parsed.port}"
+    path = parsed.path.rstrip("/") or "/"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunparse((scheme, host, path, "", urlencode(query), ""))
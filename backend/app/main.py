@@ -2,8 +2,21 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 from app.api.routes import api_router
+from app.api.routes import metrics
 from app.core.config import settings
+from app.core.security import load_signing_keys
+from app.core.telemetry import TelemetryMiddleware, configure_logging, setup_tracing, shutdown_tracing
 from app.db.database import connect_to_mongo, close_mongo_connection
+from app.db.indexes import ensure_indexes
+from app.core.executors import shutdown_executors
+from app.prompts.registry import load_prompts
+from app.services.analysis_jobs import start_analysis_queue, stop_analysis_queue
+from app.services.batch_matcher import check_batch_limits
+from app.services.browser_pool import close_browser_pool, warm_up_browser_pool
+from app.services.pdf_parse_pool import shutdown_pdf_parse_pool
+from app.services.prescorer import save_prescore_index
+
+configure_logging()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -20,13 +33,38 @@ if settings.CLIENT_ORIGIN:
         allow_headers=["*"],
     )
 
+# Request ids, latency metrics and the root trace span for every request
+app.add_middleware(TelemetryMiddleware)
+app.add_event_handler("startup", setup_tracing)
+app.add_event_handler("shutdown", shutdown_tracing)
+
 # Database events
 app.add_event_handler("startup", connect_to_mongo)
+app.add_event_handler("startup", ensure_indexes)
 app.add_event_handler("shutdown", close_mongo_connection)
 
+# Batch size limits must fit the PDF parse queue
+app.add_event_handler("startup", check_batch_limits)
+
+# Prompt templates and JWT keys are parsed once, before the first request
+app.add_event_handler("startup", load_prompts)
+app.add_event_handler("startup", load_signing_keys)
+
+# Worker pool events
+app.add_event_handler("startup", start_analysis_queue)
+app.add_event_handler("shutdown", stop_analysis_queue)
+app.add_event_handler("startup", warm_up_browser_pool)
+app.add_event_handler("shutdown", close_browser_pool)
+app.add_event_handler("shutdown", shutdown_pdf_parse_pool)
+app.add_event_handler("shutdown", save_prescore_index)
+app.add_event_handler("shutdown", shutdown_executors)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+# Prometheus scrapes /metrics at the root, outside the versioned API
+app.include_router(metrics.router)
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
@@ -0,0 +1,31 @@
+from app.prompts.registry import PromptSpec, prompt_registry
+from app.schemas.analysis import JOB_FIELD_TYPES
+
+_SCHEMA = ",\n".join(f'    "{field}": {field_type}' for field, field_type in JOB_FIELD_TYPES.items())
+
+# The schema is part of the static prefix; the fields wanted on a given call
+# are named in the user message so the prefix stays identical across calls.
+JOB_EXTRACTION = prompt_registry.register(PromptSpec(
+    name="job_extraction",
+    version="2",
+    system="""
+You are an expert job data extractor. You will be given the content from a job posting webpage and the names of the fields to extract.
+
+Extract those fields in a structured format according to this schema:
+{
+""" + _SCHEMA + """
+}
+
+Include only the requested fields in your answer.
+
+If any field is not explicitly available in the content, make a reasonable inference based on context or leave as an empty string or empty list as appropriate.
+
+Return ONLY a valid JSON object with no additional text, comments, or explanations.
+""",
+    user="""
+Fields to extract: {fields}
+
+Job posting content:
+{content}
+""",
+))
@@ -0,0 +1,24 @@
+from app.prompts.registry import PromptSpec, prompt_registry
+
+# Sent with only the malformed output, never the original inputs, so a re-ask costs a few hundred tokens
+JSON_REPAIR = prompt_registry.register(PromptSpec(
+    name="json_repair",
+    version="1",
+    system="""
+You fix malformed JSON produced by another model. You will be given a JSON schema, the error found when validating the output, and the output itself.
+
+Return the same content as a single valid JSON object that matches the schema. Keep every value from the output that fits the schema; do not invent new content beyond what is needed to make the object valid.
+
+Return ONLY the JSON object with no additional text, comments, or explanations.
+""",
+    user="""
+Schema:
+{schema}
+
+Error:
+{error}
+
+Output to fix:
+{output}
+""",
+))
@@ -0,0 +1,106 @@
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
+
+from app.core.telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+
+# The provider ignores cache markers on shorter prefixes (1024 tokens on
+# Sonnet, 2048 on Haiku)
+MIN_CACHEABLE_TOKENS = 1024
+# Rough English ratio, the same one the text compactor uses
+CHARS_PER_TOKEN = 4
+
+
+class PromptSpec:
+    """
+    A versioned prompt: static `system` instructions and a `user` template
+    with the per-call variables.
+
+    The template is compiled once. The system block is sent as-is (no
+    variable substitution, so it can contain literal braces). It only
+    carries a prompt-cache marker when it is long enough for the provider
+    to cache; the current prompts are well below that, so they are sent
+    without one and every call pays for the full prompt. `cached` says
+    which case applies.
+    """
+
+    def __init__(self, name: str, version: str, system: str, user: str):
+        self.name = name
+        self.version = version
+        self.system = system.strip()
+        self.user = user.strip()
+        self.cached = len(self.system) / CHARS_PER_TOKEN >= MIN_CACHEABLE_TOKENS
+        system_block: Dict[str, Any] = {"type": "text", "text": self.system}
+        if self.cached:
+            system_block["cache_control"] = {"type": "ephemeral"}
+        self.template = ChatPromptTemplate.from_messages([
+            SystemMessage(content=[system_block]),
+            HumanMessagePromptTemplate.from_template(self.user),
+        ])
+
+    @property
+    def key(self) -> str:
+        """Name and version, e.g. for cache keys of results this prompt produced."""
+        return f"{self.name}@{self.version}"
+
+    @property
+    def input_variables(self) -> List[str]:
+        return list(self.template.input_variables)
+
+
+class PromptRegistry:
+    """Every prompt the app sends, by name, with token usage recorded per prompt."""
+
+    def __init__(self):
+        self._prompts: Dict[str, PromptSpec] = {}
+        self._usage: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, spec: PromptSpec) -> PromptSpec:
+        if spec.name in self._prompts:
+            raise ValueError(f"Prompt {spec.name} is already registered")
+        self._prompts[spec.name] = spec
+        return spec
+
+    def get(self, name: str) -> PromptSpec:
+        return self._prompts[name]
+
+    def record_usage(self, spec: PromptSpec, usage: Optional[Dict[str, Any]]):
+        with self._lock:
+            totals = self._usage.setdefault(spec.key, {"calls": 0, **{field: 0 for field in USAGE_FIELDS}})
+            totals["calls"] += 1
+            for field in USAGE_FIELDS:
+                totals[field] += int((usage or {}).get(field) or 0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            usage = {key: dict(totals) for key, totals in self._usage.items()}
+        for totals in usage.values():
+            prompt_tokens = (
+                totals["input_tokens"] + totals["cache_read_input_tokens"] + totals["cache_creation_input_tokens"]
+            )
+            totals["cache_hit_ratio"] = (
+                round(totals["cache_read_input_tokens"] / prompt_tokens, 3) if prompt_tokens else None
+            )
+        return {
+            "prompts": {name: spec.version for name, spec in self._prompts.items()},
+            "cached_prefixes": [name for name, spec in self._prompts.items() if spec.cached],
+            "usage": usage,
+        }
+
+
+prompt_registry = PromptRegistry()
+metrics.stats("prompt_usage_stats", "Token usage, including prompt-cache reads, per prompt version", prompt_registry.stats)
+
+
+async def load_prompts():
+    """Import every prompt module so all templates are compiled and registered."""
+    from app.prompts import job_extraction, json_repair, resume_match  # noqa: F401
+    logger.info("Loaded prompts: %s", ", ".join(sorted(prompt_registry.stats()["prompts"])))
@@ -0,0 +1,89 @@
+import re
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, Field, field_validator
+
+
+# The job data schema shared with the LLM extractor, field -> empty value
+JOB_FIELDS: Dict[str, Any] = {
+    "company_name": "",
+    "job_title": "",
+    "job_description": "",
+    "relevant_skills": [],
+    "relevant_experience": "",
+    "responsibilities": [],
+    "requirements": [],
+}
+
+# Field types as described to the LLM extractor
+JOB_FIELD_TYPES: Dict[str, str] = {
+    "company_name": "string",
+    "job_title": "string",
+    "job_description": "string",
+    "relevant_skills": "[list of strings]",
+    "relevant_experience": "string",
+    "responsibilities": "[list of strings]",
+    "requirements": "[list of strings]",
+}
+
+
+def _as_list(value: Any) -> List[str]:
+    """Models sometimes answer a list field with a single string or a bulleted block."""
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        lines = [line.strip(" -•*\t") for line in value.splitlines()]
+        return [line for line in lines if line]
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if item is not None and str(item).strip()]
+    return [str(value)]
+
+
+class MatchAnalysis(BaseModel):
+    """Fit score and insights returned by the resume match prompt."""
+
+    score: int = Field(ge=0, le=100)
+    insights: List[str]
+
+    @field_validator("score", mode="before")
+    @classmethod
+    def parse_score(cls, value: Any) -> Any:
+        # "85", "85%", "85/100" and 85.0 all mean 85
+        if isinstance(value, str):
+            match = re.search(r"\d+(\.\d+)?", value)
+            if match:
+                value = float(match.group(0))
+        if isinstance(value, float):
+            value = round(value)
+        return value
+
+    @field_validator("insights", mode="before")
+    @classmethod
+    def parse_insights(cls, value: Any) -> List[str]:
+        return _as_list(value)
+
+
+class JobData(BaseModel):
+    """Job data returned by the job extraction prompt; every field is optional."""
+
+    company_name: str = ""
+    job_title: str = ""
+    job_description: str = ""
+    relevant_skills: List[str] = []
+    relevant_experience: str = ""
+    responsibilities: List[str] = []
+    requirements: List[str] = []
+
+    @field_validator("company_name", "job_title", "job_description", "relevant_experience", mode="before")
+    @classmethod
+    def parse_text(cls, value: Any) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, list):
+            return "\n".join(str(item) for item in value if item)
+        return str(value).strip()
+
+    @field_validator("relevant_skills", "responsibilities", "requirements", mode="before")
+    @classmethod
+    def parse_list(cls, value: Any) -> List[str]:
+        return _as_list(value)
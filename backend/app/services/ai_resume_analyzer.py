@@ -1,13 +1,44 @@
-from typing import Tuple
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 from app.clients.AnthropicClient import AnthropicClient
+from app.core.telemetry import span
+from app.helpers.json_stream import JsonStreamParser
+from app.prompts.registry import PromptSpec
+from app.prompts.resume_match import RESUME_MATCH
+from app.schemas.analysis import MatchAnalysis
 from app.services.job_scraper import JobScraper
+from app.services.match_result_cache import match_result_cache
+from app.services.structured_output import StructuredOutputError, structured_output
+from app.services.text_compactor import compact_job_details, compact_resume
+
+logger = logging.getLogger(__name__)
+
+
+class JobDetailsError(ValueError):
+    """Raised when no job details could be scraped or were given."""
+
+
+def format_job_details(job_details: Dict[str, Any]) -> str:
+    """Job details as labelled plain text, much cheaper in tokens than a dict repr."""
+    lines = []
+    for field, value in (job_details or {}).items():
+        if not value:
+            continue
+        label = field.replace("_", " ").capitalize()
+        if isinstance(value, list):
+            lines.append(f"{label}:")
+            lines.extend(f"- {item}" for item in value)
+        else:
+            lines.append(f"{label}: {value}")
+    return "\n".join(lines)
+
 
 class AIResumeAnalyzer:
     def __init__(self):
-        self.client = AnthropicClient()
+        self.client = AnthropicClient(task="scoring")
         self.job_scraper = JobScraper()
 
-    def analyze_resume(self, resume_text: str, job_url: str, job_title: str, job_description: str) -> Tuple[int, list[str]]:
+    async def analyze_resume(self, resume_text: str, job_url: str, job_title: str, job_description: str) -> Tuple[int, list[str]]:
         """
         Analyzes resume against job requirements and returns fit score and insights
         
@@ -21,65 +52,107 @@ class AIResumeAnalyzer:
             - fit_score (int): 0-100 score indicating candidate fit
             - insights (list[str]): List of actionable recommendations
         """
+        job_details = await self.get_job_details(job_url, job_title, job_description)
+        return await self.score(resume_text, job_details)
 
+    async def get_job_details(self, job_url: Optional[str], job_title: Optional[str], job_description: Optional[str]) -> Dict[str, Any]:
+        """
+        Job details scraped from `job_url`, or built from the title and
+        description given by the user. Raises JobDetailsError when there are none.
+        """
         if job_url:
-            print(f"Scraping job details from URL: {job_url}")
-            job_details = self.job_scraper.extract_job_data(job_url)
-            print(f"Job details scraped successfully: {job_details}")
+            with span("scrape", url=job_url):
+                job_details = await self.job_scraper.extract_job_data(job_url)
+            logger.debug("Job details scraped from %s: %s", job_url, job_details)
         else:
-            print("Using job description provided from the user")
             job_details = {
                 "job_title": job_title,
                 "job_description": job_description
             }
-        
-        
-        prompt = """You are an expert HR professional and career coach. Analyze this candidate's resume against the job details.
-
-                Resume:
-                {resume_text}
-
-                Job Details:
-                {job_details}
-
-                Provide a fit score from 0-100 based on how well the candidate's experience matches the job requirements, and 4-6 specific, actionable recommendations for improving their application.
-
-                Metrics for calculating the fit score:
-                - See the experience and education of the candidate and the job details and compare them.
-                - See the skills of the candidate and the job details and compare them.
-                - See the certifications of the candidate and the job details and compare them.
-                - See the projects of the candidate and the job details and compare them.
-                - See the publications of the candidate and the job details and compare them.
-                - See the awards of the candidate and the job details and compare them.
-
-                Return your response as a JSON string in exactly this format:
-                {{
-                    "score": <number between 0-100>,
-                    "insights": [
-                        "insight 1",
-                        "insight 2",
-                        "insight 3",
-                        ...
-                    ]
-                }}
-                
-                If any field is not explicitly available in the content, make a reasonable inference based on context or leave as an empty string or empty list as appropriate.
-                
-                Return ONLY a valid JSON object with no additional text, comments, or explanations.
-                """
-        
+        if not job_details or not any(job_details.values()):
+            raise JobDetailsError("Failed to extract job details")
+        return job_details
+
+    async def score(self, resume_text: str, job_details: Dict[str, Any]) -> Tuple[int, list[str]]:
+        """
+        Scores parsed resume text against already extracted job details,
+        reusing the stored result when this exact pair was scored before
+
+        Returns:
+            Tuple of fit score (0-100) and list of insights
+        """
+        return await match_result_cache.get_or_score(
+            resume_text,
+            job_details,
+            f"{RESUME_MATCH.key}/{self.client.model}",
+            lambda: self._score(resume_text, job_details),
+        )
+
+    async def score_stream(self, resume_text: str, job_details: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of `score`. Yields {"event": "score", "data": <int>}
+        as soon as the model has written the score, {"event": "insight",
+        "data": <str>} for each insight as it completes, then
+        {"event": "result", "data": {"fit_score", "insights"}}.
+        """
+        prompt_version = f"{RESUME_MATCH.key}/{self.client.model}"
+        cached = await match_result_cache.lookup(resume_text, job_details, prompt_version)
+        if cached is not None:
+            fit_score, insights = cached
+            yield {"event": "score", "data": fit_score}
+            for insight in insights:
+                yield {"event": "insight", "data": insight}
+            yield {"event": "result", "data": {"fit_score": fit_score, "insights": insights}}
+            return
+
+        prompt, variables = self._score_prompt(resume_text, job_details)
+        parser = JsonStreamParser()
+        chunks = []
+        with span("analyze_llm", streamed=True):
+            async for chunk in self.client.astream(prompt, variables):
+                chunks.append(chunk)
+                for kind, key, value in parser.feed(chunk):
+                    if kind == "value" and key == "score":
+                        yield {"event": "score", "data": value}
+                    elif kind == "item" and key == "insights":
+                        yield {"event": "insight", "data": value}
+
+        # The streamed pieces were shown as they came; the stored result is the validated one
+        fit_score, insights = await self._parse_response("".join(chunks))
+        await match_result_cache.store(resume_text, job_details, prompt_version, (fit_score, insights))
+        yield {"event": "result", "data": {"fit_score": fit_score, "insights": insights}}
+
+    async def _score(self, resume_text: str, job_details: Dict[str, Any]) -> Tuple[int, list[str]]:
+        prompt, variables = self._score_prompt(resume_text, job_details)
+        with span("analyze_llm"):
+            response = await self.client.achat(prompt, variables)
+        return await self._parse_response(response)
+
+    @staticmethod
+    def _score_prompt(resume_text: str, job_details: Dict[str, Any]) -> Tuple[PromptSpec, Dict[str, str]]:
+        resume = compact_resume(resume_text)
+        job = compact_job_details(format_job_details(job_details))
+        logger.debug(
+            "Prompt inputs compacted: resume %d -> %d tokens, job %d -> %d tokens",
+            resume.tokens_before, resume.tokens_after, job.tokens_before, job.tokens_after,
+        )
+
         variables = {
-            "resume_text": resume_text,
-            "job_details": job_details
+            "resume_text": resume.text,
+            "job_details": job.text
         }
+        return RESUME_MATCH, variables
 
-        response = self.client.chat(prompt, variables)
-        
+    @staticmethod
+    async def _parse_response(response: str) -> Tuple[int, list[str]]:
         try:
-            import json
-            result = json.loads(response)
-            return result["score"], result["insights"]
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"Error parsing response: {e}")
-            print(f"Raw response: {response}")
-            raise ValueError("Failed to parse AI response into the expected format") 
\ No newline at end of file
+            result = await structured_output.parse(response, MatchAnalysis)
+        except StructuredOutputError as e:
+            logger.warning("Error parsing response: %s", e)
+            logger.debug("Raw response: %s", response)
+            raise ValueError("Failed to parse AI response into the expected format")
+        return result.score, result.insights
+
+
+# Shared by all requests; holds no per-request state
+ai_resume_analyzer = AIResumeAnalyzer()
@@ -0,0 +1,311 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.db.database import get_collection
+from app.services.analysis_pipeline import AnalysisPipeline
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+TERMINAL_STATUSES = {COMPLETED, FAILED}
+
+
+class QueueFullError(Exception):
+    """Raised when the analysis queue cannot accept more jobs."""
+
+
+def serialize_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape an `analysis_jobs` document for API responses."""
+    return {
+        "job_id": str(job["_id"]),
+        "status": job.get("status"),
+        "stage": job.get("stage"),
+        "progress": job.get("progress", 0),
+        "fit_score": job.get("fit_score"),
+        "insights": job.get("insights"),
+        "error": job.get("error"),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at"),
+    }
+
+
+class AnalysisJobQueue:
+    """
+    In-process job queue for resume analyses.
+
+    Job state lives in the `analysis_jobs` collection so any API worker can
+    answer status requests; the queue itself only schedules work. Each user
+    may have at most `per_user_limit` analyses running at once, the rest wait
+    in that user's backlog without holding up other users.
+
+    Every job is owned by the process that accepted it, which renews a lease
+    on it every third of `lease_seconds`. A process only takes over jobs
+    whose lease ran out, i.e. whose owner died, claiming each one atomically,
+    so jobs that live peers are running are never run twice.
+    """
+
+    def __init__(self, num_workers: int, per_user_limit: int, max_pending: int, lease_seconds: float):
+        self.num_workers = num_workers
+        self.per_user_limit = per_user_limit
+        self.max_pending = max_pending
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.pipeline = AnalysisPipeline()
+        # One token per runnable job; a token is the id of the user it belongs to
+        self._ready: "asyncio.Queue[str]" = asyncio.Queue()
+        self._backlog: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        # Jobs per user that are either running or have a token in `_ready`
+        self._active: Dict[str, int] = defaultdict(int)
+        self._pending = 0
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._workers: List[asyncio.Task] = []
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    @property
+    def collection(self):
+        return get_collection("analysis_jobs")
+
+    def _lease_until(self) -> datetime:
+        return datetime.now() + timedelta(seconds=self.lease_seconds)
+
+    async def start(self):
+        """Start the workers and take over jobs whose owner is gone."""
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"analysis-worker-{i}")
+            for i in range(self.num_workers)
+        ]
+        await self._claim_orphans()
+        self._heartbeat = asyncio.create_task(self._renew_leases(), name="analysis-heartbeat")
+
+    async def stop(self):
+        tasks = self._workers + ([self._heartbeat] if self._heartbeat else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._heartbeat = None
+        # Let a peer or the next start pick up what is left without waiting out the lease
+        try:
+            await self.collection.update_many(
+                {"owner": self.owner, "status": {"$in": [QUEUED, RUNNING]}},
+                {"$set": {"lease_until": datetime.now()}},
+            )
+        except Exception as e:
+            logger.warning("Could not release analysis job leases: %s", e)
+
+    async def _claim_orphans(self):
+        """Claim, one at a time and oldest first, unfinished jobs whose lease has expired."""
+        while self._pending < self.max_pending:
+            now = datetime.now()
+            job = await self.collection.find_one_and_update(
+                {
+                    "status": {"$in": [QUEUED, RUNNING]},
+                    # Jobs from before leases have none
+                    "$or": [{"lease_until": {"$lt": now}}, {"lease_until": {"$exists": False}}],
+                },
+                {"$set": {
+                    "owner": self.owner,
+                    "lease_until": self._lease_until(),
+                    "status": QUEUED,
+                    "stage": "queued",
+                    "progress": 0,
+                    "updated_at": now,
+                }},
+                sort=[("created_at", 1)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if job is None:
+                return
+            logger.info("Took over analysis job %s", job["_id"])
+            self._enqueue(job)
+
+    async def _renew_leases(self):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.collection.update_many(
+                    {"owner": self.owner, "status": {"$in": [QUEUED, RUNNING]}},
+                    {"$set": {"lease_until": self._lease_until()}},
+                )
+                await self._claim_orphans()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Error renewing analysis job leases: %s", e)
+
+    async def submit(
+        self,
+        user_id: str,
+        file_path: str,
+        resume_digest: str,
+        job_url: Optional[str],
+        job_title: Optional[str],
+        job_description: Optional[str],
+    ) -> Dict[str, Any]:
+        """Persist a new job and schedule it, returning the stored document."""
+        if self._pending >= self.max_pending:
+            raise QueueFullError("Analysis queue is full, please retry shortly")
+
+        now = datetime.now()
+        job = {
+            "user_id": user_id,
+            "status": QUEUED,
+            "stage": "queued",
+            "progress": 0,
+            "resume_file_path": file_path,
+            "resume_sha256": resume_digest,
+            "job_url": job_url,
+            "job_title": job_title,
+            "job_description": job_description,
+            "fit_score": None,
+            "insights": None,
+            "error": None,
+            "owner": self.owner,
+            "lease_until": self._lease_until(),
+            "created_at": now,
+            "updated_at": now,
+        }
+        result = await self.collection.insert_one(job)
+        job["_id"] = result.inserted_id
+        self._enqueue(job)
+        return job
+
+    async def get(self, job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        if not ObjectId.is_valid(job_id):
+            return None
+        return await self.collection.find_one({"_id": ObjectId(job_id), "user_id": user_id})
+
+    async def events(self, job_id: str, user_id: str, poll_interval: float = 2.0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the job's state every time it changes, ending once it finishes.
+
+        Updates are pushed by the local workers; the periodic re-read covers
+        jobs that are being processed by another API worker process.
+        """
+        updates: asyncio.Queue = asyncio.Queue()
+        self._subscribers[job_id].add(updates)
+        try:
+            job = await self.get(job_id, user_id)
+            last = None
+            while job is not None:
+                state = serialize_job(job)
+                if state != last:
+                    yield state
+                    last = state
+                if job.get("status") in TERMINAL_STATUSES:
+                    return
+                try:
+                    job = await asyncio.wait_for(updates.get(), timeout=poll_interval)
+                except asyncio.TimeoutError:
+                    job = await self.get(job_id, user_id)
+        finally:
+            self._subscribers[job_id].discard(updates)
+            if not self._subscribers[job_id]:
+                del self._subscribers[job_id]
+
+    def _enqueue(self, job: Dict[str, Any]):
+        user_id = job["user_id"]
+        self._backlog[user_id].append(job)
+        self._pending += 1
+        if self._active[user_id] < self.per_user_limit:
+            self._active[user_id] += 1
+            self._ready.put_nowait(user_id)
+
+    async def _worker(self):
+        while True:
+            user_id = await self._ready.get()
+            job = self._backlog[user_id].popleft()
+            self._pending -= 1
+            try:
+                await self._run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Analysis job %s crashed: %s", job['_id'], e)
+            finally:
+                # Hand the user's slot to their next job, or release it
+                if self._backlog[user_id]:
+                    self._ready.put_nowait(user_id)
+                else:
+                    del self._backlog[user_id]
+                    self._active[user_id] -= 1
+                    if not self._active[user_id]:
+                        del self._active[user_id]
+                self._ready.task_done()
+
+    async def _run_job(self, job: Dict[str, Any]):
+        job_id = job["_id"]
+        if not await self._update(job_id, status=RUNNING, stage="starting", progress=5):
+            # Our lease lapsed (e.g. the database was unreachable) and a peer took the job
+            logger.info("Analysis job %s is owned by another worker, skipping it", job_id)
+            return
+
+        async def on_progress(stage: str, progress: int):
+            await self._update(job_id, stage=stage, progress=progress)
+
+        try:
+            fit_score, insights = await self.pipeline.run(
+                user_id=job["user_id"],
+                file_path=job["resume_file_path"],
+                resume_digest=job["resume_sha256"],
+                job_url=job.get("job_url"),
+                job_title=job.get("job_title"),
+                job_description=job.get("job_description"),
+                on_progress=on_progress,
+            )
+        except Exception as e:
+            logger.warning("Analysis job %s failed: %s", job_id, e)
+            await self._update(job_id, status=FAILED, stage="failed", error=str(e))
+            return
+
+        await self._update(
+            job_id,
+            status=COMPLETED,
+            stage="completed",
+            progress=100,
+            fit_score=fit_score,
+            insights=insights,
+        )
+
+    async def _update(self, job_id: ObjectId, **fields) -> bool:
+        """Update a job this process owns; False if it is gone or another process took it over."""
+        fields["updated_at"] = datetime.now()
+        job = await self.collection.find_one_and_update(
+            {"_id": job_id, "owner": self.owner},
+            {"$set": fields},
+            return_document=ReturnDocument.AFTER,
+        )
+        if job is None:
+            return False
+        for subscriber in self._subscribers.get(str(job_id), ()):
+            subscriber.put_nowait(job)
+        return True
+
+
+analysis_queue = AnalysisJobQueue(
+    num_workers=settings.ANALYSIS_WORKERS,
+    per_user_limit=settings.ANALYSIS_PER_USER_LIMIT,
+    max_pending=settings.ANALYSIS_QUEUE_MAX_SIZE,
+    lease_seconds=settings.ANALYSIS_LEASE_SECONDS,
+)
+
+
+async def start_analysis_queue():
+    await analysis_queue.start()
+
+
+async def stop_analysis_queue():
+    await analysis_queue.stop()
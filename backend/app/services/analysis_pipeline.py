@@ -0,0 +1,112 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.telemetry import span
+from app.services.ai_resume_analyzer import ai_resume_analyzer
+from app.services.application_history import application_history
+from app.services.resume_cache import resume_text_cache
+
+ProgressCallback = Callable[[str, int], Awaitable[None]]
+
+
+class ResumeParseError(Exception):
+    """Raised when the uploaded resume could not be turned into text."""
+
+
+class AnalysisPipeline:
+    """
+    The resume-vs-job analysis shared by the synchronous submit endpoint and
+    the background job workers: parse the stored resume, analyze it against
+    the job and record the application.
+    """
+
+    async def run(
+        self,
+        user_id: str,
+        file_path: str,
+        resume_digest: str,
+        job_url: Optional[str],
+        job_title: Optional[str],
+        job_description: Optional[str],
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Tuple[int, list[str]]:
+        async def report(stage: str, progress: int):
+            if on_progress:
+                await on_progress(stage, progress)
+
+        await report("parsing", 10)
+        with span("parse"):
+            parsed_text = await resume_text_cache.get_or_parse(resume_digest, file_path)
+        if parsed_text is None:
+            raise ResumeParseError("Failed to parse resume")
+
+        await report("analyzing", 30)
+        fit_score, insights = await ai_resume_analyzer.analyze_resume(
+            resume_text=parsed_text,
+            job_url=job_url,
+            job_title=job_title,
+            job_description=job_description
+        )
+
+        await report("saving", 90)
+        await self._save_application(user_id, file_path, job_url, job_title, job_description, fit_score, insights)
+
+        return fit_score, insights
+
+    async def stream(
+        self,
+        user_id: str,
+        file_path: str,
+        resume_digest: str,
+        job_url: Optional[str],
+        job_title: Optional[str],
+        job_description: Optional[str],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Same steps as `run`, yielding {"event", "data"} items as they
+        happen: progress stages, then the score and each insight as the
+        model writes them, then the final result once it is recorded.
+        """
+        yield {"event": "progress", "data": {"stage": "parsing", "progress": 10}}
+        with span("parse"):
+            parsed_text = await resume_text_cache.get_or_parse(resume_digest, file_path)
+        if parsed_text is None:
+            raise ResumeParseError("Failed to parse resume")
+
+        yield {"event": "progress", "data": {"stage": "fetching_job", "progress": 20}}
+        job_details = await ai_resume_analyzer.get_job_details(job_url, job_title, job_description)
+
+        yield {"event": "progress", "data": {"stage": "analyzing", "progress": 30}}
+        result = None
+        async for event in ai_resume_analyzer.score_stream(parsed_text, job_details):
+            if event["event"] == "result":
+                result = event["data"]
+            else:
+                yield event
+
+        await self._save_application(
+            user_id, file_path, job_url, job_title, job_description, result["fit_score"], result["insights"]
+        )
+        yield {"event": "result", "data": result}
+
+    @staticmethod
+    async def _save_application(
+        user_id: str,
+        file_path: str,
+        job_url: Optional[str],
+        job_title: Optional[str],
+        job_description: Optional[str],
+        fit_score: int,
+        insights: list[str],
+    ):
+        application_data = {
+            "user_id": user_id,
+            "job_title": job_title,
+            "job_url": job_url,
+            "job_description": job_description,
+            "resume_file_path": file_path,
+            "fit_score": fit_score,
+            "insights": insights,
+            "created_at": datetime.now()
+        }
+        await application_history.record(application_data)
@@ -0,0 +1,330 @@
+import asyncio
+import base64
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import DESCENDING
+from pymongo.errors import DuplicateKeyError
+
+from app.core.telemetry import span
+from app.db.database import get_collection
+from app.helpers.insight_themes import insight_themes
+from app.helpers.skills import find_skills
+
+logger = logging.getLogger(__name__)
+
+# Fields returned in history listings; the resume path and full job text stay server-side
+LIST_PROJECTION = {
+    "job_title": 1, "job_url": 1, "fit_score": 1, "insights": 1,
+    "themes": 1, "skills": 1, "created_at": 1,
+}
+
+# Fit score histogram buckets, as [low, high)
+SCORE_BUCKETS = ((0, 20), (20, 40), (40, 60), (60, 80), (80, 101))
+
+# A rollup rebuild counts applications with ids below a cut this far in the
+# future, then waits this long again for inserts already under way to land
+ROLLUP_CUT_SECONDS = 1
+ROLLUP_SETTLE_SECONDS = 2
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor was not produced by this API."""
+
+
+def _bucket(score: int) -> str:
+    for low, high in SCORE_BUCKETS:
+        if low <= score < high:
+            return f"{low}-{min(high, 100)}"
+    return "unknown"
+
+
+def _field(term: str) -> str:
+    # Mongo field names cannot contain "."; skills like "node.js" are stored escaped
+    return term.replace(".", "．")
+
+
+def _term(field: str) -> str:
+    return field.replace("．", ".")
+
+
+def encode_cursor(created_at: datetime, application_id: ObjectId) -> str:
+    raw = json.dumps({"t": created_at.isoformat(), "id": str(application_id)})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(raw["t"]), ObjectId(raw["id"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+class ApplicationHistoryService:
+    """
+    A user's saved applications and their analytics.
+
+    Listings page by keyset on (created_at, _id), newest first, so every page
+    is one index range scan on `user_created_id` however deep it is. Per-user
+    stats live in the `application_stats` rollup, updated with one `$inc`
+    per recorded application. Recording never creates a rollup: a user with
+    history from before rollups would get one counting only the new
+    application. The first all-time stats request builds it from the whole
+    history instead. Stats over a date range are computed by an aggregation
+    over the same index.
+
+    A rollup records the application id it was built `through`: history
+    below it is counted by the rebuild, anything from it on by `record`, so
+    a rebuild racing new applications neither misses nor double counts one.
+    """
+
+    def __init__(self):
+        self._rebuilding: Set[str] = set()
+
+    @property
+    def applications(self):
+        return get_collection("applications")
+
+    @property
+    def rollups(self):
+        return get_collection("application_stats")
+
+    async def record(self, application: Dict[str, Any]) -> Dict[str, Any]:
+        """Store an application and fold it into its user's rollup, if they have one."""
+        application["themes"] = insight_themes(application.get("insights") or [])
+        application["skills"] = find_skills(application.get("insights") or [])
+        with span("db_write", collection="applications"):
+            result = await self.applications.insert_one(application)
+        application["_id"] = result.inserted_id
+
+        try:
+            await self._update_rollup(application)
+        except Exception as e:
+            # The rollup is rebuilt from the applications when it looks wrong
+            logger.warning("Error updating application stats for %s: %s", application["user_id"], e)
+            await self.rollups.delete_one({"_id": application["user_id"]})
+        return application
+
+    async def _update_rollup(self, application: Dict[str, Any]):
+        score = application["fit_score"]
+        increments = {
+            "count": 1,
+            "score_sum": score,
+            f"score_buckets.{_bucket(score)}": 1,
+        }
+        for theme in application["themes"]:
+            increments[f"themes.{_field(theme)}"] = 1
+        for skill in application["skills"]:
+            increments[f"skills.{_field(skill)}"] = 1
+        with span("db_write", collection="application_stats"):
+            await self.rollups.update_one(
+                # Applications below `through` are counted by the rebuild
+                {"_id": application["user_id"], "through": {"$lte": application["_id"]}},
+                {
+                    "$inc": increments,
+                    "$min": {"min_score": score, "first_at": application["created_at"]},
+                    "$max": {"max_score": score, "last_at": application["created_at"]},
+                },
+            )
+
+    async def page(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        One page of the user's applications, newest first, and the cursor
+        for the next page (None on the last page).
+        """
+        query = self._match(user_id, min_score, max_score, since, until)
+        if cursor:
+            created_at, application_id = decode_cursor(cursor)
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": application_id}},
+            ]
+
+        documents = await (
+            self.applications.find(query, LIST_PROJECTION)
+            .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+            .limit(limit + 1)
+            .to_list(length=limit + 1)
+        )
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            last = documents[-1]
+            next_cursor = encode_cursor(last["created_at"], last["_id"])
+        return {"items": documents, "next_cursor": next_cursor}
+
+    async def get(self, user_id: str, application_id: str) -> Optional[Dict[str, Any]]:
+        if not ObjectId.is_valid(application_id):
+            return None
+        return await self.applications.find_one(
+            {"_id": ObjectId(application_id), "user_id": user_id},
+            {"resume_file_path": 0},
+        )
+
+    async def stats(
+        self,
+        user_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        top: int = 5,
+    ) -> Dict[str, Any]:
+        """
+        Count, average/min/max fit score, score histogram and the most
+        frequent insight themes and skills. All-time stats come from the
+        rollup; a date range, or a user whose rollup is still being built, is
+        aggregated on demand.
+        """
+        if since is None and until is None:
+            rollup = await self.rollups.find_one({"_id": user_id})
+            if rollup is not None and not rollup.get("pending"):
+                return self._summarize(rollup, top)
+            if rollup is None:
+                self._schedule_rebuild(user_id)
+        return self._summarize(await self._aggregate(self._match(user_id, None, None, since, until)), top)
+
+    def _schedule_rebuild(self, user_id: str):
+        if user_id in self._rebuilding:
+            return
+        self._rebuilding.add(user_id)
+        task = asyncio.create_task(self.rebuild_rollup(user_id), name=f"rollup-rebuild-{user_id}")
+        task.add_done_callback(lambda _: self._rebuilding.discard(user_id))
+
+    async def rebuild_rollup(self, user_id: str):
+        """
+        Build a missing rollup from the user's history. A pending rollup is
+        created first, so `record` counts every application from the cut on;
+        once inserts begun before the cut have landed, the history below it
+        is aggregated and added in. Does nothing if the user has a rollup.
+        """
+        cut_at = datetime.now(timezone.utc) + timedelta(seconds=ROLLUP_CUT_SECONDS)
+        cut = ObjectId.from_datetime(cut_at)
+        try:
+            await self.rollups.insert_one({"_id": user_id, "through": cut, "pending": True, "count": 0, "score_sum": 0})
+        except DuplicateKeyError:
+            return
+
+        try:
+            delay = (cut_at - datetime.now(timezone.utc)).total_seconds() + ROLLUP_SETTLE_SECONDS
+            await asyncio.sleep(max(0.0, delay))
+            history = await self._aggregate({"user_id": user_id, "_id": {"$lt": cut}})
+            update: Dict[str, Any] = {"$unset": {"pending": ""}}
+            if history is not None:
+                increments = {"count": history["count"], "score_sum": history["score_sum"]}
+                for facet in ("score_buckets", "themes", "skills"):
+                    for name, count in history[facet].items():
+                        increments[f"{facet}.{name}"] = count
+                update["$inc"] = increments
+                update["$min"] = {"min_score": history["min_score"], "first_at": history["first_at"]}
+                update["$max"] = {"max_score": history["max_score"], "last_at": history["last_at"]}
+            await self.rollups.update_one({"_id": user_id, "through": cut}, update)
+        except Exception as e:
+            # Leave no half-built rollup behind; the next stats request tries again
+            logger.warning("Error rebuilding application stats for %s: %s", user_id, e)
+            await self.rollups.delete_one({"_id": user_id, "through": cut})
+
+    async def _aggregate(self, match: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """A rollup-shaped document for the applications matching `match`, or None if there are none."""
+        branches = [
+            {"case": {"$lt": ["$fit_score", high]}, "then": f"{low}-{min(high, 100)}"}
+            for low, high in SCORE_BUCKETS
+        ]
+        pipeline = [
+            {"$match": match},
+            {"$facet": {
+                "totals": [{"$group": {
+                    "_id": None,
+                    "count": {"$sum": 1},
+                    "score_sum": {"$sum": "$fit_score"},
+                    "min_score": {"$min": "$fit_score"},
+                    "max_score": {"$max": "$fit_score"},
+                    "first_at": {"$min": "$created_at"},
+                    "last_at": {"$max": "$created_at"},
+                }}],
+                "score_buckets": [
+                    {"$group": {"_id": {"$switch": {"branches": branches, "default": "unknown"}}, "count": {"$sum": 1}}},
+                ],
+                "themes": [
+                    {"$unwind": "$themes"},
+                    {"$group": {"_id": "$themes", "count": {"$sum": 1}}},
+                ],
+                "skills": [
+                    {"$unwind": "$skills"},
+                    {"$group": {"_id": "$skills", "count": {"$sum": 1}}},
+                ],
+            }},
+        ]
+        with span("db_aggregate", collection="applications"):
+            results = await self.applications.aggregate(pipeline).to_list(length=1)
+        facets = results[0] if results else {}
+        if not facets.get("totals"):
+            return None
+        rollup = {key: value for key, value in facets["totals"][0].items() if key != "_id"}
+        for facet in ("score_buckets", "themes", "skills"):
+            rollup[facet] = {_field(group["_id"]): group["count"] for group in facets[facet]}
+        return rollup
+
+    @staticmethod
+    def _match(
+        user_id: str,
+        min_score: Optional[int],
+        max_score: Optional[int],
+        since: Optional[datetime],
+        until: Optional[datetime],
+    ) -> Dict[str, Any]:
+        query: Dict[str, Any] = {"user_id": user_id}
+        if min_score is not None or max_score is not None:
+            query["fit_score"] = {}
+            if min_score is not None:
+                query["fit_score"]["$gte"] = min_score
+            if max_score is not None:
+                query["fit_score"]["$lte"] = max_score
+        if since is not None or until is not None:
+            query["created_at"] = {}
+            if since is not None:
+                query["created_at"]["$gte"] = since
+            if until is not None:
+                query["created_at"]["$lt"] = until
+        return query
+
+    @staticmethod
+    def _summarize(rollup: Optional[Dict[str, Any]], top: int) -> Dict[str, Any]:
+        if not rollup or not rollup.get("count"):
+            return {"count": 0, "average_score": None, "min_score": None, "max_score": None,
+                    "score_buckets": {}, "top_themes": [], "top_skills": [],
+                    "first_at": None, "last_at": None}
+
+        def ranked(counts: Dict[str, int]) -> List[Dict[str, Any]]:
+            items = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top]
+            return [{"name": _term(name), "count": count} for name, count in items]
+
+        return {
+            "count": rollup["count"],
+            "average_score": round(rollup["score_sum"] / rollup["count"], 1),
+            "min_score": rollup.get("min_score"),
+            "max_score": rollup.get("max_score"),
+            "score_buckets": {
+                f"{low}-{min(high, 100)}": rollup.get("score_buckets", {}).get(f"{low}-{min(high, 100)}", 0)
+                for low, high in SCORE_BUCKETS
+            },
+            "top_themes": ranked(rollup.get("themes", {})),
+            "top_skills": ranked(rollup.get("skills", {})),
+            "first_at": rollup.get("first_at"),
+            "last_at": rollup.get("last_at"),
+        }
+
+
+application_history = ApplicationHistoryService()
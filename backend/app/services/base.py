@@ -1,58 +1,129 @@
-from typing import Any, Dict, List, Optional, TypeVar, Generic, Type
+from typing import Any, Dict, List, Optional, Sequence, TypeVar, Generic, Type, Union
 from pydantic import BaseModel
 from bson import ObjectId
-from app.db.database import get_collection
+from pymongo import DeleteOne, InsertOne, ReplaceOne, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.write_concern import WriteConcern
+from app.core.config import settings
+from app.db.database import get_collection, write_concern
 
 T = TypeVar('T', bound=BaseModel)
 
+WriteOperation = Union[InsertOne, UpdateOne, UpdateMany, ReplaceOne, DeleteOne]
+
 class BaseService(Generic[T]):
-    def __init__(self, collection_name: str, model: Type[T]):
-        self.collection = get_collection(collection_name)
+    def __init__(self, collection_name: str, model: Type[T], concern: Optional[WriteConcern] = None):
+        self.collection_name = collection_name
+        self.collection = get_collection(collection_name, concern)
         self.model = model
-    
-    async def get_by_id(self, id: str) -> Optional[T]:
-        """Get a document by ID"""
+        self.bulk_concern = write_concern(settings.MONGODB_BULK_WRITE_CONCERN)
+        self.batch_size = settings.MONGODB_BULK_BATCH_SIZE
+
+    def _with_concern(self, concern: Optional[WriteConcern]):
+        return self.collection if concern is None else get_collection(self.collection_name, concern)
+
+    async def get_by_id(self, id: str, projection: Optional[Dict[str, Any]] = None) -> Optional[T]:
+        """Get a document by ID, optionally only the fields in `projection`"""
         if not ObjectId.is_valid(id):
             return None
-        document = await self.collection.find_one({"_id": ObjectId(id)})
+        document = await self.collection.find_one({"_id": ObjectId(id)}, projection)
         if document:
             return self.model(**document)
         return None
-    
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
+
+    async def get_all(self, skip: int = 0, limit: int = 100, projection: Optional[Dict[str, Any]] = None) -> List[T]:
         """Get all documents with pagination"""
-        cursor = self.collection.find().skip(skip).limit(limit)
+        cursor = self.collection.find({}, projection).skip(skip).limit(limit)
         documents = await cursor.to_list(length=limit)
         return [self.model(**doc) for doc in documents]
-    
+
     async def create(self, data: Dict[str, Any]) -> T:
         """Create a new document"""
-        result = await self.collection.insert_one(data)
-        document = await self.collection.find_one({"_id": result.inserted_id})
+        document = dict(data)
+        result = await self.collection.insert_one(document)
+        # The stored document is what was sent plus its id; no need to read it back
+        document["_id"] = result.inserted_id
         return self.model(**document)
-    
+
+    async def create_many(
+        self,
+        items: Sequence[Dict[str, Any]],
+        concern: Optional[WriteConcern] = None,
+        batch_size: Optional[int] = None,
+    ) -> List[T]:
+        """
+        Insert documents in batches of `batch_size` (one round trip each),
+        unordered so one bad document does not stop the rest of its batch.
+        Uses the bulk write concern unless `concern` is given.
+        """
+        collection = self._with_concern(concern or self.bulk_concern)
+        batch_size = batch_size or self.batch_size
+        documents = [dict(item) for item in items]
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start:start + batch_size]
+            result = await collection.insert_many(batch, ordered=False)
+            for document, inserted_id in zip(batch, result.inserted_ids):
+                document["_id"] = inserted_id
+        return [self.model(**document) for document in documents]
+
+    async def bulk_write(
+        self,
+        operations: Sequence[WriteOperation],
+        ordered: bool = False,
+        concern: Optional[WriteConcern] = None,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Run mixed insert/update/replace/delete operations in batches and
+        return the combined counts. Unordered by default, which lets the
+        server apply each batch in parallel.
+        """
+        collection = self._with_concern(concern or self.bulk_concern)
+        batch_size = batch_size or self.batch_size
+        totals = {"inserted": 0, "matched": 0, "modified": 0, "deleted": 0, "upserted": 0}
+        for start in range(0, len(operations), batch_size):
+            result = await collection.bulk_write(list(operations[start:start + batch_size]), ordered=ordered)
+            if not result.acknowledged:
+                continue
+            totals["inserted"] += result.inserted_count
+            totals["matched"] += result.matched_count
+            totals["modified"] += result.modified_count
+            totals["deleted"] += result.deleted_count
+            totals["upserted"] += result.upserted_count
+        return totals
+
     async def update(self, id: str, data: Dict[str, Any]) -> Optional[T]:
-        """Update a document"""
+        """Update a document and return it as updated, in one round trip"""
         if not ObjectId.is_valid(id):
             return None
-        
+
         # Don't update _id field
         if "_id" in data:
             del data["_id"]
-            
-        result = await self.collection.update_one(
+
+        document = await self.collection.find_one_and_update(
             {"_id": ObjectId(id)},
-            {"$set": data}
+            {"$set": data},
+            return_document=ReturnDocument.AFTER,
         )
-        
-        if result.modified_count:
-            return await self.get_by_id(id)
+        if document:
+            return self.model(**document)
         return None
-    
+
+    async def update_many(self, updates: Dict[str, Dict[str, Any]], concern: Optional[WriteConcern] = None) -> int:
+        """Apply a `$set` per document id in batched round trips; returns how many were modified"""
+        operations = [
+            UpdateOne({"_id": ObjectId(id)}, {"$set": {k: v for k, v in data.items() if k != "_id"}})
+            for id, data in updates.items()
+            if ObjectId.is_valid(id)
+        ]
+        if not operations:
+            return 0
+        return (await self.bulk_write(operations, concern=concern))["modified"]
+
     async def delete(self, id: str) -> bool:
         """Delete a document"""
         if not ObjectId.is_valid(id):
             return False
-        
+
         result = await self.collection.delete_one({"_id": ObjectId(id)})
-        return result.deleted_count > 0 
\ No newline at end of file
+        return result.deleted_count > 0
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.executors import io_executor, run_blocking
+from app.helpers.utils import validate_url
+from app.services.ai_resume_analyzer import ai_resume_analyzer
+from app.services.prescorer import prescorer, shortlist
+from app.services.resume_cache import resume_text_cache
+
+logger = logging.getLogger(__name__)
+
+# (resume digest, resume text, job details) for one pairing
+Pairing = Tuple[Optional[str], str, Dict[str, Any]]
+
+
+class JobSpec:
+    """One job in a batch: a URL to scrape or a title and description."""
+
+    def __init__(self, job_url: Optional[str] = None, job_title: Optional[str] = None, job_description: Optional[str] = None):
+        self.job_url = job_url
+        self.job_title = job_title
+        self.job_description = job_description
+
+    def validate(self) -> Optional[str]:
+        """Why this job cannot be matched, or None if it is fine."""
+        if not (self.job_description or self.job_url):
+            return "Either job description or job URL is required"
+        if self.job_url and not validate_url(self.job_url):
+            return "Invalid job URL"
+        return None
+
+    def describe(self) -> Dict[str, Any]:
+        return {"job_url": self.job_url, "job_title": self.job_title}
+
+
+class ResumeSpec:
+    """One stored resume in a batch, or the reason its upload was rejected."""
+
+    def __init__(self, filename: str, file_path: Optional[str] = None, digest: Optional[str] = None, error: Optional[str] = None):
+        self.filename = filename
+        self.file_path = file_path
+        self.digest = digest
+        self.error = error
+        self.text: Optional[str] = None
+
+
+def _error(index: int, error: BaseException, **extra) -> Dict[str, Any]:
+    return {"type": "result", "index": index, "status": "error", "error": str(error) or type(error).__name__, **extra}
+
+
+class BatchMatcher:
+    """
+    Scores one resume against many jobs, or one job against many resumes.
+
+    Every input is parsed or extracted once and every pairing gets a local
+    pre-score. When `top_k` or `min_prescore` is given, only that shortlist
+    is sent to the LLM and the other pairings are reported as skipped;
+    otherwise every pairing is scored. At most `concurrency` LLM calls are
+    in flight. Results are yielded as they finish (not in input order) with
+    their input `index`; an input that fails produces an error result
+    without stopping the batch. The last item is a summary.
+    """
+
+    def __init__(self, concurrency: int, top_k: Optional[int] = None, min_prescore: Optional[float] = None):
+        self.concurrency = concurrency
+        self.top_k = top_k
+        self.min_prescore = min_prescore
+        self.analyzer = ai_resume_analyzer
+
+    async def resume_vs_jobs(self, resume: ResumeSpec, jobs: List[JobSpec]) -> AsyncIterator[Dict[str, Any]]:
+        """`resume` must already be loaded with `load_resume`."""
+        async def load(job: JobSpec) -> Pairing:
+            return resume.digest, resume.text, await self.load_job(job)
+
+        async for item in self._match(jobs, load, [{"job": job.describe()} for job in jobs]):
+            yield item
+
+    async def job_vs_resumes(self, job_details: Dict[str, Any], resumes: List[ResumeSpec]) -> AsyncIterator[Dict[str, Any]]:
+        await self.load_resumes(resumes)
+
+        async def load(resume: ResumeSpec) -> Pairing:
+            if resume.error:
+                raise ValueError(resume.error)
+            return resume.digest, resume.text, job_details
+
+        async for item in self._match(resumes, load, [{"filename": resume.filename} for resume in resumes]):
+            yield item
+
+    async def load_job(self, job: JobSpec) -> Dict[str, Any]:
+        invalid = job.validate()
+        if invalid:
+            raise ValueError(invalid)
+        return await self.analyzer.get_job_details(job.job_url, job.job_title, job.job_description)
+
+    @staticmethod
+    async def load_resume(resume: ResumeSpec) -> str:
+        if resume.error:
+            raise ValueError(resume.error)
+        text = await resume_text_cache.get_or_parse(resume.digest, resume.file_path)
+        if not text:
+            raise ValueError("Failed to parse resume")
+        resume.text = text
+        return text
+
+    @staticmethod
+    async def load_resumes(resumes: List[ResumeSpec]):
+        """
+        Parse every accepted resume at once, spread across the PDF worker
+        processes. Each resume gets its `text`, or an `error` saying why not.
+        """
+        accepted = [resume for resume in resumes if not resume.error]
+        texts = await resume_text_cache.get_or_parse_many([(resume.digest, resume.file_path) for resume in accepted])
+        for resume, text in zip(accepted, texts):
+            if isinstance(text, Exception):
+                resume.error = str(text) or type(text).__name__
+            elif not text:
+                resume.error = "Failed to parse resume"
+            else:
+                resume.text = text
+
+    async def _match(
+        self,
+        inputs: Sequence[Any],
+        load: Callable[[Any], Awaitable[Pairing]],
+        extras: List[Dict[str, Any]],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # Job scrapes are bounded too, so one batch cannot take every scraper
+        # thread; resumes are parsed up front by `load_resumes`
+        load_slots = asyncio.Semaphore(self.concurrency)
+
+        async def bounded_load(item: Any) -> Pairing:
+            async with load_slots:
+                return await load(item)
+
+        async def score(pairing: Pairing, prescore: float) -> Dict[str, Any]:
+            _, resume_text, job_details = pairing
+            async with semaphore:
+                fit_score, insights = await self.analyzer.score(resume_text, job_details)
+            return {"prescore": prescore, "fit_score": fit_score, "insights": insights}
+
+        if self.top_k is None and self.min_prescore is None:
+            # Nothing to filter on: each pairing goes to the LLM as soon as it is loaded
+            async def pipeline(item: Any) -> Dict[str, Any]:
+                pairing = await bounded_load(item)
+                prescores = await run_blocking(io_executor, prescorer.score_pairs, [pairing])
+                return await score(pairing, prescores[0])
+
+            tasks = [self._run(index, pipeline(item), **extras[index]) for index, item in enumerate(inputs)]
+            async for result in self._stream(tasks):
+                yield result
+            return
+
+        # The shortlist needs every pre-score, so all inputs are loaded first
+        loaded = await asyncio.gather(*(bounded_load(item) for item in inputs), return_exceptions=True)
+        ready: List[Dict[str, Any]] = []
+        pairings: Dict[int, Pairing] = {}
+        for index, outcome in enumerate(loaded):
+            if isinstance(outcome, BaseException):
+                logger.warning("Batch item %d failed: %s", index, outcome)
+                ready.append(_error(index, outcome, **extras[index]))
+            else:
+                pairings[index] = outcome
+
+        indexes = list(pairings)
+        scores = await run_blocking(io_executor, prescorer.score_pairs, [pairings[index] for index in indexes])
+        prescores = dict(zip(indexes, scores))
+        chosen = [indexes[position] for position in shortlist(scores, self.top_k, self.min_prescore)]
+        chosen_set = set(chosen)
+        ready.extend(
+            {"type": "result", "index": index, "status": "skipped", "prescore": prescores[index], **extras[index]}
+            for index in indexes if index not in chosen_set
+        )
+
+        tasks = [self._run(index, score(pairings[index], prescores[index]), **extras[index]) for index in chosen]
+        async for result in self._stream(tasks, ready):
+            yield result
+
+    @staticmethod
+    async def _run(index: int, work: Awaitable[Dict[str, Any]], **extra) -> Dict[str, Any]:
+        try:
+            result = await work
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Batch item %d failed: %s", index, e)
+            return _error(index, e, **extra)
+        return {"type": "result", "index": index, "status": "ok", **extra, **result}
+
+    @staticmethod
+    async def _stream(
+        tasks: List[Awaitable[Dict[str, Any]]],
+        ready: Sequence[Dict[str, Any]] = (),
+    ) -> AsyncIterator[Dict[str, Any]]:
+        pending = [asyncio.ensure_future(task) for task in tasks]
+        counts = {"ok": 0, "error": 0, "skipped": 0}
+        try:
+            for item in ready:
+                counts[item["status"]] += 1
+                yield item
+            for next_done in asyncio.as_completed(pending):
+                item = await next_done
+                counts[item["status"]] += 1
+                yield item
+        finally:
+            # The client went away: stop the work that is still running
+            for task in pending:
+                task.cancel()
+        yield {
+            "type": "summary",
+            "total": len(ready) + len(pending),
+            "succeeded": counts["ok"],
+            "failed": counts["error"],
+            "skipped": counts["skipped"],
+        }
+
+
+async def check_batch_limits():
+    """Refuse to start when a full batch of resumes could overflow the PDF parse queue."""
+    if settings.BATCH_MAX_RESUMES > settings.PDF_PARSE_QUEUE_SIZE:
+        raise RuntimeError(
+            f"BATCH_MAX_RESUMES ({settings.BATCH_MAX_RESUMES}) must not exceed "
+            f"PDF_PARSE_QUEUE_SIZE ({settings.PDF_PARSE_QUEUE_SIZE})"
+        )
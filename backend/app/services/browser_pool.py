@@ -0,0 +1,219 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+
+from app.core.config import settings
+from app.core.executors import run_blocking, scraper_executor
+from app.core.telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+
+
+class BrowserPoolTimeout(Exception):
+    """Raised when no browser became available within the checkout timeout."""
+
+
+class _PooledBrowser:
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.pages = 0
+        self.broken = False
+
+
+class BrowserPool:
+    """
+    A fixed-size pool of warm headless Chrome instances.
+
+    At most `size` browsers exist at any time, which caps both the number of
+    concurrent scrapes and the memory they use. Browsers are started lazily,
+    handed out with `checkout`, and replaced after `max_pages` page loads or
+    as soon as they raise a WebDriver error. Waiting checkouts are woken both
+    when a browser goes idle and when one is retired, since either lets them
+    proceed.
+    """
+
+    def __init__(self, size: int, max_pages: int, checkout_timeout: float, page_load_timeout: int):
+        self.size = size
+        self.max_pages = max_pages
+        self.checkout_timeout = checkout_timeout
+        self.page_load_timeout = page_load_timeout
+        # Most recently used last, so the warmest browser is handed out first
+        self._idle: List[_PooledBrowser] = []
+        # Browsers that exist, idle or checked out (or starting)
+        self._browsers = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._closed = False
+        self.created = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.in_use = 0
+
+    def _start_browser(self) -> _PooledBrowser:
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_argument(f"user-agent={USER_AGENT}")
+
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.set_page_load_timeout(self.page_load_timeout)
+        with self._lock:
+            self.created += 1
+        return _PooledBrowser(driver)
+
+    @staticmethod
+    def _quit(browser: _PooledBrowser):
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.warning("Error closing browser: %s", e)
+
+    def _reset(self, browser: _PooledBrowser):
+        """Leave the browser on a blank page without state from the last site."""
+        browser.driver.delete_all_cookies()
+        browser.driver.get("about:blank")
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[webdriver.Chrome]:
+        """
+        Borrow a browser for one page load.
+
+        Blocks up to `timeout` seconds (default `checkout_timeout`) when all
+        browsers are busy and raises BrowserPoolTimeout after that.
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        browser = self._acquire(deadline)
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+        try:
+            yield browser.driver
+            browser.pages += 1
+        except WebDriverException:
+            browser.broken = True
+            raise
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._release(browser)
+
+    def _acquire(self, deadline: float) -> _PooledBrowser:
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                # No idle browser: start a new one if the pool has room
+                if self._browsers < self.size:
+                    self._browsers += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.checkout_timeouts += 1
+                    raise BrowserPoolTimeout("No browser available, all workers are busy")
+                self._available.wait(remaining)
+        try:
+            return self._start_browser()
+        except Exception:
+            self._retire_slot()
+            raise
+
+    def _retire_slot(self):
+        """Free a browser's place in the pool and wake a checkout waiting for one."""
+        with self._available:
+            self._browsers -= 1
+            self._available.notify()
+
+    def _make_idle(self, browser: _PooledBrowser):
+        with self._available:
+            self._idle.append(browser)
+            self._available.notify()
+
+    def _release(self, browser: _PooledBrowser):
+        if not browser.broken and browser.pages < self.max_pages and not self._closed:
+            try:
+                self._reset(browser)
+                self._make_idle(browser)
+                return
+            except WebDriverException:
+                browser.broken = True
+
+        with self._lock:
+            if browser.broken:
+                self.crashed += 1
+            else:
+                self.recycled += 1
+        self._quit(browser)
+        self._retire_slot()
+
+    def warm_up(self, count: Optional[int] = None):
+        """Start up to `count` browsers ahead of the first scrape."""
+        for _ in range(min(count or self.size, self.size)):
+            with self._lock:
+                if self._closed or self._browsers >= self.size:
+                    break
+                self._browsers += 1
+            try:
+                self._make_idle(self._start_browser())
+            except Exception as e:
+                self._retire_slot()
+                logger.error("Error starting browser: %s", e)
+                break
+
+    def close(self):
+        """Quit all idle browsers; checked out ones are closed when returned."""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._browsers -= len(idle)
+            # Waiting checkouts fail fast instead of sitting out their timeout
+            self._available.notify_all()
+        for browser in idle:
+            self._quit(browser)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "in_use": self.in_use,
+            "created": self.created,
+            "recycled": self.recycled,
+            "crashed": self.crashed,
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+        }
+
+
+browser_pool = BrowserPool(
+    size=settings.BROWSER_POOL_SIZE,
+    max_pages=settings.BROWSER_MAX_PAGES,
+    checkout_timeout=settings.BROWSER_CHECKOUT_TIMEOUT,
+    page_load_timeout=settings.BROWSER_PAGE_LOAD_TIMEOUT,
+)
+metrics.stats("browser_pool_stats", "Browser pool usage, recycling and checkout timeouts", browser_pool.stats)
+
+
+async def warm_up_browser_pool():
+    if settings.BROWSER_POOL_PREWARM:
+        await run_blocking(scraper_executor, browser_pool.warm_up, settings.BROWSER_POOL_PREWARM)
+
+
+async def close_browser_pool():
+    await run_blocking(scraper_executor, browser_pool.close)
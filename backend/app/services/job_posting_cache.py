@@ -0,0 +1,147 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict
+
+import requests
+
+from app.core.config import settings
+from app.core.executors import http_executor, run_blocking
+from app.core.telemetry import metrics, record_cache
+from app.db.database import get_collection
+from app.helpers.cache import LRUCache, SingleFlight
+from app.helpers.utils import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Fetches a posting and returns {"content", "job_data", "etag", "last_modified"}
+PostingFetcher = Callable[[str], Awaitable[Dict[str, Any]]]
+
+
+class JobPostingCache:
+    """
+    Scraped job postings keyed by normalized URL.
+
+    Entries hold both the cleaned page text and the structured job data,
+    tagged with the extractor (prompt version and model) that produced the
+    data; an entry from another extractor counts as a miss. They are
+    stored in the `job_postings` collection with an in-process LRU in front
+    and expire after `ttl` seconds. Expired entries that carried an ETag or
+    Last-Modified header can be revalidated with a conditional request
+    instead of a full re-scrape. Concurrent misses for the same URL share a
+    single fetch. Database errors are logged and treated as a miss or an
+    unshared entry rather than failing the scrape.
+    """
+
+    def __init__(self, ttl: int, revalidate: bool, memory_entries: int):
+        self.ttl = ttl
+        self.revalidate = revalidate
+        self.memory = LRUCache[Dict[str, Any]](max_entries=memory_entries, ttl=ttl)
+        self.inflight = SingleFlight()
+        self.store_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @property
+    def collection(self):
+        return get_collection("job_postings")
+
+    async def get_or_fetch(self, url: str, fetch: PostingFetcher, extractor: str) -> Dict[str, Any]:
+        key = normalize_url(url)
+        entry = self.memory.get(key)
+        if entry is not None and entry.get("extractor") == extractor:
+            record_cache("job_posting", True)
+            return entry
+        return await self.inflight.do((key, extractor), lambda: self._load(key, url, fetch, extractor))
+
+    async def _load(self, key: str, url: str, fetch: PostingFetcher, extractor: str) -> Dict[str, Any]:
+        now = datetime.utcnow()
+
+        try:
+            entry = await self.collection.find_one({"_id": key})
+        except Exception as e:
+            logger.warning("Error reading job posting cache: %s", e)
+            entry = None
+        if entry and entry.get("extractor") != extractor:
+            # Extracted by an older prompt or another model; revalidating would keep its data
+            entry = None
+        if entry and entry["expires_at"] > now:
+            self.store_hits += 1
+            record_cache("job_posting", True)
+            self._remember(key, entry, now)
+            return entry
+
+        if entry and self.revalidate and (entry.get("etag") or entry.get("last_modified")):
+            not_modified = await run_blocking(http_executor, self._is_not_modified, url, entry)
+            if not_modified:
+                self.revalidated += 1
+                record_cache("job_posting", True)
+                entry = await self._save(key, url, entry, now, extractor)
+                return entry
+
+        self.misses += 1
+        record_cache("job_posting", False)
+        fetched = await fetch(url)
+        if fetched.get("job_data") is None:
+            # Don't cache failed scrapes or extractions
+            return fetched
+        return await self._save(key, url, fetched, now, extractor)
+
+    async def _save(self, key: str, url: str, fetched: Dict[str, Any], now: datetime, extractor: str) -> Dict[str, Any]:
+        expires_at = now + timedelta(seconds=self.ttl)
+        entry = {
+            "_id": key,
+            "url": url,
+            "content": fetched.get("content"),
+            "job_data": fetched.get("job_data"),
+            "extractor": extractor,
+            "etag": fetched.get("etag"),
+            "last_modified": fetched.get("last_modified"),
+            "fetched_at": fetched.get("fetched_at", now),
+            "expires_at": expires_at,
+            # Keep expired entries around for a while so they can be revalidated
+            "purge_at": expires_at + timedelta(seconds=self.ttl),
+        }
+        try:
+            await self.collection.replace_one({"_id": key}, entry, upsert=True)
+        except Exception as e:
+            # The posting is still good, it just won't be shared with other workers
+            logger.warning("Error storing job posting: %s", e)
+        self._remember(key, entry, now)
+        return entry
+
+    def _remember(self, key: str, entry: Dict[str, Any], now: datetime):
+        remaining = (entry["expires_at"] - now).total_seconds()
+        if remaining > 0:
+            self.memory.set(key, entry, ttl=min(remaining, self.ttl))
+
+    @staticmethod
+    def _is_not_modified(url: str, entry: Dict[str, Any]) -> bool:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            response = requests.head(url, headers=headers, timeout=5, allow_redirects=True)
+        except requests.RequestException:
+            return False
+        return response.status_code == 304
+
+    def stats(self) -> Dict[str, Any]:
+        memory = self.memory.stats()
+        return {
+            "hits": memory["hits"] + self.store_hits + self.revalidated,
+            "misses": self.misses,
+            "coalesced": self.inflight.coalesced,
+            "memory": memory,
+            "store_hits": self.store_hits,
+            "revalidated": self.revalidated,
+        }
+
+
+job_posting_cache = JobPostingCache(
+    ttl=settings.JOB_CACHE_TTL_SECONDS,
+    revalidate=settings.JOB_CACHE_REVALIDATE,
+    memory_entries=settings.JOB_CACHE_MEMORY_ENTRIES,
+)
+metrics.stats("job_posting_cache_stats", "Job posting cache hits, misses and revalidations", job_posting_cache.stats)
@@ -1,88 +1,96 @@
-import json
-from bs4 import BeautifulSoup
-from selenium.webdriver.chrome.options import Options
-from selenium import webdriver
-import time
+import logging
+from datetime import datetime
 from app.clients.AnthropicClient import AnthropicClient
+from app.core.telemetry import span
+from app.prompts.job_extraction import JOB_EXTRACTION
+from app.schemas.analysis import JOB_FIELD_TYPES, JobData
+from app.services.browser_pool import browser_pool
+from app.services.job_posting_cache import job_posting_cache
+from app.services.page_fetcher import page_fetcher
+from app.services.page_readiness import page_readiness
+from app.services.text_compactor import compact_job_page
+from app.services.structured_job_extractor import structured_job_extractor
+from app.services.structured_output import StructuredOutputError, structured_output
+
+logger = logging.getLogger(__name__)
 
 class JobScraper:
     def __init__(self):
-        self.client = AnthropicClient()
+        self.client = AnthropicClient(task="extraction")
 
-    def scrape_webpage_with_selenium(self, url):
-        """Scrape content from a given URL using Selenium."""
+    def render_with_browser(self, url):
+        """Load a URL in a pooled Selenium browser and return the rendered HTML."""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")  
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36")
-            
-            driver = webdriver.Chrome(options=chrome_options)
-            
-            driver.get(url)
-            
-            time.sleep(5)
-            
-            html_content = driver.page_source
-            
-            driver.quit()
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            for script in soup(["script", "style"]):
-                script.extract()
-            
-            text = soup.get_text(separator='\n')
-            
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = '\n'.join(chunk for chunk in chunks if chunk)
-            
-            return text
+            with browser_pool.checkout() as driver:
+                driver.get(url)
+                
+                # Wait only as long as it takes for the posting to render
+                with span("page_wait", domain=page_readiness.domain_for(url)) as wait:
+                    readiness = page_readiness.wait(driver, url)
+                    wait.set("ready_reason", readiness.reason)
+                
+                return driver.page_source
         except Exception as e:
-            print(f"Error scraping {url}: {e}")
+            logger.warning("Error scraping %s: %s", url, e)
             return None
 
-    def extract_job_data(self, url):
-        content = self.scrape_webpage_with_selenium(url)
-        
-        """Extract structured job data using Anthropic API."""
-        prompt = """
-            You are an expert job data extractor. Below is the content from a job posting webpage.
-            
-            Extract the following information in a structured format according to this schema:
-        {{
-            "company_name": string,
-            "job_title": string,
-            "job_description": string,
-            "relevant_skills": [list of strings],
-            "relevant_experience": string,
-            "responsibilities": [list of strings],
-            "requirements": [list of strings] 
-        }}
-        
-        If any field is not explicitly available in the content, make a reasonable inference based on context or leave as an empty string or empty list as appropriate.
-        
-        Return ONLY a valid JSON object with no additional text, comments, or explanations.
-        
-        Job posting content:
-        {content}
+    async def extract_job_data(self, url):
+        """Structured job data for `url`, served from the posting cache when possible."""
+        extractor = f"{JOB_EXTRACTION.key}/{self.client.model}"
+        entry = await job_posting_cache.get_or_fetch(url, self._scrape_and_extract, extractor)
+        return entry.get("job_data")
+
+    async def _scrape_and_extract(self, url):
+        fetched_at = datetime.utcnow()
+        page = await page_fetcher.fetch(url, self.render_with_browser)
+        if page is None:
+            return {"content": None, "job_data": None}
+
+        job_data = await self._extract(page)
+        return {
+            "content": page.text,
+            "job_data": job_data,
+            "etag": page.etag,
+            "last_modified": page.last_modified,
+            "fetched_at": fetched_at,
+        }
+
+    async def _extract(self, page):
+        """
+        Fill the job data schema from the page's structured markup and only
+        ask the LLM for the fields the markup did not provide. Defaults are
+        built per call so results never share list objects.
         """
+        structured = structured_job_extractor.extract(page.html, page.url) if page.html else {}
+        if not structured_job_extractor.needs_llm(structured):
+            return {**JobData().model_dump(), **structured}
+
+        if not page.text:
+            return None
+        missing = structured_job_extractor.missing_fields(structured)
+        llm_data = await self.extract_job_data_from_content(page.text, fields=missing)
+        if llm_data is None:
+            return None
+        return {**JobData().model_dump(), **llm_data, **structured}
+
+    async def extract_job_data_from_content(self, content, fields=None):
+        """Extract structured job data using Anthropic API."""
+        fields = fields or list(JOB_FIELD_TYPES)
 
+        compacted = compact_job_page(content)
+        logger.debug("Job page compacted: %d -> %d tokens", compacted.tokens_before, compacted.tokens_after)
         variables = {
-            "content": content
+            "fields": ", ".join(fields),
+            "content": compacted.text
         }
         
-        response = self.client.chat(prompt, variables)
+        with span("extract_llm", fields=len(fields)):
+            response = await self.client.achat(JOB_EXTRACTION, variables)
 
         try:
-            json_str = response[response.find('{'):response.rfind('}')+1]
-            job_data = json.loads(json_str)
-            return job_data
-        except json.JSONDecodeError:
-            print("Failed to parse JSON from model response")
-            print("Response:", response)
+            job_data = await structured_output.parse(response, JobData)
+        except StructuredOutputError as e:
+            logger.warning("Failed to parse job data from model response: %s", e)
+            logger.debug("Response: %s", response)
             return None
-
+        return job_data.model_dump(include=set(fields))
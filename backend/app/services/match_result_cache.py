@@ -0,0 +1,173 @@
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.telemetry import metrics, record_cache
+from app.db.database import get_collection
+from app.helpers.cache import LRUCache, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+MatchResult = Tuple[int, list]
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return re.sub(r"\s+", " ", value).strip()
+    if isinstance(value, list):
+        return [_normalize(item) for item in value if item]
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items() if item}
+    return value
+
+
+def resume_hash(resume_text: str) -> str:
+    return _sha256(_normalize(resume_text or ""))
+
+
+def job_hash(job_details: Dict[str, Any]) -> str:
+    """Hash of the job details that ignores field order, empty fields and whitespace."""
+    return _sha256(json.dumps(_normalize(job_details or {}), sort_keys=True, ensure_ascii=False))
+
+
+class MatchResultCache:
+    """
+    Fit scores and insights keyed by the parsed resume, the job details, the
+    prompt version (which includes the model) that produced them and the
+    token budgets the inputs were compacted to before scoring.
+
+    Entries live in the `match_results` collection, which expires them after
+    `ttl` seconds, with an in-process LRU in front. Bumping the prompt
+    version or changing a budget changes every key, so old results are
+    simply never read again and age out. Concurrent misses for the same pair share one LLM call.
+    """
+
+    def __init__(self, ttl: int, memory_entries: int):
+        self.ttl = ttl
+        self.memory = LRUCache[MatchResult](max_entries=memory_entries, ttl=ttl)
+        self.inflight = SingleFlight()
+        self.store_hits = 0
+        self.misses = 0
+
+    @property
+    def collection(self):
+        return get_collection("match_results")
+
+    @staticmethod
+    def cacheable(job_details: Dict[str, Any]) -> bool:
+        """Empty job details (e.g. from a failed scrape) would share one key across every job."""
+        return bool(_normalize(job_details or {}))
+
+    @staticmethod
+    def key(resume_text: str, job_details: Dict[str, Any], prompt_version: str) -> str:
+        budgets = f"{settings.RESUME_TOKEN_BUDGET}/{settings.JOB_TOKEN_BUDGET}"
+        return _sha256(f"{prompt_version}:{budgets}:{resume_hash(resume_text)}:{job_hash(job_details)}")
+
+    async def get_or_score(
+        self,
+        resume_text: str,
+        job_details: Dict[str, Any],
+        prompt_version: str,
+        score: Callable[[], Awaitable[MatchResult]],
+    ) -> MatchResult:
+        if not self.cacheable(job_details):
+            return await score()
+        key = self.key(resume_text, job_details, prompt_version)
+        result = self.memory.get(key)
+        if result is not None:
+            record_cache("match_result", True)
+            return result
+        return await self.inflight.do(
+            key, lambda: self._load(key, resume_text, job_details, prompt_version, score)
+        )
+
+    async def lookup(self, resume_text: str, job_details: Dict[str, Any], prompt_version: str) -> Optional[MatchResult]:
+        """The stored result for this pair, without scoring on a miss."""
+        if not self.cacheable(job_details):
+            return None
+        key = self.key(resume_text, job_details, prompt_version)
+        result = self.memory.get(key)
+        if result is not None:
+            record_cache("match_result", True)
+            return result
+        return await self._find(key)
+
+    async def store(self, resume_text: str, job_details: Dict[str, Any], prompt_version: str, result: MatchResult):
+        if not self.cacheable(job_details):
+            return
+        key = self.key(resume_text, job_details, prompt_version)
+        fit_score, insights = result
+        now = datetime.utcnow()
+        try:
+            await self.collection.replace_one({"_id": key}, {
+                "_id": key,
+                "resume_sha256": resume_hash(resume_text),
+                "job_sha256": job_hash(job_details),
+                "prompt_version": prompt_version,
+                "fit_score": fit_score,
+                "insights": insights,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=self.ttl),
+            }, upsert=True)
+        except Exception as e:
+            # The result is still good, it just won't be shared with other workers
+            logger.warning("Error storing match result: %s", e)
+        self.memory.set(key, (fit_score, insights))
+
+    async def _load(
+        self,
+        key: str,
+        resume_text: str,
+        job_details: Dict[str, Any],
+        prompt_version: str,
+        score: Callable[[], Awaitable[MatchResult]],
+    ) -> MatchResult:
+        result = await self._find(key)
+        if result is not None:
+            return result
+        result = await score()
+        await self.store(resume_text, job_details, prompt_version, result)
+        return result
+
+    async def _find(self, key: str) -> Optional[MatchResult]:
+        now = datetime.utcnow()
+        try:
+            entry = await self.collection.find_one({"_id": key})
+        except Exception as e:
+            logger.warning("Error reading match result cache: %s", e)
+            entry = None
+        # The TTL monitor only runs once a minute, so expiry is checked here too
+        if entry is None or entry["expires_at"] <= now:
+            self.misses += 1
+            record_cache("match_result", False)
+            return None
+        self.store_hits += 1
+        record_cache("match_result", True)
+        result = (entry["fit_score"], entry["insights"])
+        self.memory.set(key, result, ttl=(entry["expires_at"] - now).total_seconds())
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        memory = self.memory.stats()
+        return {
+            "hits": memory["hits"] + self.store_hits,
+            "misses": self.misses,
+            "coalesced": self.inflight.coalesced,
+            "memory": memory,
+            "store_hits": self.store_hits,
+        }
+
+
+match_result_cache = MatchResultCache(
+    ttl=settings.MATCH_CACHE_TTL_SECONDS,
+    memory_entries=settings.MATCH_CACHE_MEMORY_ENTRIES,
+)
+metrics.stats("match_result_cache_stats", "Match result cache hits, misses and coalesced lookups", match_result_cache.stats)
@@ -0,0 +1,186 @@
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.core.executors import http_executor, run_blocking, scraper_executor
+from app.core.telemetry import metrics
+from app.helpers.html import extract_json_ld, job_posting_text, main_content_text
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+
+# Phrases that mean the server sent a shell page that needs JavaScript (or a bot check)
+JS_GATE_PATTERN = re.compile(
+    r"enable javascript|javascript is (disabled|required)|requires javascript|"
+    r"checking your browser|just a moment\.\.\.|cf-browser-verification|captcha",
+    re.IGNORECASE,
+)
+
+
+class FetchResult:
+    def __init__(
+        self,
+        url: str,
+        html: str,
+        text: str,
+        tier: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        self.url = url
+        self.html = html
+        self.text = text
+        self.tier = tier
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class HttpFetcher:
+    """
+    Plain HTTP fetches over a pooled keep-alive session. The body is
+    streamed and cut off after `max_bytes`, or at the first chunk boundary
+    after `timeout` seconds in total, so an oversized or trickling page
+    cannot hold a thread for long.
+    """
+
+    def __init__(self, timeout: float, pool_size: int, max_bytes: int):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+
+    def fetch(self, url: str) -> Optional[FetchResult]:
+        deadline = time.monotonic() + self.timeout
+        try:
+            response = self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True)
+        except requests.RequestException as e:
+            logger.info("HTTP fetch failed for %s: %s", url, e)
+            return None
+
+        with response:
+            result = FetchResult(
+                url=url,
+                html="",
+                text="",
+                tier="http",
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+            content_type = response.headers.get("Content-Type", "")
+            if response.status_code != 200 or "html" not in content_type:
+                return result
+            try:
+                body = self._read_body(response, url, deadline)
+            except requests.RequestException as e:
+                logger.info("HTTP fetch failed for %s: %s", url, e)
+                return None
+
+        result.html = body.decode(response.encoding or "utf-8", errors="replace")
+        postings = extract_json_ld(result.html, "JobPosting")
+        if postings:
+            result.text = job_posting_text(postings[0])
+        else:
+            result.text = main_content_text(result.html)
+        return result
+
+    def _read_body(self, response: requests.Response, url: str, deadline: float) -> bytes:
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=8192):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                logger.info("Page %s is over %d bytes, using the start of it", url, self.max_bytes)
+                break
+            if time.monotonic() > deadline:
+                logger.info("Page %s took over %gs to download, using what arrived", url, self.timeout)
+                break
+        return b"".join(chunks)[:self.max_bytes]
+
+
+def looks_js_gated(result: Optional[FetchResult], min_text_length: int) -> bool:
+    """Whether a plain HTTP result is too thin to use and needs a real browser."""
+    if result is None or not result.html:
+        return True
+    if len(result.text) < min_text_length:
+        return True
+    # A short page that talks about JavaScript is a loader shell, not a posting
+    return len(result.text) < min_text_length * 4 and bool(JS_GATE_PATTERN.search(result.text))
+
+
+class TieredPageFetcher:
+    """
+    Fetches a job page with a plain HTTP request first and only escalates to
+    a headless browser when the response is empty or looks JavaScript-gated.
+    Counts how often each tier served the page.
+    """
+
+    def __init__(self, http: HttpFetcher, min_text_length: int):
+        self.http = http
+        self.min_text_length = min_text_length
+        self._lock = threading.Lock()
+        self.tier_counts: Dict[str, int] = {"http": 0, "browser": 0, "failed": 0}
+
+    async def fetch(self, url: str, render_with_browser: Callable[[str], Optional[str]]) -> Optional[FetchResult]:
+        """
+        `render_with_browser` loads the URL in a browser and returns the
+        rendered HTML; it is only called when the HTTP tier falls short.
+        """
+        result = await run_blocking(http_executor, self.http.fetch, url)
+        if not looks_js_gated(result, self.min_text_length):
+            self._count("http")
+            return result
+
+        html = await run_blocking(scraper_executor, render_with_browser, url)
+        if not html:
+            self._count("failed")
+            return None
+
+        self._count("browser")
+        postings = extract_json_ld(html, "JobPosting")
+        return FetchResult(
+            url=url,
+            html=html,
+            text=job_posting_text(postings[0]) if postings else main_content_text(html),
+            tier="browser",
+            # Validators from the HTTP attempt still describe the resource
+            etag=result.etag if result else None,
+            last_modified=result.last_modified if result else None,
+        )
+
+    def _count(self, tier: str):
+        with self._lock:
+            self.tier_counts[tier] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self.tier_counts.values())
+            return {
+                **self.tier_counts,
+                "http_hit_rate": round(self.tier_counts["http"] / total, 3) if total else None,
+            }
+
+
+page_fetcher = TieredPageFetcher(
+    http=HttpFetcher(
+        timeout=settings.HTTP_FETCH_TIMEOUT,
+        pool_size=settings.HTTP_POOL_SIZE,
+        max_bytes=settings.HTTP_FETCH_MAX_BYTES,
+    ),
+    min_text_length=settings.HTTP_FETCH_MIN_TEXT_LENGTH,
+)
+metrics.stats("page_fetch_tier_stats", "Job pages served by the HTTP and browser tiers", page_fetcher.stats)
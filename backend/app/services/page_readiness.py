@@ -0,0 +1,192 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Tuple
+from urllib.parse import urlparse
+
+from app.core.config import settings
+from app.core.telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+# Collects everything a readiness check needs in a single round trip to the browser
+READINESS_SCRIPT = """
+const selectors = arguments[0];
+const body = document.body;
+let matched = false;
+for (const selector of selectors) {
+    const element = document.querySelector(selector);
+    if (element && element.innerText && element.innerText.trim().length > 100) {
+        matched = true;
+        break;
+    }
+}
+return {
+    readyState: document.readyState,
+    textLength: body ? body.innerText.length : 0,
+    resources: performance.getEntriesByType("resource").length,
+    matched: matched
+};
+"""
+
+
+class ReadinessProfile:
+    """
+    How to tell that a site's job posting has rendered.
+
+    `selectors` identify the posting content (the wait ends as soon as one of
+    them holds text); otherwise the page counts as ready once it has loaded,
+    holds at least `min_text_length` characters and neither its text nor its
+    network activity has changed for `stable_for` seconds. Nothing waits
+    longer than `max_wait`.
+    """
+
+    def __init__(
+        self,
+        selectors: Tuple[str, ...] = (),
+        min_text_length: int = 500,
+        stable_for: float = 0.75,
+        max_wait: float = 8.0,
+    ):
+        self.selectors = selectors
+        self.min_text_length = min_text_length
+        self.stable_for = stable_for
+        self.max_wait = max_wait
+
+
+DEFAULT_PROFILE = ReadinessProfile(
+    selectors=("[itemtype*='JobPosting']", "main article", "[class*='job-description']", "[id*='job-description']"),
+)
+
+DOMAIN_PROFILES: Dict[str, ReadinessProfile] = {
+    "linkedin.com": ReadinessProfile(
+        selectors=(".show-more-less-html__markup", ".description__text", ".jobs-description__content"),
+        max_wait=8.0,
+    ),
+    "greenhouse.io": ReadinessProfile(
+        selectors=("#content", ".job__description", "#app_body"),
+        max_wait=5.0,
+    ),
+    "lever.co": ReadinessProfile(
+        selectors=(".posting-page .section-wrapper", ".posting-description"),
+        max_wait=5.0,
+    ),
+    "myworkdayjobs.com": ReadinessProfile(
+        selectors=("[data-automation-id='jobPostingDescription']",),
+        stable_for=1.0,
+        max_wait=12.0,
+    ),
+    "indeed.com": ReadinessProfile(
+        selectors=("#jobDescriptionText",),
+        max_wait=8.0,
+    ),
+    "ashbyhq.com": ReadinessProfile(
+        selectors=("[class*='_descriptionText']", "[class*='ashby-job-posting']"),
+        max_wait=8.0,
+    ),
+}
+
+
+class ReadinessResult:
+    def __init__(self, reason: str, elapsed: float):
+        self.reason = reason
+        self.elapsed = elapsed
+
+
+class PageReadinessEngine:
+    """
+    Waits for a freshly loaded page to hold its job posting, replacing a
+    fixed sleep with polling against a per-domain ReadinessProfile. Wait
+    times are recorded per domain so the profiles can be tuned.
+    """
+
+    def __init__(self, poll_interval: float, hard_cap: float):
+        self.poll_interval = poll_interval
+        self.hard_cap = hard_cap
+        self._lock = threading.Lock()
+        self._timings: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "reasons": defaultdict(int)}
+        )
+
+    @staticmethod
+    def domain_for(url: str) -> str:
+        host = (urlparse(url).hostname or "").lower()
+        for domain in DOMAIN_PROFILES:
+            if host == domain or host.endswith(f".{domain}"):
+                return domain
+        return "default"
+
+    def profile_for(self, domain: str) -> ReadinessProfile:
+        return DOMAIN_PROFILES.get(domain, DEFAULT_PROFILE)
+
+    def wait(self, driver, url: str) -> ReadinessResult:
+        """Block until the page in `driver` is ready or the profile's cap is hit."""
+        domain = self.domain_for(url)
+        profile = self.profile_for(domain)
+        max_wait = min(profile.max_wait, self.hard_cap)
+        selectors = list(profile.selectors)
+
+        start = time.monotonic()
+        last_signature = None
+        stable_since = start
+        reason = "timeout"
+        while True:
+            now = time.monotonic()
+            try:
+                state = driver.execute_script(READINESS_SCRIPT, selectors)
+            except Exception as e:
+                logger.warning("Readiness check failed for %s: %s", url, e)
+                reason = "error"
+                break
+
+            if state.get("matched"):
+                reason = "selector"
+                break
+
+            signature = (state.get("textLength"), state.get("resources"))
+            if signature != last_signature:
+                last_signature = signature
+                stable_since = now
+            elif (
+                state.get("readyState") == "complete"
+                and state.get("textLength", 0) >= profile.min_text_length
+                and now - stable_since >= profile.stable_for
+            ):
+                reason = "stable"
+                break
+
+            if now - start >= max_wait:
+                break
+            time.sleep(self.poll_interval)
+
+        result = ReadinessResult(reason, time.monotonic() - start)
+        self._record(domain, result)
+        return result
+
+    def _record(self, domain: str, result: ReadinessResult):
+        with self._lock:
+            timing = self._timings[domain]
+            timing["count"] += 1
+            timing["total_seconds"] += result.elapsed
+            timing["max_seconds"] = max(timing["max_seconds"], result.elapsed)
+            timing["reasons"][result.reason] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                domain: {
+                    "count": timing["count"],
+                    "avg_seconds": round(timing["total_seconds"] / timing["count"], 3),
+                    "max_seconds": round(timing["max_seconds"], 3),
+                    "reasons": dict(timing["reasons"]),
+                }
+                for domain, timing in self._timings.items()
+            }
+
+
+page_readiness = PageReadinessEngine(
+    poll_interval=settings.PAGE_READY_POLL_INTERVAL,
+    hard_cap=settings.PAGE_READY_MAX_WAIT,
+)
+metrics.stats("page_ready_stats", "Page-ready wait times per domain", page_readiness.stats)
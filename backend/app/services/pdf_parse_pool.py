@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Union
+
+from app.core.config import settings
+from app.core.telemetry import metrics
+from app.services.resume_parser import PdfLimitExceeded, ResumeParserService
+
+logger = logging.getLogger(__name__)
+
+
+class ParserBusyError(Exception):
+    """Raised when the parse queue is full."""
+
+
+class _Budget:
+    """A parse's time limit, counted from when its first task gets a process."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.deadline: Optional[float] = None
+
+    def remaining(self) -> float:
+        if self.deadline is None:
+            self.deadline = time.monotonic() + self.seconds
+        return self.deadline - time.monotonic()
+
+
+class PdfParsePool:
+    """
+    CPU-bound PDF text extraction on a pool of worker processes, so parsing
+    uses every core instead of sharing one GIL with the API.
+
+    Documents longer than `fanout_pages` are split into page ranges that are
+    extracted in parallel. Every task submitted to the pool holds one of
+    `workers` process slots until it has really finished, so admission
+    matches the processes actually busy. At most `max_queue` parses are
+    admitted at once; each gets `task_timeout` seconds from its first task
+    starting. A parse that runs out of time has its tasks killed by
+    recycling the pool, since a worker stuck on a hostile PDF would
+    otherwise keep its process long after the caller gave up; parses caught
+    in the recycle are retried once.
+    """
+
+    def __init__(self, workers: int, max_queue: int, task_timeout: float, fanout_pages: int, pages_per_task: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.task_timeout = task_timeout
+        self.fanout_pages = fanout_pages
+        self.pages_per_task = pages_per_task
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # One per worker process, held by each task until it ends
+        self._slots = asyncio.Semaphore(workers)
+        # Bumped whenever the pool is replaced, so parses can tell they were caught in a recycle
+        self.generation = 0
+        self.queued = 0
+        self.busy = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.recycled = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process that runs threads (executors, Motor) is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _submit(self, budget: _Budget, func, *args):
+        await self._slots.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.busy += 1
+
+        def task_done(_):
+            # The slot is freed when the process is, not when the caller stops waiting
+            def release():
+                self.busy -= 1
+                self._slots.release()
+            try:
+                loop.call_soon_threadsafe(release)
+            except RuntimeError:
+                pass  # the event loop has closed
+
+        future.add_done_callback(task_done)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=max(0.0, budget.remaining()))
+        except asyncio.TimeoutError:
+            if future.running():
+                self._recycle()
+            raise
+
+    async def parse(self, file_path: str) -> Optional[str]:
+        """
+        Text of the PDF, or None if it could not be parsed. Raises
+        PdfLimitExceeded for documents over the page or time limits and
+        ParserBusyError when too many parses are already waiting.
+        """
+        if self.queued >= self.max_queue:
+            raise ParserBusyError("Too many resumes are being parsed, please retry shortly")
+
+        self.queued += 1
+        start = time.monotonic()
+        try:
+            for attempt in range(2):
+                generation = self.generation
+                try:
+                    text = await self._parse(file_path, _Budget(self.task_timeout))
+                except BrokenProcessPool as e:
+                    if attempt == 0 and self.generation != generation:
+                        continue  # another parse's timeout recycled the pool under us
+                    # A worker died (e.g. OOM on a hostile PDF); start a fresh pool next time
+                    self.failed += 1
+                    logger.error("PDF parse pool broke, restarting it: %s", e)
+                    if self.generation == generation:
+                        self._recycle()
+                    return None
+                self.completed += 1
+                return text
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise PdfLimitExceeded("Resume could not be parsed within the time limit")
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except PdfLimitExceeded:
+            self.failed += 1
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error("Error parsing PDF: %s", e)
+            return None
+        finally:
+            elapsed = time.monotonic() - start
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+            self.queued -= 1
+
+    async def parse_many(self, file_paths: List[str]) -> List[Union[Optional[str], Exception]]:
+        """
+        Parse a batch of PDFs in parallel across the worker processes. At
+        most `workers` documents of the batch are admitted at a time, which
+        keeps every core busy without filling the queue that other uploads
+        share. Results are in input order; a document that failed has its
+        exception in its place.
+        """
+        batch_slots = asyncio.Semaphore(self.workers)
+
+        async def parse_one(file_path: str) -> Optional[str]:
+            async with batch_slots:
+                return await self.parse(file_path)
+
+        return await asyncio.gather(*(parse_one(path) for path in file_paths), return_exceptions=True)
+
+    async def _parse(self, file_path: str, budget: _Budget) -> str:
+        page_count = await self._submit(budget, ResumeParserService.page_count, file_path)
+        deadline = time.time() + settings.PDF_PARSE_TIME_BUDGET
+
+        if page_count <= self.fanout_pages:
+            pages = await self._submit(budget, ResumeParserService.extract_page_range, file_path, 0, page_count, deadline)
+        else:
+            ranges = [
+                (start, min(start + self.pages_per_task, page_count))
+                for start in range(0, page_count, self.pages_per_task)
+            ]
+            chunks = await asyncio.gather(*(
+                self._submit(budget, ResumeParserService.extract_page_range, file_path, start, end, deadline)
+                for start, end in ranges
+            ))
+            pages = [page for chunk in chunks for page in chunk]
+
+        if not pages and page_count:
+            raise PdfLimitExceeded("Resume could not be parsed within the time limit")
+        return "\n".join(pages).strip()
+
+    def _recycle(self):
+        """Kill the worker processes and start a fresh pool on the next submit."""
+        executor = self._executor
+        if executor is None:
+            return
+        self._executor = None
+        self.generation += 1
+        self.recycled += 1
+        # shutdown() lets running tasks finish; terminating is the only way to stop them.
+        # Their futures fail with BrokenProcessPool, which frees their slots.
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        finished = self.completed + self.failed + self.timed_out + self.cancelled
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queued,
+            "busy_workers": self.busy,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+            "recycled": self.recycled,
+            "avg_seconds": round(self.total_seconds / finished, 3) if finished else None,
+            "max_seconds": round(self.max_seconds, 3),
+        }
+
+
+pdf_parse_pool = PdfParsePool(
+    workers=settings.PDF_PARSER_WORKERS,
+    max_queue=settings.PDF_PARSE_QUEUE_SIZE,
+    task_timeout=settings.PDF_PARSE_TASK_TIMEOUT,
+    fanout_pages=settings.PDF_FANOUT_PAGES,
+    pages_per_task=settings.PDF_PAGES_PER_TASK,
+)
+metrics.stats("pdf_parse_pool_stats", "PDF parse pool queue depth, outcomes and task latency", pdf_parse_pool.stats)
+
+
+async def shutdown_pdf_parse_pool():
+    pdf_parse_pool.shutdown()
@@ -0,0 +1,264 @@
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.telemetry import metrics
+from app.helpers.skills import SKILL_TERMS, find_skills
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the their this to "
+    "we will with you your who what which can all any more other such than they them into about "
+    "work working team teams role job experience years year ability strong good excellent".split()
+)
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+def job_query_text(job_details: Dict[str, Any]) -> str:
+    """The parts of a job that say what a candidate needs; the full description when those are missing."""
+    parts: List[str] = []
+    for field in ("job_title", "relevant_skills", "requirements", "relevant_experience"):
+        value = job_details.get(field)
+        if isinstance(value, list):
+            parts.extend(str(item) for item in value)
+        elif value:
+            parts.append(str(value))
+    if len(parts) <= 1:
+        parts.append(str(job_details.get("job_description") or ""))
+    return "\n".join(parts)
+
+
+class ResumeVector:
+    def __init__(self, term_counts: np.ndarray, length: int, skills: np.ndarray):
+        self.term_counts = term_counts
+        self.length = length
+        self.skills = skills
+
+
+class PreScorer:
+    """
+    Cheap, local relevance score for a resume/job pairing, used to shortlist
+    batch matches before any LLM call.
+
+    Resumes are indexed as hashed term counts plus a vector of known skill
+    terms, in NumPy arrays persisted to `index_path`; the indexed resumes
+    also provide the corpus statistics (document frequencies, average
+    length). A job is scored as a BM25 query built from its title, skills
+    and requirements, blended with the share of its skills the resume
+    mentions. Scores are 0-100 and only meant for ranking, they are not
+    comparable to the LLM fit score.
+    """
+
+    def __init__(self, index_path: str, dim: int, max_docs: int, skill_weight: float, save_every: int):
+        self.index_path = index_path
+        self.dim = dim
+        self.max_docs = max_docs
+        self.skill_weight = skill_weight
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._rows: Dict[str, int] = {}
+        self._digests: List[str] = []
+        # Preallocated and grown by doubling; only the first len(_digests) rows are in use
+        self._term_counts = np.zeros((16, dim), dtype=np.uint16)
+        self._lengths = np.zeros(16, dtype=np.int32)
+        self._skills = np.zeros((16, len(SKILL_TERMS)), dtype=bool)
+        self._doc_freq = np.zeros(dim, dtype=np.int32)
+        self._unsaved = 0
+        self.scored = 0
+        self.total_ms = 0.0
+
+    def _hash(self, token: str) -> int:
+        # crc32 rather than hash() so buckets are stable across processes
+        return zlib.crc32(token.encode("utf-8")) % self.dim
+
+    def _skill_vector(self, texts: List[str]) -> np.ndarray:
+        found = set(find_skills(texts))
+        return np.array([term in found for term in SKILL_TERMS], dtype=bool)
+
+    def vectorize_resume(self, text: str) -> ResumeVector:
+        tokens = tokenize(text)
+        counts = np.bincount([self._hash(token) for token in tokens], minlength=self.dim)
+        return ResumeVector(
+            np.minimum(counts, np.iinfo(np.uint16).max).astype(np.uint16),
+            len(tokens),
+            self._skill_vector([text]),
+        )
+
+    def resume_vector(self, digest: Optional[str], text: str) -> ResumeVector:
+        """The indexed vector for `digest`, indexing the resume on first sight."""
+        with self._lock:
+            self._load()
+            row = self._rows.get(digest) if digest else None
+            if row is not None:
+                return ResumeVector(self._term_counts[row], int(self._lengths[row]), self._skills[row])
+
+        vector = self.vectorize_resume(text)
+        if digest:
+            self._add(digest, vector)
+        return vector
+
+    def _add(self, digest: str, vector: ResumeVector):
+        with self._lock:
+            if digest in self._rows or len(self._digests) >= self.max_docs:
+                return
+            row = len(self._digests)
+            if row == len(self._lengths):
+                self._grow(min(max(row * 2, 16), self.max_docs))
+            self._rows[digest] = row
+            self._digests.append(digest)
+            self._term_counts[row] = vector.term_counts
+            self._lengths[row] = vector.length
+            self._skills[row] = vector.skills
+            self._doc_freq += vector.term_counts > 0
+            self._unsaved += 1
+            should_save = self._unsaved >= self.save_every
+        if should_save:
+            self.save()
+
+    def _grow(self, capacity: int):
+        used = len(self._digests)
+        for name in ("_term_counts", "_lengths", "_skills"):
+            current = getattr(self, name)
+            grown = np.zeros((capacity,) + current.shape[1:], dtype=current.dtype)
+            grown[:used] = current[:used]
+            setattr(self, name, grown)
+
+    def score(self, resume: ResumeVector, job_details: Dict[str, Any]) -> float:
+        start = time.perf_counter()
+        query = np.unique([self._hash(token) for token in tokenize(job_query_text(job_details))])
+        job_skills = self._skill_vector([job_query_text(job_details), str(job_details.get("job_description") or "")])
+
+        with self._lock:
+            docs = len(self._digests)
+            avg_length = float(self._lengths[:docs].mean()) if docs else float(max(resume.length, 1))
+            docs = max(docs, 1)
+            doc_freq = self._doc_freq[query] if len(query) else np.zeros(0)
+
+        lexical = 0.0
+        if len(query):
+            idf = np.log1p((docs - doc_freq + 0.5) / (doc_freq + 0.5))
+            tf = resume.term_counts[query].astype(np.float32)
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * resume.length / max(avg_length, 1.0))
+            bm25 = float(np.sum(idf * tf * (BM25_K1 + 1) / (tf + norm)))
+            # Divided by the score of a resume that saturates every query term
+            lexical = bm25 / float(np.sum(idf * (BM25_K1 + 1)))
+
+        if job_skills.any():
+            coverage = float(np.count_nonzero(resume.skills & job_skills)) / float(np.count_nonzero(job_skills))
+            blended = self.skill_weight * coverage + (1 - self.skill_weight) * lexical
+        else:
+            blended = lexical
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.scored += 1
+            self.total_ms += elapsed_ms
+        return round(100 * blended, 1)
+
+    def score_pairs(self, pairs: List[Tuple[Optional[str], str, Dict[str, Any]]]) -> List[float]:
+        """Scores for (resume digest, resume text, job details) pairings, in input order."""
+        vectors: Dict[str, ResumeVector] = {}
+        scores = []
+        for digest, text, job_details in pairs:
+            key = digest or text
+            if key not in vectors:
+                vectors[key] = self.resume_vector(digest, text)
+            scores.append(self.score(vectors[key], job_details))
+        return scores
+
+    def _load(self):
+        """Read the persisted index once; called with the lock held."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with np.load(self.index_path, allow_pickle=False) as data:
+                if data["term_counts"].shape[1] != self.dim or list(data["skill_terms"]) != SKILL_TERMS:
+                    logger.info("Pre-score index was built with other settings, starting a new one")
+                    return
+                self._digests = [str(digest) for digest in data["digests"]][:self.max_docs]
+                self._term_counts = data["term_counts"][:self.max_docs].copy()
+                self._lengths = data["lengths"][:self.max_docs].copy()
+                self._skills = data["skills"][:self.max_docs].copy()
+                self._doc_freq = (self._term_counts > 0).sum(axis=0).astype(np.int32)
+                self._rows = {digest: row for row, digest in enumerate(self._digests)}
+        except Exception as e:
+            logger.error("Error loading pre-score index: %s", e)
+
+    def save(self):
+        with self._lock:
+            if not self._unsaved:
+                return
+            docs = len(self._digests)
+            arrays = {
+                "digests": np.array(self._digests, dtype=str),
+                "term_counts": self._term_counts[:docs],
+                "lengths": self._lengths[:docs],
+                "skills": self._skills[:docs],
+                "skill_terms": np.array(SKILL_TERMS, dtype=str),
+            }
+            self._unsaved = 0
+
+        directory = os.path.dirname(self.index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.index_path}.{threading.get_ident()}.tmp.npz"
+        try:
+            np.savez_compressed(tmp_path, **arrays)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            logger.error("Error saving pre-score index: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "indexed_resumes": len(self._digests),
+                "max_resumes": self.max_docs,
+                "index_bytes": int(self._term_counts.nbytes + self._lengths.nbytes + self._skills.nbytes),
+                "scored": self.scored,
+                "avg_ms": round(self.total_ms / self.scored, 3) if self.scored else None,
+            }
+
+
+def shortlist(scores: List[float], top_k: Optional[int], min_prescore: Optional[float]) -> List[int]:
+    """Indexes of the best `top_k` scores at or above `min_prescore`, best first."""
+    ranked = sorted(range(len(scores)), key=lambda i: -scores[i])
+    if min_prescore is not None:
+        ranked = [i for i in ranked if scores[i] >= min_prescore]
+    if top_k is not None:
+        ranked = ranked[:top_k]
+    return ranked
+
+
+prescorer = PreScorer(
+    index_path=settings.PRESCORE_INDEX_PATH,
+    dim=settings.PRESCORE_HASH_DIM,
+    max_docs=settings.PRESCORE_INDEX_MAX_DOCS,
+    skill_weight=settings.PRESCORE_SKILL_WEIGHT,
+    save_every=settings.PRESCORE_SAVE_EVERY,
+)
+metrics.stats("prescorer_stats", "Local pre-scoring index size and scoring time", prescorer.stats)
+
+
+async def save_prescore_index():
+    prescorer.save()
@@ -0,0 +1,167 @@
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.core.executors import io_executor, run_blocking
+from app.core.telemetry import metrics, record_cache
+from app.helpers.cache import LRUCache
+from app.services.pdf_parse_pool import pdf_parse_pool
+
+
+class ResumeTextCache:
+    """
+    Parsed resume text keyed by the SHA-256 of the uploaded PDF.
+
+    Two tiers: an in-memory LRU in front of a directory of text files that
+    survives restarts and is shared by all workers on the host. Both tiers
+    are bounded by size; the disk tier drops the least recently used files.
+    """
+
+    def __init__(self, cache_dir: str, memory_bytes: int, disk_bytes: int):
+        self.cache_dir = cache_dir
+        self.disk_bytes = disk_bytes
+        self.memory = LRUCache[str](
+            max_entries=100_000,
+            max_bytes=memory_bytes,
+            sizeof=lambda text: len(text.encode("utf-8")),
+        )
+        self._lock = threading.Lock()
+        self._disk_usage: Optional[int] = None
+        self.disk_hits = 0
+        self.disk_evictions = 0
+        self.misses = 0
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.txt")
+
+    def get(self, digest: str) -> Optional[str]:
+        text = self.memory.get(digest)
+        if text is not None:
+            return text
+        return self._get_from_disk(digest)
+
+    def _get_from_disk(self, digest: str) -> Optional[str]:
+        path = self._path(digest)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)  # mark as recently used for disk eviction
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        self.memory.set(digest, text)
+        return text
+
+    def set(self, digest: str, text: str):
+        self.memory.set(digest, text)
+
+        path = self._path(digest)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._disk_usage is None:
+                self._disk_usage = self._scan_disk_usage()
+            else:
+                self._disk_usage += os.path.getsize(path)
+            if self._disk_usage > self.disk_bytes:
+                self._evict_disk()
+
+    async def get_or_parse(self, digest: str, file_path: str) -> Optional[str]:
+        """Return the cached text for `digest`, parsing `file_path` on a miss."""
+        text = self.memory.get(digest)
+        if text is None:
+            text = await run_blocking(io_executor, self._get_from_disk, digest)
+        record_cache("resume_text", text is not None)
+        if text is not None:
+            return text
+
+        text = await pdf_parse_pool.parse(file_path)
+        if text is not None:
+            await run_blocking(io_executor, self.set, digest, text)
+        return text
+
+    async def get_or_parse_many(self, resumes: List[Tuple[str, str]]) -> List[Union[Optional[str], Exception]]:
+        """
+        Batch variant of `get_or_parse` for (digest, file_path) pairs. Cache
+        misses are parsed together with `pdf_parse_pool.parse_many`. Results
+        are in input order, with the exception in place of a failed parse.
+        """
+        results: List[Union[Optional[str], Exception]] = []
+        misses: List[int] = []
+        for index, (digest, _) in enumerate(resumes):
+            text = self.memory.get(digest)
+            if text is None:
+                text = await run_blocking(io_executor, self._get_from_disk, digest)
+            record_cache("resume_text", text is not None)
+            results.append(text)
+            if text is None:
+                misses.append(index)
+
+        parsed = await pdf_parse_pool.parse_many([resumes[index][1] for index in misses])
+        for index, text in zip(misses, parsed):
+            results[index] = text
+            if isinstance(text, str):
+                await run_blocking(io_executor, self.set, resumes[index][0], text)
+        return results
+
+    def _scan_disk_usage(self) -> int:
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                total += os.path.getsize(os.path.join(root, name))
+        return total
+
+    def _evict_disk(self):
+        """Delete least recently used files until usage is back under 90% of the limit."""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        usage = sum(size for _, size, _ in entries)
+        target = int(self.disk_bytes * 0.9)
+        for _, size, path in entries:
+            if usage <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            usage -= size
+            self.disk_evictions += 1
+        self._disk_usage = usage
+
+    def stats(self) -> Dict[str, Any]:
+        memory = self.memory.stats()
+        return {
+            "hits": memory["hits"] + self.disk_hits,
+            "misses": self.misses,
+            "memory": memory,
+            "disk": {
+                "hits": self.disk_hits,
+                "bytes": self._disk_usage,
+                "evictions": self.disk_evictions,
+            },
+        }
+
+
+resume_text_cache = ResumeTextCache(
+    cache_dir=settings.RESUME_CACHE_DIR,
+    memory_bytes=settings.RESUME_CACHE_MEMORY_BYTES,
+    disk_bytes=settings.RESUME_CACHE_DISK_BYTES,
+)
+metrics.stats("resume_text_cache_stats", "Parsed resume text cache hits, misses and size", resume_text_cache.stats)
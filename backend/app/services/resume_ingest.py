@@ -0,0 +1,77 @@
+import hashlib
+import os
+import uuid
+from typing import BinaryIO, Tuple
+
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.core.executors import io_executor, run_blocking
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds MAX_UPLOAD_BYTES."""
+
+
+class InvalidUploadError(Exception):
+    """Raised when an upload is not a PDF document."""
+
+
+def _open_for_write(path: str) -> BinaryIO:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return open(path, "wb")
+
+
+def _finalize(tmp_path: str, file_path: str):
+    # Uploads are content-addressed, a resubmitted resume is already on disk
+    if os.path.exists(file_path):
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, file_path)
+
+
+def _discard(f: BinaryIO, tmp_path: str):
+    f.close()
+    try:
+        os.remove(tmp_path)
+    except FileNotFoundError:
+        pass
+
+
+async def spool_upload(upload: UploadFile, dest_dir: str) -> Tuple[str, str]:
+    """
+    Copy an upload to `dest_dir` chunk by chunk while hashing it, so memory
+    use does not depend on the file size. Stops as soon as the upload goes
+    over MAX_UPLOAD_BYTES. Returns (file_path, sha256 hex digest); the file
+    is named after its digest.
+    """
+    tmp_path = os.path.join(dest_dir, f".{uuid.uuid4()}.part")
+    sha256 = hashlib.sha256()
+    size = 0
+
+    f = await run_blocking(io_executor, _open_for_write, tmp_path)
+    try:
+        while True:
+            chunk = await upload.read(settings.UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            if size == 0 and not chunk.startswith(b"%PDF-"):
+                raise InvalidUploadError("Uploaded file is not a valid PDF")
+            size += len(chunk)
+            if size > settings.MAX_UPLOAD_BYTES:
+                raise UploadTooLargeError(
+                    f"Resume exceeds the {settings.MAX_UPLOAD_BYTES // (1024 * 1024)} MB upload limit"
+                )
+            sha256.update(chunk)
+            await run_blocking(io_executor, f.write, chunk)
+        if size == 0:
+            raise InvalidUploadError("Uploaded file is empty")
+    except BaseException:
+        await run_blocking(io_executor, _discard, f, tmp_path)
+        raise
+    await run_blocking(io_executor, f.close)
+
+    digest = sha256.hexdigest()
+    file_path = os.path.join(dest_dir, f"{digest}.pdf")
+    await run_blocking(io_executor, _finalize, tmp_path, file_path)
+    return file_path, digest
@@ -1,19 +1,76 @@
+import logging
+import time
 from pypdf import PdfReader
-from typing import Optional
+from typing import Iterator, List, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PdfLimitExceeded(Exception):
+    """Raised when a PDF has more pages than allowed or cannot be read in time."""
+
 
 class ResumeParserService:
     @staticmethod
-    def parse_pdf(file_path: str) -> Optional[str]:
+    def page_count(file_path: str, max_pages: Optional[int] = None) -> int:
+        """Number of pages in the PDF, raising PdfLimitExceeded above `max_pages`."""
+        max_pages = max_pages or settings.PDF_MAX_PAGES
+        with open(file_path, "rb") as f:
+            page_count = len(PdfReader(f).pages)
+        if page_count > max_pages:
+            raise PdfLimitExceeded(f"Resume has {page_count} pages, the limit is {max_pages}")
+        return page_count
+
+    @staticmethod
+    def extract_page_range(file_path: str, start: int, end: int, deadline: float) -> List[str]:
+        """
+        Text of pages [start, end). Pages left when the wall-clock `deadline`
+        (a time.time() value) passes are skipped.
+        """
+        pages = []
+        # Reading from an open file lets pypdf load objects on demand
+        # instead of copying the whole document into memory first
+        with open(file_path, "rb") as f:
+            reader = PdfReader(f)
+            for index in range(start, min(end, len(reader.pages))):
+                if time.time() > deadline:
+                    logger.warning("PDF parse time budget exhausted at page %d: %s", index, file_path)
+                    break
+                pages.append(reader.pages[index].extract_text() or "")
+        return pages
+
+    @staticmethod
+    def iter_pages(file_path: str, max_pages: Optional[int] = None, time_budget: Optional[float] = None) -> Iterator[str]:
+        """
+        Yield the text of each page in turn. The page count is checked before
+        any text is extracted; once `time_budget` seconds have passed the
+        remaining pages are skipped.
+        """
+        max_pages = max_pages or settings.PDF_MAX_PAGES
+        time_budget = time_budget or settings.PDF_PARSE_TIME_BUDGET
+        with open(file_path, "rb") as f:
+            reader = PdfReader(f)
+            page_count = len(reader.pages)
+            if page_count > max_pages:
+                raise PdfLimitExceeded(f"Resume has {page_count} pages, the limit is {max_pages}")
+
+            deadline = time.monotonic() + time_budget
+            for index, page in enumerate(reader.pages):
+                if time.monotonic() > deadline:
+                    if index == 0:
+                        raise PdfLimitExceeded("Resume could not be parsed within the time limit")
+                    logger.warning("PDF parse time budget exhausted after %d of %d pages: %s", index, page_count, file_path)
+                    return
+                yield page.extract_text() or ""
+
+    @staticmethod
+    def parse_pdf(file_path: str, max_pages: Optional[int] = None, time_budget: Optional[float] = None) -> Optional[str]:
         try:
-            reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            text_file_path = file_path.rsplit('.', 1)[0] + '.txt'
-            with open(text_file_path, 'w', encoding='utf-8') as f:
-                f.write(text.strip())
-            
-            return text.strip()
+            pages = list(ResumeParserService.iter_pages(file_path, max_pages, time_budget))
+            return "\n".join(pages).strip()
+        except PdfLimitExceeded:
+            raise
         except Exception as e:
-            print(f"Error parsing PDF: {str(e)}")
-            return None 
\ No newline at end of file
+            logger.error("Error parsing PDF: %s", e)
+            return None
@@ -0,0 +1,276 @@
+import re
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup, Tag
+
+from app.core.telemetry import metrics
+from app.helpers.html import extract_json_ld, html_to_text
+from app.helpers.skills import find_skills
+from app.schemas.analysis import JOB_FIELDS
+
+# Without these the posting is not usable and the LLM has to fill them in
+ESSENTIAL_FIELDS = ("company_name", "job_title", "job_description", "requirements")
+
+SECTION_PATTERNS = {
+    "requirements": re.compile(
+        r"requirement|qualification|what you('ll)? (bring|need)|must have|who you are|you (have|bring)|"
+        r"what we('re)? looking for|about you|experience",
+        re.IGNORECASE,
+    ),
+    "responsibilities": re.compile(
+        r"responsibilit|what you('ll)? do|duties|the role|day[- ]to[- ]day|your impact|in this role",
+        re.IGNORECASE,
+    ),
+    "relevant_skills": re.compile(r"skills|tech stack|technologies|tools", re.IGNORECASE),
+}
+
+# Job boards whose og:site_name is the board, not the hiring company
+AGGREGATOR_SITES = {"linkedin", "indeed", "glassdoor", "ziprecruiter", "monster", "wellfound", "dice"}
+
+EXPERIENCE_PATTERN = re.compile(
+    r"[^.\n]*\b\d+\s*\+?\s*(?:(?:-|to)\s*\d+\s*)?\+?\s*years?[^.\n]*",
+    re.IGNORECASE,
+)
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("description") or ""
+    if isinstance(value, list):
+        return ", ".join(_text(item) for item in value if item)
+    return html_to_text(str(value)) if "<" in str(value) else str(value).strip()
+
+
+def _list(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [_text(item) for item in value if _text(item)]
+    text = _text(value)
+    lines = [line.strip(" -•*") for line in text.splitlines() if line.strip(" -•*")]
+    return lines if len(lines) > 1 else [part.strip() for part in text.split(",") if part.strip()]
+
+
+def _sections_from_html(html: str) -> Dict[str, List[str]]:
+    """
+    Bullet lists of a job description grouped by the heading above them,
+    e.g. the <li>s under "Requirements" become the `requirements` field.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    sections: Dict[str, List[str]] = {}
+    for bullet_list in soup.find_all(["ul", "ol"]):
+        heading = None
+        for previous in bullet_list.find_all_previous(["h1", "h2", "h3", "h4", "h5", "strong", "b", "p"], limit=3):
+            candidate = previous.get_text(" ", strip=True)
+            if candidate and len(candidate) <= 80:
+                heading = candidate
+                break
+        if not heading:
+            continue
+        for field, pattern in SECTION_PATTERNS.items():
+            if pattern.search(heading) and field not in sections:
+                items = [li.get_text(" ", strip=True) for li in bullet_list.find_all("li")]
+                sections[field] = [item for item in items if item]
+                break
+    return sections
+
+
+def _from_description(description_html: str) -> Dict[str, Any]:
+    data: Dict[str, Any] = {"job_description": html_to_text(description_html)}
+    data.update(_sections_from_html(description_html))
+    return data
+
+
+class StructuredJobExtractor:
+    """
+    Rule-based job data extraction from structured markup: schema.org
+    JobPosting JSON-LD and microdata, the page layouts of common applicant
+    tracking systems (Greenhouse, Lever, Workday) and OpenGraph tags.
+
+    Sources are tried from most to least reliable and the first non-empty
+    value for a field wins. The result uses the same schema as the LLM
+    extractor; fields that could not be found are simply absent.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.outcomes = {"complete": 0, "partial": 0, "none": 0}
+
+    def extract(self, html: str, url: str) -> Dict[str, Any]:
+        soup = BeautifulSoup(html, 'html.parser')
+        data: Dict[str, Any] = {}
+        for source in (
+            self._from_json_ld(html),
+            self._from_microdata(soup),
+            self._from_ats(soup, url),
+            self._from_open_graph(soup),
+        ):
+            for field, value in source.items():
+                if value and not data.get(field):
+                    data[field] = value
+
+        if not data.get("relevant_experience"):
+            match = EXPERIENCE_PATTERN.search("\n".join(
+                [data.get("job_description", "")] + data.get("requirements", [])
+            ))
+            if match:
+                data["relevant_experience"] = match.group(0).strip()
+
+        if not data.get("relevant_skills"):
+            skills = find_skills([data.get("job_description", "")] + data.get("requirements", []))
+            if skills:
+                data["relevant_skills"] = skills
+
+        self._record(data)
+        return {field: value for field, value in data.items() if field in JOB_FIELDS and value}
+
+    @staticmethod
+    def missing_fields(data: Dict[str, Any]) -> List[str]:
+        return [field for field in JOB_FIELDS if not data.get(field)]
+
+    @staticmethod
+    def needs_llm(data: Dict[str, Any]) -> bool:
+        return any(not data.get(field) for field in ESSENTIAL_FIELDS)
+
+    @staticmethod
+    def _from_json_ld(html: str) -> Dict[str, Any]:
+        postings = extract_json_ld(html, "JobPosting")
+        if not postings:
+            return {}
+        posting = postings[0]
+        data = _from_description(posting.get("description") or "")
+        data.update({
+            "company_name": _text(posting.get("hiringOrganization")),
+            "job_title": _text(posting.get("title")),
+            "relevant_experience": _text(posting.get("experienceRequirements")),
+        })
+        for field, source in (
+            ("relevant_skills", "skills"),
+            ("requirements", "qualifications"),
+            ("responsibilities", "responsibilities"),
+        ):
+            if posting.get(source):
+                data[field] = _list(posting[source])
+        return data
+
+    @staticmethod
+    def _from_microdata(soup: BeautifulSoup) -> Dict[str, Any]:
+        scope = soup.find(attrs={"itemtype": re.compile(r"schema\.org/JobPosting", re.IGNORECASE)})
+        if scope is None:
+            return {}
+
+        def prop(name: str) -> Optional[Tag]:
+            return scope.find(attrs={"itemprop": name})
+
+        data: Dict[str, Any] = {}
+        description = prop("description")
+        if description is not None:
+            data = _from_description(str(description))
+        title = prop("title")
+        if title is not None:
+            data["job_title"] = title.get("content") or title.get_text(" ", strip=True)
+        organization = prop("hiringOrganization")
+        if organization is not None:
+            name = organization.find(attrs={"itemprop": "name"}) or organization
+            data["company_name"] = name.get("content") or name.get_text(" ", strip=True)
+        for field, source in (
+            ("relevant_skills", "skills"),
+            ("requirements", "qualifications"),
+            ("responsibilities", "responsibilities"),
+            ("relevant_experience", "experienceRequirements"),
+        ):
+            element = prop(source)
+            if element is not None:
+                items = [li.get_text(" ", strip=True) for li in element.find_all("li")]
+                text = element.get_text("\n", strip=True)
+                data[field] = text if field == "relevant_experience" else (items or _list(text))
+        return data
+
+    def _from_ats(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+        host = (urlparse(url).hostname or "").lower()
+        if "greenhouse.io" in host or soup.select_one("#app_body, .job__description"):
+            return self._from_greenhouse(soup)
+        if "lever.co" in host or soup.select_one(".posting-headline"):
+            return self._from_lever(soup)
+        if "myworkdayjobs.com" in host or soup.select_one("[data-automation-id='jobPostingDescription']"):
+            return self._from_workday(soup, host)
+        return {}
+
+    @staticmethod
+    def _from_greenhouse(soup: BeautifulSoup) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        content = soup.select_one("#content, .job__description")
+        if content is not None:
+            data = _from_description(str(content))
+        title = soup.select_one(".app-title, .job__title h1, h1.section-header")
+        if title is not None:
+            data["job_title"] = title.get_text(" ", strip=True)
+        company = soup.select_one(".company-name")
+        if company is not None:
+            data["company_name"] = re.sub(r"^at\s+", "", company.get_text(" ", strip=True), flags=re.IGNORECASE)
+        return data
+
+    @staticmethod
+    def _from_lever(soup: BeautifulSoup) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        sections = soup.select(".posting-page .section-wrapper .section, .posting-page .section")
+        if sections:
+            data = _from_description("".join(str(section) for section in sections))
+        title = soup.select_one(".posting-headline h2")
+        if title is not None:
+            data["job_title"] = title.get_text(" ", strip=True)
+        # Lever page titles read "<Company> - <Job title>"
+        if soup.title and " - " in soup.title.get_text():
+            data["company_name"] = soup.title.get_text().split(" - ", 1)[0].strip()
+        return data
+
+    @staticmethod
+    def _from_workday(soup: BeautifulSoup, host: str) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        description = soup.select_one("[data-automation-id='jobPostingDescription']")
+        if description is not None:
+            data = _from_description(str(description))
+        title = soup.select_one("[data-automation-id='jobPostingHeader']")
+        if title is not None:
+            data["job_title"] = title.get_text(" ", strip=True)
+        # Workday tenants are hosted at <company>.wdN.myworkdayjobs.com
+        if host.endswith("myworkdayjobs.com"):
+            data["company_name"] = host.split(".")[0].replace("-", " ").title()
+        return data
+
+    @staticmethod
+    def _from_open_graph(soup: BeautifulSoup) -> Dict[str, Any]:
+        def meta(name: str) -> str:
+            tag = soup.find("meta", attrs={"property": name}) or soup.find("meta", attrs={"name": name})
+            return (tag.get("content") or "").strip() if tag else ""
+
+        site_name = meta("og:site_name")
+        if site_name.lower() in AGGREGATOR_SITES:
+            site_name = ""
+        return {
+            "company_name": site_name,
+            "job_title": meta("og:title"),
+            "job_description": meta("og:description"),
+        }
+
+    def _record(self, data: Dict[str, Any]):
+        if not any(data.get(field) for field in JOB_FIELDS):
+            outcome = "none"
+        elif self.needs_llm(data):
+            outcome = "partial"
+        else:
+            outcome = "complete"
+        with self._lock:
+            self.outcomes[outcome] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.outcomes)
+
+
+structured_job_extractor = StructuredJobExtractor()
+metrics.stats("structured_extraction_stats", "Job pages whose markup gave complete, partial or no job data", structured_job_extractor.stats)
@@ -0,0 +1,90 @@
+import json
+import logging
+import threading
+from typing import Any, Dict, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from app.clients.AnthropicClient import AnthropicClient
+from app.core.telemetry import metrics
+from app.helpers.json_repair import loads_tolerant
+from app.prompts.json_repair import JSON_REPAIR
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+# Malformed output longer than this is not worth a re-ask; it is sent back in full
+MAX_REASK_CHARS = 12000
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a model response cannot be turned into the expected schema."""
+
+
+class StructuredOutputParser:
+    """
+    Turns model responses into validated Pydantic objects.
+
+    The JSON object is pulled out of any surrounding prose or code fence,
+    repaired locally when it is slightly malformed (trailing commas,
+    truncation, Python literals...) and validated against the schema. Only
+    when that fails is the model asked once to fix its own output, sending
+    just that output and the error rather than the whole original prompt.
+    """
+
+    def __init__(self):
+        self.client = AnthropicClient(task="repair")
+        self._lock = threading.Lock()
+        self.outcomes = {"parsed": 0, "reasked": 0, "failed": 0}
+
+    async def parse(self, response: str, schema: Type[T], reask: bool = True) -> T:
+        try:
+            result = self.parse_local(response, schema)
+            self._record("parsed")
+            return result
+        except StructuredOutputError as e:
+            error = e
+        if not reask or not response or len(response) > MAX_REASK_CHARS:
+            self._record("failed")
+            raise error
+
+        logger.info("Asking the model to fix its %s output: %s", schema.__name__, error)
+        fixed = await self.client.achat(JSON_REPAIR, {
+            "schema": json.dumps(schema.model_json_schema()),
+            "error": str(error),
+            "output": response,
+        })
+        try:
+            result = self.parse_local(fixed, schema)
+        except StructuredOutputError:
+            self._record("failed")
+            raise
+        self._record("reasked")
+        return result
+
+    @staticmethod
+    def parse_local(response: str, schema: Type[T]) -> T:
+        """Parse and validate without any LLM call; raises StructuredOutputError."""
+        try:
+            data = loads_tolerant(response)
+        except ValueError as e:
+            raise StructuredOutputError(str(e)) from e
+        if not isinstance(data, dict):
+            raise StructuredOutputError("The response is not a JSON object")
+        try:
+            return schema.model_validate(data)
+        except ValidationError as e:
+            raise StructuredOutputError(f"The response does not match the schema: {e}") from e
+
+    def _record(self, outcome: str):
+        with self._lock:
+            self.outcomes[outcome] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.outcomes)
+
+
+structured_output = StructuredOutputParser()
+metrics.stats("structured_output_stats", "Model responses parsed directly, after a re-ask, or not at all", structured_output.stats)
@@ -0,0 +1,202 @@
+import re
+import threading
+from typing import Any, Dict, List, Tuple
+
+from app.core.config import settings
+from app.core.telemetry import metrics
+
+# Rough size of a token in characters for English prose; close enough to
+# budget prompts without a tokenizer round trip.
+CHARS_PER_TOKEN = 4
+
+BOILERPLATE_PATTERN = re.compile(
+    r"^(skip to (main )?content|sign in|sign up|log in|join now|apply( now)?|save( job)?|share( this job)?|"
+    r"show (more|less)|see more|report this job|back to (jobs|search)|view all jobs|"
+    r"accept( all)?( cookies)?|reject( all)?|cookie settings|manage (cookies|preferences)|"
+    r"privacy policy|terms( of (use|service))?|cookie policy|careers home|menu|close|"
+    r"©.*|copyright.*|all rights reserved\.?|powered by .*|follow us.*|page \d+( of \d+)?)$",
+    re.IGNORECASE,
+)
+
+# Sections that are never about the candidate or the job itself
+DROPPED_SECTION_PATTERN = re.compile(
+    r"^(similar jobs|people also (viewed|searched)|more jobs|related jobs|recommended jobs|"
+    r"cookies?( notice| policy| preferences)?|privacy( notice| policy)?|legal|terms|"
+    r"equal (employment )?opportunity.*|eeo.*|applicant privacy.*|footer|navigation)\s*:?$",
+    re.IGNORECASE,
+)
+
+SECTION_PRIORITIES = {
+    "resume": [
+        (re.compile(r"experience|employment|work history", re.IGNORECASE), 5),
+        (re.compile(r"skills|technolog|tools|stack", re.IGNORECASE), 5),
+        (re.compile(r"summary|profile|objective|about", re.IGNORECASE), 4),
+        (re.compile(r"projects?", re.IGNORECASE), 3),
+        (re.compile(r"education|certific|licen", re.IGNORECASE), 3),
+        (re.compile(r"publications?|awards?|honou?rs", re.IGNORECASE), 2),
+        (re.compile(r"interests|hobbies|references|volunteer", re.IGNORECASE), 1),
+    ],
+    "job": [
+        (re.compile(r"job title|company|title", re.IGNORECASE), 6),
+        (re.compile(r"requirement|qualification|must have|what you('ll)? bring|about you", re.IGNORECASE), 5),
+        (re.compile(r"responsibilit|what you('ll)? do|duties|the role", re.IGNORECASE), 5),
+        (re.compile(r"skills|technolog|stack|experience", re.IGNORECASE), 5),
+        (re.compile(r"nice to have|preferred|bonus", re.IGNORECASE), 3),
+        (re.compile(r"benefits|perks|compensation|salary|we offer", re.IGNORECASE), 2),
+        (re.compile(r"about (us|the company)|who we are|our (mission|values|culture)", re.IGNORECASE), 1),
+    ],
+}
+SECTION_PRIORITIES["job_page"] = SECTION_PRIORITIES["job"]
+DEFAULT_PRIORITY = 3
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _is_heading(line: str) -> bool:
+    if len(line) > 60 or line.endswith((".", ",", ";")):
+        return False
+    if line.endswith(":") or (line.isupper() and len(line.split()) <= 5):
+        return True
+    # Other short lines only count when they name a known section
+    return len(line.split()) <= 4 and line[0].isupper() and (
+        bool(DROPPED_SECTION_PATTERN.match(line))
+        or any(pattern.search(line) for patterns in SECTION_PRIORITIES.values() for pattern, _ in patterns)
+    )
+
+
+class CompactionResult:
+    def __init__(self, text: str, tokens_before: int, tokens_after: int):
+        self.text = text
+        self.tokens_before = tokens_before
+        self.tokens_after = tokens_after
+
+
+class TextCompactor:
+    """
+    Shrinks resume and job text before it goes into a prompt: collapses
+    whitespace, drops navigation/legal boilerplate and repeated lines, and
+    when the text is still over the token budget keeps the most relevant
+    sections whole and cuts the least relevant ones first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, int]] = {}
+
+    def compact(self, text: str, budget: int, kind: str = "job") -> CompactionResult:
+        text = text or ""
+        tokens_before = estimate_tokens(text)
+
+        # Resumes legitimately repeat short lines (titles, dates), only job pages are deduplicated
+        lines = self._clean_lines(text, dedupe=kind != "resume")
+        sections = self._split_sections(lines)
+        compacted = self._fit_budget(sections, budget, kind)
+
+        result = CompactionResult(compacted, tokens_before, estimate_tokens(compacted))
+        self._record(kind, result)
+        return result
+
+    @staticmethod
+    def _clean_lines(text: str, dedupe: bool) -> List[str]:
+        seen = set()
+        lines: List[str] = []
+        for raw_line in text.splitlines():
+            line = re.sub(r"\s+", " ", raw_line).strip()
+            if not line or BOILERPLATE_PATTERN.match(line):
+                continue
+            if lines and line == lines[-1]:
+                continue
+            key = line.lower()
+            # Repeated lines on a web page are almost always chrome
+            if dedupe and key in seen and len(line) < 200:
+                continue
+            seen.add(key)
+            lines.append(line)
+        return lines
+
+    @staticmethod
+    def _split_sections(lines: List[str]) -> List[Tuple[str, List[str]]]:
+        sections: List[Tuple[str, List[str]]] = [("", [])]
+        for line in lines:
+            if _is_heading(line):
+                sections.append((line, [line]))
+            else:
+                sections[-1][1].append(line)
+        return [
+            (heading, body) for heading, body in sections
+            if body and not DROPPED_SECTION_PATTERN.match(heading)
+        ]
+
+    @staticmethod
+    def _priority(heading: str, kind: str) -> int:
+        for pattern, priority in SECTION_PRIORITIES.get(kind, []):
+            if pattern.search(heading):
+                return priority
+        return DEFAULT_PRIORITY
+
+    def _fit_budget(self, sections: List[Tuple[str, List[str]]], budget: int, kind: str) -> str:
+        blocks = ["\n".join(body) for _, body in sections]
+        if estimate_tokens("\n".join(blocks)) <= budget:
+            return "\n".join(blocks)
+
+        # The untitled lead section (name/contact, job title) always ranks first
+        ranked = sorted(
+            range(len(sections)),
+            key=lambda i: (-(10 if i == 0 and not sections[i][0] else self._priority(sections[i][0], kind)), i),
+        )
+        remaining = budget * CHARS_PER_TOKEN
+        kept: Dict[int, str] = {}
+        # Whole sections first, so one huge section cannot starve the rest
+        for i in ranked:
+            if len(blocks[i]) + 1 <= remaining:
+                kept[i] = blocks[i]
+                remaining -= len(blocks[i]) + 1
+        # Then the start of whatever did not fit, cut at a line boundary when possible
+        for i in ranked:
+            if remaining <= 1:
+                break
+            if i in kept:
+                continue
+            head = blocks[i][:remaining - 1]
+            if "\n" in head:
+                head = head[:head.rfind("\n")]
+            if head:
+                kept[i] = head
+                remaining -= len(head) + 1
+        return "\n".join(kept[i] for i in sorted(kept))
+
+    def _record(self, kind: str, result: CompactionResult):
+        with self._lock:
+            totals = self._totals.setdefault(kind, {"calls": 0, "tokens_before": 0, "tokens_after": 0})
+            totals["calls"] += 1
+            totals["tokens_before"] += result.tokens_before
+            totals["tokens_after"] += result.tokens_after
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                kind: {
+                    **totals,
+                    "saved_ratio": round(1 - totals["tokens_after"] / totals["tokens_before"], 3)
+                    if totals["tokens_before"] else None,
+                }
+                for kind, totals in self._totals.items()
+            }
+
+
+text_compactor = TextCompactor()
+metrics.stats("text_compaction_stats", "Estimated tokens before and after compaction", text_compactor.stats)
+
+
+def compact_resume(text: str) -> CompactionResult:
+    return text_compactor.compact(text, settings.RESUME_TOKEN_BUDGET, kind="resume")
+
+
+def compact_job_details(text: str) -> CompactionResult:
+    return text_compactor.compact(text, settings.JOB_TOKEN_BUDGET, kind="job")
+
+
+def compact_job_page(text: str) -> CompactionResult:
+    return text_compactor.compact(text, settings.JOB_PAGE_TOKEN_BUDGET, kind="job_page")
@@ -0,0 +1,50 @@
+"""
+Generate the sample resume corpus used by the micro-benchmarks and the load
+generator: `count` PDFs cycling through `--pages` page counts.
+
+    python -m benchmarks.corpus --output benchmarks/data/resumes --count 30 --pages 1,2,5
+"""
+import argparse
+from pathlib import Path
+from typing import List, Sequence
+
+from benchmarks.fixtures import resume_lines
+from benchmarks.pdf import write_pdf
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "resumes"
+
+
+def generate_corpus(output: Path, count: int, page_counts: Sequence[int] = (1, 2, 5)) -> List[Path]:
+    """Write the corpus, skipping files that already exist; returns every path in it."""
+    output.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(count):
+        pages = page_counts[index % len(page_counts)]
+        path = output / f"resume_{index:03d}_{pages}p.pdf"
+        if not path.exists():
+            write_pdf(path, resume_lines(index, pages))
+        paths.append(path)
+    return paths
+
+
+def load_corpus(corpus: Path) -> List[Path]:
+    paths = sorted(corpus.glob("*.pdf"))
+    if not paths:
+        raise SystemExit(f"No PDFs in {corpus}; run `python -m benchmarks.corpus --output {corpus}` first")
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate sample resume PDFs")
+    parser.add_argument("--output", type=Path, default=DEFAULT_CORPUS, help="Directory to write the PDFs to")
+    parser.add_argument("--count", type=int, default=30, help="Number of resumes")
+    parser.add_argument("--pages", default="1,2,5", help="Comma-separated page counts to cycle through")
+    args = parser.parse_args()
+
+    page_counts = [int(pages) for pages in args.pages.split(",") if pages.strip()]
+    paths = generate_corpus(args.output, args.count, page_counts)
+    print(f"{len(paths)} resumes in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Stand-in for the Anthropic Messages API, so analyses run offline with a
+known, adjustable LLM latency. Point the backend at it with
+ANTHROPIC_BASE_URL=http://127.0.0.1:8901.
+
+The task is recognised from the prompt: job extraction gets a job JSON
+with the requested fields, resume matching gets a score and insights, and
+JSON repair gets a valid object back. Both plain and streamed (`"stream":
+true`) responses are supported.
+
+    python -m benchmarks.fake_anthropic --port 8901 --latency 0.8 --jitter 0.2 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import uuid
+from typing import Any, AsyncIterator, Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from benchmarks.fixtures import COMPANIES, RESPONSIBILITIES, SKILLS, TITLES
+
+INSIGHTS = [
+    "Quantify the impact of your backend work with latency, cost or revenue metrics.",
+    "Mirror the job description's keywords for {skill} in your skills section.",
+    "Move your most relevant project to the top and link to the GitHub repository.",
+    "Add the {skill} certification the posting lists as a nice-to-have.",
+    "Highlight leadership: mentoring, leading incident reviews or managing a team.",
+    "Tighten the summary to two lines aimed at this role.",
+]
+
+CHUNK_CHARS = 16
+
+
+class FakeConfig:
+    def __init__(self, latency: float, jitter: float, chunk_delay: float, error_rate: float, seed: int):
+        self.latency = latency
+        self.jitter = jitter
+        self.chunk_delay = chunk_delay
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+
+
+def _text(content: Any) -> str:
+    """Plain text of a `system` or message `content`, which may be a string or a list of blocks."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return ""
+
+
+def _seed(text: str) -> random.Random:
+    # The same prompt gets the same answer, as a cached or low-temperature model would give
+    return random.Random(hashlib.sha256(text.encode("utf-8")).hexdigest())
+
+
+def job_extraction(user: str) -> Dict[str, Any]:
+    rng = _seed(user)
+    match = re.search(r"Fields to extract:\s*(.+)", user)
+    fields = [field.strip() for field in match.group(1).split(",")] if match else []
+    mentioned = [skill for skill in SKILLS if skill.lower() in user.lower()] or rng.sample(SKILLS, 6)
+    job = {
+        "company_name": next((company for company in COMPANIES if company in user), rng.choice(COMPANIES)),
+        "job_title": next((title for title in TITLES if title in user), rng.choice(TITLES)),
+        "job_description": "Build and scale the services behind our product.",
+        "relevant_skills": mentioned[:8],
+        "relevant_experience": f"{rng.randint(2, 8)}+ years building production software",
+        "responsibilities": rng.sample(RESPONSIBILITIES, 4),
+        "requirements": [f"Experience with {skill}" for skill in mentioned[:4]],
+    }
+    return {field: job[field] for field in fields if field in job} or job
+
+
+def resume_match(user: str) -> Dict[str, Any]:
+    rng = _seed(user)
+    skill = rng.choice(SKILLS)
+    return {
+        "score": rng.randint(35, 95),
+        "insights": [insight.format(skill=skill) for insight in rng.sample(INSIGHTS, 5)],
+    }
+
+
+def respond(system: str, user: str) -> str:
+    if "job data extractor" in system:
+        return json.dumps(job_extraction(user))
+    if "fix malformed JSON" in system:
+        return json.dumps(resume_match(user) if '"score"' in user else job_extraction(user))
+    return json.dumps(resume_match(user))
+
+
+def _usage(prompt: str, completion: str) -> Dict[str, int]:
+    return {
+        "input_tokens": max(1, len(prompt) // 4),
+        "output_tokens": max(1, len(completion) // 4),
+        "cache_creation_input_tokens": 0,
+        "cache_read_input_tokens": 0,
+    }
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def create_app(config: FakeConfig) -> FastAPI:
+    app = FastAPI(title="Fake Anthropic API")
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        config.requests += 1
+        if config.random.random() < config.error_rate:
+            config.errors += 1
+            return JSONResponse(
+                status_code=529,
+                content={"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}},
+            )
+
+        system = _text(body.get("system"))
+        user = "\n".join(_text(message.get("content")) for message in body.get("messages", []))
+        text = respond(system, user)
+        usage = _usage(system + user, text)
+        message = {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "fake-model"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": usage,
+        }
+
+        delay = max(0.0, config.latency + config.random.uniform(-config.jitter, config.jitter))
+        if not body.get("stream"):
+            await asyncio.sleep(delay)
+            return message
+
+        async def events() -> AsyncIterator[str]:
+            await asyncio.sleep(delay)
+            yield _sse("message_start", {
+                "type": "message_start",
+                "message": {**message, "content": [], "stop_reason": None, "usage": {**usage, "output_tokens": 1}},
+            })
+            yield _sse("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+            for start in range(0, len(text), CHUNK_CHARS):
+                yield _sse("content_block_delta", {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {"type": "text_delta", "text": text[start:start + CHUNK_CHARS]},
+                })
+                if config.chunk_delay:
+                    await asyncio.sleep(config.chunk_delay)
+            yield _sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+            yield _sse("message_delta", {
+                "type": "message_delta",
+                "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                "usage": {"output_tokens": usage["output_tokens"]},
+            })
+            yield _sse("message_stop", {"type": "message_stop"})
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats():
+        return {"requests": config.requests, "errors": config.errors}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve canned Anthropic Messages API responses")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--latency", type=float, default=0.8, help="Seconds before the response (or first token)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Latency varies uniformly by +/- this many seconds")
+    parser.add_argument("--chunk-delay", type=float, default=0.01, help="Seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with 529 Overloaded")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = FakeConfig(args.latency, args.jitter, args.chunk_delay, args.error_rate, args.seed)
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Deterministic sample data shared by the fixture job site, the resume corpus
+and the micro-benchmarks. Everything is derived from an integer index, so
+page 17 or resume 17 is the same on every machine and every run.
+"""
+import json
+import random
+from html import escape
+from typing import Any, Dict, List
+
+COMPANIES = [
+    "Acme Analytics", "Northwind Systems", "Globex Health", "Initech Cloud", "Umbrella Robotics",
+    "Stark Logistics", "Wayne Financial", "Hooli Search", "Pied Piper Media", "Vandelay Imports",
+]
+
+TITLES = [
+    "Senior Backend Engineer", "Data Engineer", "Machine Learning Engineer", "Frontend Developer",
+    "DevOps Engineer", "Full Stack Developer", "Site Reliability Engineer", "Platform Engineer",
+    "Data Scientist", "Engineering Manager",
+]
+
+SKILLS = [
+    "Python", "FastAPI", "Django", "PostgreSQL", "MongoDB", "Redis", "Kafka", "Docker", "Kubernetes",
+    "AWS", "GCP", "Terraform", "React", "TypeScript", "Node.js", "GraphQL", "Spark", "Airflow",
+    "PyTorch", "TensorFlow", "scikit-learn", "Go", "Java", "Rust", "CI/CD", "Linux", "SQL",
+]
+
+RESPONSIBILITIES = [
+    "Design, build and operate services that handle millions of requests per day",
+    "Own features end to end, from design documents through rollout and monitoring",
+    "Improve the reliability and latency of our core APIs",
+    "Build data pipelines that feed analytics and machine learning models",
+    "Mentor other engineers and review their code",
+    "Work with product managers and designers to shape the roadmap",
+    "Automate infrastructure and deployments with infrastructure as code",
+    "Investigate production incidents and lead blameless postmortems",
+    "Write clear documentation for internal and external developers",
+    "Profile and optimize hot paths in the request pipeline",
+]
+
+REQUIREMENTS = [
+    "{years}+ years of professional software engineering experience",
+    "Strong proficiency in {skill_a} and {skill_b}",
+    "Experience running {skill_c} in production",
+    "A bachelor's degree in computer science or equivalent practical experience",
+    "Excellent written and verbal communication skills",
+    "Experience with distributed systems and event-driven architectures",
+    "Familiarity with observability tooling such as metrics, tracing and structured logs",
+    "Comfort working in a fast-paced, remote-first team",
+]
+
+BOILERPLATE = [
+    "We are an equal opportunity employer and value diversity at our company.",
+    "Benefits include health, dental and vision insurance, a learning budget and flexible hours.",
+    "By applying you agree to our privacy policy and the processing of your personal data.",
+    "Follow us on social media for the latest news about our products and culture.",
+]
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Rivera", "Chen", "Patel", "Okafor", "Nguyen", "Schmidt", "Garcia", "Kowalski", "Haddad", "Larsen"]
+
+UNIVERSITIES = ["State University", "Institute of Technology", "City College", "Polytechnic University"]
+
+# The fixture site serves a mix of the layouts real job boards use
+PAGE_LAYOUTS = ("json_ld", "article", "noisy")
+
+
+def job_posting(index: int) -> Dict[str, Any]:
+    """The posting behind fixture page `index`."""
+    rng = random.Random(f"job-{index}")
+    skills = rng.sample(SKILLS, 8)
+    years = rng.randint(2, 8)
+    requirements = [
+        line.format(years=years, skill_a=skills[0], skill_b=skills[1], skill_c=skills[2])
+        for line in rng.sample(REQUIREMENTS, 5)
+    ]
+    company = COMPANIES[index % len(COMPANIES)]
+    title = TITLES[rng.randrange(len(TITLES))]
+    return {
+        "company_name": company,
+        "job_title": title,
+        "job_description": (
+            f"{company} is hiring a {title} to join a growing team. You will work on "
+            f"systems built with {', '.join(skills[:4])} and help us scale the platform "
+            f"to the next order of magnitude."
+        ),
+        "relevant_skills": skills,
+        "relevant_experience": f"{years}+ years building production software",
+        "responsibilities": rng.sample(RESPONSIBILITIES, 6),
+        "requirements": requirements,
+    }
+
+
+def _list(items: List[str]) -> str:
+    return "<ul>" + "".join(f"<li>{escape(item)}</li>" for item in items) + "</ul>"
+
+
+def _chrome(company: str, body: str, noise: int) -> str:
+    nav = "".join(f'<a href="/section/{i}">Section {i}</a>' for i in range(noise))
+    sidebar = _list([f"Similar job {i} at another company" for i in range(noise)])
+    footer = "".join(f"<p>{escape(line)}</p>" for line in BOILERPLATE)
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<title>Careers at {escape(company)}</title>"
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        "<style>body{font-family:sans-serif} .hidden{display:none}</style>"
+        "<script>window.analytics=window.analytics||[];analytics.push(['page']);</script>"
+        "</head><body>"
+        f"<header><nav>{nav}</nav></header>"
+        f'<aside class="sidebar">{sidebar}</aside>'
+        f"{body}"
+        f"<footer>{footer}</footer>"
+        "</body></html>"
+    )
+
+
+def job_page_html(index: int) -> str:
+    """Fixture page `index`: a JSON-LD posting, a plain article or a page buried in navigation."""
+    posting = job_posting(index)
+    layout = PAGE_LAYOUTS[index % len(PAGE_LAYOUTS)]
+    article = (
+        "<main><article>"
+        f"<h1>{escape(posting['job_title'])}</h1>"
+        f"<h2>{escape(posting['company_name'])}</h2>"
+        f"<p>{escape(posting['job_description'])}</p>"
+        f"<h3>What you'll do</h3>{_list(posting['responsibilities'])}"
+        f"<h3>Requirements</h3>{_list(posting['requirements'])}"
+        f"<h3>Tech stack</h3><p>{escape(', '.join(posting['relevant_skills']))}</p>"
+        "</article></main>"
+    )
+
+    if layout == "json_ld":
+        structured = {
+            "@context": "https://schema.org",
+            "@type": "JobPosting",
+            "title": posting["job_title"],
+            "hiringOrganization": {"@type": "Organization", "name": posting["company_name"]},
+            "description": posting["job_description"] + " " + " ".join(posting["responsibilities"]),
+            "qualifications": " ".join(posting["requirements"]),
+            "skills": ", ".join(posting["relevant_skills"]),
+            "datePosted": "2024-01-15",
+        }
+        script = f'<script type="application/ld+json">{json.dumps(structured)}</script>'
+        return _chrome(posting["company_name"], script + article, noise=10)
+    if layout == "article":
+        return _chrome(posting["company_name"], article, noise=10)
+    return _chrome(posting["company_name"], article, noise=200)
+
+
+def resume_lines(index: int, pages: int = 1) -> List[str]:
+    """Text lines of sample resume `index`, long enough to fill about `pages` pages."""
+    rng = random.Random(f"resume-{index}")
+    name = f"{FIRST_NAMES[index % len(FIRST_NAMES)]} {LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]}"
+    skills = rng.sample(SKILLS, 10)
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com | +1 555 010 {index % 10000:04d} | github.com/{name.split()[0].lower()}{index}",
+        "",
+        "SUMMARY",
+        f"Software engineer with {rng.randint(2, 12)} years of experience building backend services and data platforms.",
+        f"Most comfortable with {', '.join(skills[:3])}, and happy to pick up whatever the problem needs.",
+        "",
+        "SKILLS",
+        ", ".join(skills),
+        "",
+        "EXPERIENCE",
+    ]
+
+    # Roughly 50 lines fit on a page
+    role = 0
+    while len(lines) < pages * 50 - 8:
+        company = COMPANIES[(index + role) % len(COMPANIES)]
+        title = TITLES[rng.randrange(len(TITLES))]
+        start = 2023 - 2 * role
+        lines.append(f"{title}, {company} ({start - 2} - {start})")
+        for responsibility in rng.sample(RESPONSIBILITIES, 4):
+            lines.append(f"- {responsibility} using {rng.choice(skills)}")
+        lines.append(f"- Cut p95 latency by {rng.randint(15, 70)}% and infrastructure cost by {rng.randint(5, 40)}%")
+        lines.append("")
+        role += 1
+
+    lines += [
+        "EDUCATION",
+        f"B.Sc. Computer Science, {UNIVERSITIES[index % len(UNIVERSITIES)]} ({2023 - 2 * role - 4})",
+        "",
+        "PROJECTS",
+        f"- Open source contributor to a {rng.choice(skills)} library with {rng.randint(50, 5000)} stars",
+        "- Built a personal finance dashboard used by friends and family",
+    ]
+    return lines
@@ -0,0 +1,58 @@
+"""
+Local job board serving the fixture pages, so scraping runs without the
+network. `/jobs/<n>` is posting n (JSON-LD, plain article or a page buried
+in navigation, in turn); `/jobs` lists them. Pages carry an ETag and answer
+If-None-Match with 304, like the boards the posting cache revalidates.
+
+    python -m benchmarks.job_site --port 8902 --pages 200 --latency 0.05
+"""
+import argparse
+import asyncio
+import hashlib
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, Response
+
+from benchmarks.fixtures import job_page_html, job_posting
+
+
+def create_app(pages: int, latency: float) -> FastAPI:
+    app = FastAPI(title="Fixture job site")
+
+    @app.get("/jobs", response_class=HTMLResponse)
+    async def index():
+        links = "".join(
+            f'<li><a href="/jobs/{n}">{job_posting(n)["job_title"]}</a></li>' for n in range(pages)
+        )
+        return f"<html><body><ul>{links}</ul></body></html>"
+
+    @app.get("/jobs/{n}")
+    async def job(n: int, request: Request):
+        # Query strings are ignored, so `?v=` can defeat URL-keyed caches
+        if not 0 <= n < pages:
+            raise HTTPException(status_code=404, detail="No such job")
+        if latency:
+            await asyncio.sleep(latency)
+        html = job_page_html(n)
+        etag = '"' + hashlib.sha1(html.encode("utf-8")).hexdigest() + '"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return HTMLResponse(html, headers={"ETag": etag, "Cache-Control": "max-age=300"})
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fixture job pages")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8902)
+    parser.add_argument("--pages", type=int, default=200, help="Number of distinct job pages")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before each page is served")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.pages, args.latency), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Load generator for a running backend. `--concurrency` clients send
+requests back to back for `--duration` seconds (or `--requests` in total)
+and the run reports throughput and p50/p95/p99 latency per scenario.
+
+Scenarios:
+  login   POST /auth/login as one of `--users` benchmark users
+  submit  POST /jobs/submit-application with resumes from `--corpus` and
+          jobs from `--job-site` (or inline descriptions without one)
+
+Benchmark users are signed up on first use. With `--cold` every submission
+uses a distinct job URL, so job and match caches never hit. With
+`--baseline` the run fails when p95 latency rises, or throughput falls, by
+more than `--tolerance`.
+
+    python -m benchmarks.load --base-url http://127.0.0.1:8000 --scenario login,submit \
+        --concurrency 16 --duration 30 --job-site http://127.0.0.1:8902 --output load.json
+"""
+import argparse
+import asyncio
+import itertools
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.corpus import DEFAULT_CORPUS, generate_corpus, load_corpus
+from benchmarks.fixtures import job_posting
+from benchmarks.report import find_regressions, latency_summary, load_baseline, print_rows, write_report
+
+PASSWORD = "benchmark-password"
+JOB_PAGES = 200
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def user_email(index: int) -> str:
+    return f"bench-{index}@example.com"
+
+
+async def ensure_users(client: httpx.AsyncClient, count: int) -> List[str]:
+    """Sign up the benchmark users if needed and return an access token for each."""
+    tokens = []
+    for index in range(count):
+        email = user_email(index)
+        response = await client.post("/auth/signup", json={"name": f"Bench User {index}", "email": email, "password": PASSWORD})
+        if response.status_code not in (200, 400):
+            raise SystemExit(f"Signing up {email} failed: {response.status_code} {response.text}")
+        response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+        if response.status_code != 200:
+            raise SystemExit(f"Logging in {email} failed: {response.status_code} {response.text}")
+        tokens.append(response.json()["access_token"])
+    return tokens
+
+
+def login_request(users: int) -> Request:
+    async def send(client: httpx.AsyncClient, n: int) -> httpx.Response:
+        return await client.post("/auth/login", json={"email": user_email(n % users), "password": PASSWORD})
+    return send
+
+
+def submit_request(tokens: List[str], resumes: List[Path], job_site: Optional[str], cold: bool) -> Request:
+    files = [(path.name, path.read_bytes()) for path in resumes]
+
+    async def send(client: httpx.AsyncClient, n: int) -> httpx.Response:
+        name, content = files[n % len(files)]
+        job = n % JOB_PAGES
+        if job_site:
+            data = {"job_url": f"{job_site.rstrip('/')}/jobs/{job}" + (f"?v={n}" if cold else "")}
+        else:
+            posting = job_posting(job)
+            data = {
+                "job_title": posting["job_title"],
+                "job_description": "\n".join([posting["job_description"], *posting["requirements"]])
+                + (f"\nReference {n}" if cold else ""),
+            }
+        return await client.post(
+            "/jobs/submit-application",
+            data=data,
+            files={"resume": (name, content, "application/pdf")},
+            headers={"Authorization": f"Bearer {tokens[n % len(tokens)]}"},
+        )
+    return send
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    send: Request,
+    concurrency: int,
+    duration: float,
+    total: Optional[int],
+    warmup: float,
+) -> Dict[str, Any]:
+    """Run `concurrency` closed-loop clients and summarise the requests finished after the warmup."""
+    counter = itertools.count()
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    started = time.monotonic()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def worker():
+        while time.monotonic() < deadline:
+            n = next(counter)
+            if total is not None and n >= total:
+                return
+            start = time.monotonic()
+            try:
+                response = await send(client, n)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            end = time.monotonic()
+            if start < measure_from:
+                continue
+            statuses[status] += 1
+            if status.startswith("2"):
+                latencies.append(end - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = max(time.monotonic() - measure_from, 1e-9)
+    completed = sum(statuses.values())
+    return {
+        "requests": completed,
+        "ok": len(latencies),
+        "statuses": dict(statuses),
+        "error_rate": round(1 - len(latencies) / completed, 4) if completed else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url.rstrip("/") + "/api/v1", timeout=args.timeout, limits=limits) as client:
+        tokens = await ensure_users(client, args.users)
+        results = {}
+        for scenario in args.scenario.split(","):
+            if scenario == "login":
+                send = login_request(args.users)
+            elif scenario == "submit":
+                if args.corpus == DEFAULT_CORPUS and not list(DEFAULT_CORPUS.glob("*.pdf")):
+                    generate_corpus(DEFAULT_CORPUS, count=30)
+                send = submit_request(tokens, load_corpus(args.corpus), args.job_site, args.cold)
+            else:
+                raise SystemExit(f"Unknown scenario {scenario!r}")
+            print(f"Running {scenario}: {args.concurrency} clients for {args.duration:g}s after {args.warmup:g}s warmup")
+            results[scenario] = await drive(client, send, args.concurrency, args.duration, args.requests, args.warmup)
+        return results
+
+
+def _headline(report: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    return {name: {"p95_ms": r["latency_ms"]["p95"], "throughput_rps": r["throughput_rps"]} for name, r in report.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test login and application submission")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Backend root URL")
+    parser.add_argument("--scenario", default="login,submit", help="Comma-separated: login, submit")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to measure each scenario")
+    parser.add_argument("--warmup", type=float, default=3, help="Seconds of requests left out of the results")
+    parser.add_argument("--requests", type=int, help="Stop each scenario after this many requests")
+    parser.add_argument("--users", type=int, default=10, help="Benchmark users to spread requests over")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory of resume PDFs")
+    parser.add_argument("--job-site", help="Fixture job site URL, e.g. http://127.0.0.1:8902")
+    parser.add_argument("--cold", action="store_true", help="Make every submission miss the job and match caches")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-request timeout in seconds")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed change before failing (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    try:
+        results = asyncio.run(run(args))
+    except httpx.HTTPError as e:
+        raise SystemExit(f"Could not reach the backend at {args.base_url}: {e}")
+    print_rows(
+        ["scenario", "requests", "errors", "req/s", "p50 ms", "p95 ms", "p99 ms", "max ms"],
+        [
+            [name, r["requests"], r["requests"] - r["ok"], r["throughput_rps"],
+             r["latency_ms"]["p50"], r["latency_ms"]["p95"], r["latency_ms"]["p99"], r["latency_ms"]["max"]]
+            for name, r in results.items()
+        ],
+    )
+    for name, r in results.items():
+        if r["requests"] != r["ok"]:
+            print(f"{name} statuses: {r['statuses']}")
+    write_report(results, args.output)
+
+    baseline = load_baseline(args.baseline)
+    if baseline is not None:
+        regressions = find_regressions(_headline(results), _headline(baseline), [("p95_ms", False), ("throughput_rps", True)], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Micro-benchmarks for the CPU-bound steps of an analysis: PDF text
+extraction, HTML cleaning and parsing model output as JSON. No server,
+database or network is needed.
+
+Each benchmark runs `--rounds` rounds of enough calls to last about
+`--min-time` seconds, and reports the median and p95 time per call. With
+`--baseline` the run fails when a median is more than `--tolerance` slower.
+
+    python -m benchmarks.micro --output micro.json
+    python -m benchmarks.micro --baseline micro.json --tolerance 0.15
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.helpers.html import extract_json_ld, html_to_text, main_content_text
+from app.helpers.json_repair import extract_json_object, loads_tolerant
+from app.helpers.json_stream import JsonStreamParser
+from app.schemas.analysis import JobData, MatchAnalysis
+from app.services.resume_parser import ResumeParserService
+from app.services.structured_output import StructuredOutputParser
+from app.services.text_compactor import compact_job_page, compact_resume
+from benchmarks.corpus import generate_corpus
+from benchmarks.fake_anthropic import job_extraction, resume_match
+from benchmarks.fixtures import PAGE_LAYOUTS, job_page_html, resume_lines
+from benchmarks.report import find_regressions, load_baseline, percentile, print_rows, write_report
+
+Benchmark = Tuple[str, Callable[[], Any]]
+
+
+def _stream(text: str, chunk: int = 16) -> List[Any]:
+    parser = JsonStreamParser()
+    events = []
+    for start in range(0, len(text), chunk):
+        events.extend(parser.feed(text[start:start + chunk]))
+    return events
+
+
+def benchmarks(corpus: Path) -> List[Benchmark]:
+    cases: List[Benchmark] = []
+
+    # One resume per page count
+    resumes: Dict[str, Path] = {}
+    for path in sorted(corpus.glob("*.pdf")):
+        resumes.setdefault(path.stem.rsplit("_", 1)[-1], path)
+    for pages, path in sorted(resumes.items(), key=lambda item: int(item[0].rstrip("p"))):
+        cases.append((f"parse_pdf/{pages}", lambda path=str(path): ResumeParserService.parse_pdf(path)))
+    resume_text = "\n".join(resume_lines(0, 2))
+    cases.append(("compact_resume/2p", lambda: compact_resume(resume_text)))
+
+    for index, layout in enumerate(PAGE_LAYOUTS):
+        html = job_page_html(index)
+        cases.append((f"html_to_text/{layout}", lambda html=html: html_to_text(html)))
+        cases.append((f"main_content_text/{layout}", lambda html=html: main_content_text(html)))
+        cases.append((f"compact_job_page/{layout}", lambda text=main_content_text(html): compact_job_page(text)))
+    cases.append(("extract_json_ld/json_ld", lambda html=job_page_html(0): extract_json_ld(html, "JobPosting")))
+
+    match = json.dumps(resume_match("benchmark"), indent=2)
+    job = json.dumps(job_extraction("benchmark"), indent=2)
+    fenced = f"Here is the analysis you asked for:\n```json\n{match}\n```\nLet me know if you need more."
+    truncated = job[: int(len(job) * 0.8)]
+    # Trailing comma and a comment, the slips the local repair exists for
+    malformed = match.replace("{", "{ // fit analysis", 1).rstrip("}\n ") + ",\n}"
+    cases += [
+        ("loads_tolerant/clean", lambda: loads_tolerant(match)),
+        ("loads_tolerant/fenced", lambda: loads_tolerant(fenced)),
+        ("loads_tolerant/truncated", lambda: loads_tolerant(truncated)),
+        ("loads_tolerant/malformed", lambda: loads_tolerant(malformed)),
+        ("extract_json_object/fenced", lambda: extract_json_object(fenced)),
+        ("parse_local/match", lambda: StructuredOutputParser.parse_local(fenced, MatchAnalysis)),
+        ("parse_local/job", lambda: StructuredOutputParser.parse_local(job, JobData)),
+        ("json_stream/match", lambda: _stream(match)),
+    ]
+    return cases
+
+
+def measure(func: Callable[[], Any], rounds: int, min_time: float) -> Dict[str, float]:
+    """Per-call seconds over `rounds` rounds, each long enough to time reliably."""
+    func()  # warm up imports and caches inside the function
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / rounds or number >= 1_000_000:
+            break
+        number *= 2
+
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - start) / number)
+    median = percentile(per_call, 50)
+    return {
+        "median_us": round(median * 1e6, 2),
+        "p95_us": round(percentile(per_call, 95) * 1e6, 2),
+        "min_us": round(min(per_call) * 1e6, 2),
+        "ops_per_sec": round(1 / median, 1) if median else 0.0,
+        "calls_per_round": number,
+    }
+
+
+def run(corpus: Path, rounds: int, min_time: float, only: Optional[str]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, func in benchmarks(corpus):
+        if only and only not in name:
+            continue
+        results[name] = measure(func, rounds, min_time)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time PDF parsing, HTML cleaning and JSON parsing")
+    parser.add_argument("--corpus", type=Path, help="Directory of resume PDFs (a small one is generated if omitted)")
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds to spend timing each benchmark")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown before failing (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        corpus = args.corpus or Path(scratch)
+        if args.corpus is None:
+            generate_corpus(corpus, count=3, page_counts=(1, 2, 5))
+        results = run(corpus, args.rounds, args.min_time, args.filter)
+
+    print_rows(
+        ["benchmark", "median us", "p95 us", "min us", "ops/s"],
+        [[name, r["median_us"], r["p95_us"], r["min_us"], r["ops_per_sec"]] for name, r in results.items()],
+    )
+    write_report(results, args.output)
+
+    baseline = load_baseline(args.baseline)
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, [("median_us", False)], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
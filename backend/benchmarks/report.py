@@ -0,0 +1,71 @@
+"""Percentiles, result tables and baseline comparison shared by the benchmarks."""
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of `values` (0 for an empty sequence)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(seconds: Sequence[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max of latencies, in milliseconds."""
+    if not seconds:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    return {
+        "p50": round(percentile(seconds, 50) * 1000, 3),
+        "p95": round(percentile(seconds, 95) * 1000, 3),
+        "p99": round(percentile(seconds, 99) * 1000, 3),
+        "mean": round(sum(seconds) / len(seconds) * 1000, 3),
+        "max": round(max(seconds) * 1000, 3),
+    }
+
+
+def print_rows(headers: List[str], rows: List[List[Any]]):
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    for row in [headers, ["-" * width for width in widths], *rows]:
+        print("  ".join(str(cell).rjust(width) if i else str(cell).ljust(width) for i, (cell, width) in enumerate(zip(row, widths))))
+
+
+def write_report(report: Dict[str, Any], output: Optional[Path]):
+    if output:
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Report written to {output}")
+
+
+def find_regressions(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    checks: Sequence[Tuple[str, bool]],
+    tolerance: float,
+) -> List[str]:
+    """
+    Compare results by name. `checks` lists (metric, higher_is_better); a
+    metric regresses when it is worse than the baseline by more than
+    `tolerance` (0.1 = 10%). Names missing from either side are skipped.
+    """
+    regressions = []
+    for name, result in current.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric, higher_is_better in checks:
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{name} {metric}: {old:g} -> {new:g} ({change:+.1%})")
+    return regressions
+
+
+def load_baseline(path: Optional[Path]) -> Optional[Dict[str, Any]]:
+    if path is None:
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
@@ -0,0 +1,158 @@
+"""
+Start everything an offline load test needs and keep it running until
+interrupted: the fake Anthropic API, the fixture job site, optionally a
+throwaway mongod, and the backend itself pointed at all three.
+
+The backend gets a fresh RSA key pair, its own database name and a
+scratch working directory (so uploads and disk caches start empty on
+every run). Other settings come from the environment / backend .env as
+usual, so pool sizes and the like can be varied per run.
+
+    python -m benchmarks.stack --mongod --llm-latency 0.8 --workers 2
+    python -m benchmarks.load --job-site http://127.0.0.1:8902   # in another shell
+"""
+import argparse
+import base64
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def signing_keys() -> Dict[str, str]:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return {
+        "ALGORITHM": "RS256",
+        "JWT_PRIVATE_KEY": base64.b64encode(private_pem).decode("ascii"),
+        "JWT_PUBLIC_KEY": base64.b64encode(public_pem).decode("ascii"),
+        "JWT_KEY_ID": "benchmark",
+        "JWT_PREVIOUS_PUBLIC_KEYS": "",
+    }
+
+
+def wait_until_up(url: str, timeout: float, process: subprocess.Popen):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"{url} exited with code {process.returncode} before it came up")
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise SystemExit(f"{url} did not come up within {timeout:g}s")
+
+
+def scratch_root() -> str:
+    # /dev/shm keeps the throwaway database and uploads in memory where available
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the backend against local stand-ins for Claude, job sites and Mongo")
+    parser.add_argument("--port", type=int, default=8000, help="Backend port")
+    parser.add_argument("--workers", type=int, default=1, help="Backend worker processes")
+    parser.add_argument("--llm-port", type=int, default=8901)
+    parser.add_argument("--llm-latency", type=float, default=0.8)
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--site-port", type=int, default=8902)
+    parser.add_argument("--site-latency", type=float, default=0.05)
+    parser.add_argument("--mongod", action="store_true", help="Start a throwaway mongod (needs the binary on PATH)")
+    parser.add_argument("--mongo-port", type=int, default=27018)
+    parser.add_argument("--mongodb-url", help="Use this MongoDB instead (default: MONGODB_URL from the environment)")
+    parser.add_argument("--db-name", default="resume_benchmark")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="resume-bench-", dir=scratch_root())
+    python = [sys.executable, "-m"]
+    processes: List[subprocess.Popen] = []
+
+    def start(name: str, command: List[str], **kwargs) -> subprocess.Popen:
+        print(f"Starting {name}: {' '.join(command)}")
+        process = subprocess.Popen(command, **kwargs)
+        processes.append(process)
+        return process
+
+    try:
+        llm = start("fake Anthropic API", python + [
+            "benchmarks.fake_anthropic", "--port", str(args.llm_port), "--latency", str(args.llm_latency),
+            "--jitter", str(args.llm_jitter), "--error-rate", str(args.llm_error_rate),
+        ], cwd=BACKEND_DIR)
+        site = start("fixture job site", python + [
+            "benchmarks.job_site", "--port", str(args.site_port), "--latency", str(args.site_latency),
+        ], cwd=BACKEND_DIR)
+
+        mongodb_url = args.mongodb_url or os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+        if args.mongod:
+            if shutil.which("mongod") is None:
+                raise SystemExit("--mongod needs the mongod binary on PATH")
+            dbpath = Path(scratch) / "db"
+            dbpath.mkdir()
+            start("mongod", [
+                "mongod", "--dbpath", str(dbpath), "--port", str(args.mongo_port), "--bind_ip", "127.0.0.1", "--quiet",
+            ], stdout=subprocess.DEVNULL)
+            mongodb_url = f"mongodb://127.0.0.1:{args.mongo_port}"
+
+        env = {
+            **os.environ,
+            **signing_keys(),
+            "ANTHROPIC_BASE_URL": f"http://127.0.0.1:{args.llm_port}",
+            "ANTHROPIC_API_KEY": "benchmark",
+            "MONGODB_URL": mongodb_url,
+            "MONGODB_DB_NAME": args.db_name,
+            "SECRET_KEY": os.getenv("SECRET_KEY") or "benchmark",
+            "API_PORT": str(args.port),
+            "PYTHONPATH": str(BACKEND_DIR),
+        }
+        backend = start("backend", python + [
+            "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(args.port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ], cwd=scratch, env=env)
+
+        wait_until_up(f"http://127.0.0.1:{args.llm_port}/stats", 30, llm)
+        wait_until_up(f"http://127.0.0.1:{args.site_port}/jobs", 30, site)
+        wait_until_up(f"http://127.0.0.1:{args.port}/api/v1/base/health", 60, backend)
+
+        print(f"\nBackend   http://127.0.0.1:{args.port}  (MongoDB {mongodb_url}, database {args.db_name})")
+        print(f"LLM       http://127.0.0.1:{args.llm_port}")
+        print(f"Job site  http://127.0.0.1:{args.site_port}/jobs")
+        print(f"Scratch   {scratch}")
+        print("Press Ctrl-C to stop.")
+        while all(process.poll() is None for process in processes):
+            time.sleep(1)
+        print("A process exited; stopping.")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in reversed(processes):
+            if process.poll() is None:
+                process.send_signal(signal.SIGINT)
+        for process in reversed(processes):
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
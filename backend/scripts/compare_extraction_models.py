@@ -0,0 +1,177 @@
+"""
+Compare job extraction quality, latency and cost across models.
+
+The corpus is a directory of saved job pages as plain text (`<name>.txt`),
+each optionally paired with the expected extraction (`<name>.expected.json`).
+Every page is run through the production extraction prompt on each model.
+Fields are scored by token F1 against the expected extraction or, when a
+page has none, against the `--reference` model's output.
+
+    python -m scripts.compare_extraction_models --corpus saved_jobs \
+        --models claude-3-5-haiku-20241022,claude-3-7-sonnet-20250219 \
+        --reference claude-3-7-sonnet-20250219 --output report.json
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+from pathlib import Path
+from statistics import mean, median
+from typing import Any, Dict, List, Optional
+
+from app.clients.llm_gateway import llm_gateway
+from app.clients.model_router import estimate_cost
+from app.prompts.job_extraction import JOB_EXTRACTION
+from app.schemas.analysis import JOB_FIELD_TYPES, JobData
+from app.services.structured_output import StructuredOutputError, structured_output
+from app.services.text_compactor import compact_job_page
+
+
+def _tokens(value: Any) -> List[str]:
+    if isinstance(value, list):
+        value = " ".join(str(item) for item in value)
+    return re.findall(r"\w+", str(value or "").lower())
+
+
+def token_f1(predicted: Any, expected: Any) -> float:
+    predicted_tokens, expected_tokens = _tokens(predicted), _tokens(expected)
+    if not predicted_tokens and not expected_tokens:
+        return 1.0
+    if not predicted_tokens or not expected_tokens:
+        return 0.0
+    remaining = list(expected_tokens)
+    common = 0
+    for token in predicted_tokens:
+        if token in remaining:
+            remaining.remove(token)
+            common += 1
+    if not common:
+        return 0.0
+    precision = common / len(predicted_tokens)
+    recall = common / len(expected_tokens)
+    return 2 * precision * recall / (precision + recall)
+
+
+def load_corpus(corpus: Path) -> List[Dict[str, Any]]:
+    pages = []
+    for path in sorted(corpus.glob("*.txt")):
+        expected_path = path.with_name(f"{path.stem}.expected.json")
+        pages.append({
+            "name": path.stem,
+            "text": path.read_text(encoding="utf-8"),
+            "expected": json.loads(expected_path.read_text(encoding="utf-8")) if expected_path.exists() else None,
+        })
+    return pages
+
+
+async def extract(model: str, text: str) -> Dict[str, Any]:
+    variables = {
+        "fields": ", ".join(JOB_FIELD_TYPES),
+        "content": compact_job_page(text).text,
+    }
+    usage: Dict[str, int] = {}
+    start = time.monotonic()
+    try:
+        response = await llm_gateway.invoke(JOB_EXTRACTION, variables, model, usage=usage)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}", "seconds": time.monotonic() - start, "usage": usage}
+    seconds = time.monotonic() - start
+    try:
+        # No re-ask: the point is how well each model does on its own
+        data = structured_output.parse_local(response, JobData).model_dump()
+    except StructuredOutputError as e:
+        return {"error": str(e), "seconds": seconds, "usage": usage}
+    return {"data": data, "seconds": seconds, "usage": usage}
+
+
+def score_page(data: Optional[Dict[str, Any]], expected: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    data = data or {}
+    result: Dict[str, Any] = {
+        "coverage": sum(1 for field in JOB_FIELD_TYPES if data.get(field)) / len(JOB_FIELD_TYPES),
+    }
+    if expected is not None:
+        result["f1"] = {field: token_f1(data.get(field), expected.get(field)) for field in JOB_FIELD_TYPES}
+    return result
+
+
+def summarize(model: str, pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    seconds = [page["seconds"] for page in pages]
+    scored = [page["score"]["f1"] for page in pages if "f1" in page["score"]]
+    costs = [estimate_cost(model, page["usage"]) for page in pages]
+    return {
+        "model": model,
+        "pages": len(pages),
+        "errors": sum(1 for page in pages if "error" in page),
+        "coverage": round(mean(page["score"]["coverage"] for page in pages), 3),
+        "f1": round(mean(mean(f1.values()) for f1 in scored), 3) if scored else None,
+        "field_f1": {
+            field: round(mean(f1[field] for f1 in scored), 3) for field in JOB_FIELD_TYPES
+        } if scored else {},
+        "p50_seconds": round(median(seconds), 2),
+        "max_seconds": round(max(seconds), 2),
+        "input_tokens": sum(page["usage"].get("input_tokens", 0) for page in pages),
+        "output_tokens": sum(page["usage"].get("output_tokens", 0) for page in pages),
+        "cost_usd": round(sum(costs), 4) if None not in costs else None,
+    }
+
+
+async def compare(corpus: Path, models: List[str], reference: Optional[str]) -> Dict[str, Any]:
+    pages = load_corpus(corpus)
+    if not pages:
+        raise SystemExit(f"No .txt pages found in {corpus}")
+    if reference and reference not in models:
+        models = models + [reference]
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for model in models:
+        print(f"Extracting {len(pages)} pages with {model}")
+        results[model] = list(await asyncio.gather(*(extract(model, page["text"]) for page in pages)))
+
+    for model in models:
+        for index, (page, result) in enumerate(zip(pages, results[model])):
+            expected = page["expected"]
+            if expected is None and reference and model != reference:
+                expected = results[reference][index].get("data")
+            result["page"] = page["name"]
+            result["score"] = score_page(result.get("data"), expected)
+
+    return {
+        "corpus": str(corpus),
+        "reference": reference,
+        "summary": [summarize(model, results[model]) for model in models],
+        "pages": results,
+    }
+
+
+def print_table(report: Dict[str, Any]):
+    header = f"{'model':<30} {'pages':>5} {'errors':>6} {'coverage':>8} {'f1':>6} {'p50 s':>7} {'max s':>7} {'cost $':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in report["summary"]:
+        f1 = f"{row['f1']:.3f}" if row["f1"] is not None else "-"
+        cost = f"{row['cost_usd']:.4f}" if row["cost_usd"] is not None else "-"
+        print(
+            f"{row['model']:<30} {row['pages']:>5} {row['errors']:>6} {row['coverage']:>8.3f} "
+            f"{f1:>6} {row['p50_seconds']:>7.2f} {row['max_seconds']:>7.2f} {cost:>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare job extraction across models on a saved corpus")
+    parser.add_argument("--corpus", required=True, type=Path, help="Directory of <name>.txt job pages")
+    parser.add_argument("--models", required=True, help="Comma-separated model names")
+    parser.add_argument("--reference", help="Model whose output is the expected answer for pages without one")
+    parser.add_argument("--output", type=Path, help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    models = [model.strip() for model in args.models.split(",") if model.strip()]
+    report = asyncio.run(compare(args.corpus, models, args.reference))
+    print_table(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()